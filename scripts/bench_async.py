@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.async_scoring import AsyncScorer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the asyncio scoring front-end.")
+    parser.add_argument('--model', choices=['rf', 'lr'], default='rf')
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--queue-size', type=int, default=1024)
+    parser.add_argument('--levels', default='1,2,4,8')
+    return parser.parse_args()
+
+
+class SimulatedProducer:
+    # Stands in for a Kafka consumer: yields applicants as fast as the
+    # scorer accepts them and records how far ahead it ever got.
+    def __init__(self, n_messages, seed=42):
+        self.n_messages = n_messages
+        self.rng = np.random.default_rng(seed)
+        self.produced = 0
+        self.consumed = 0
+        self.max_lag = 0
+
+    async def __aiter__(self):
+        for _ in range(self.n_messages):
+            self.produced += 1
+            self.max_lag = max(self.max_lag, self.produced - self.consumed)
+            yield (int(self.rng.integers(0, 2)), float(self.rng.uniform(0, 30000)), float(self.rng.uniform(1e5, 8e5)))
+
+
+async def bench_stream(scorer, n_messages):
+    producer = SimulatedProducer(n_messages)
+    start = time.perf_counter()
+    async for _ in scorer.score_many(producer):
+        producer.consumed += 1
+    elapsed = time.perf_counter() - start
+    return n_messages / elapsed, producer.max_lag
+
+
+async def bench_requests(scorer, n_requests):
+    rng = np.random.default_rng(7)
+    latencies = []
+
+    async def one():
+        applicant = (int(rng.integers(0, 2)), float(rng.uniform(0, 30000)), float(rng.uniform(1e5, 8e5)))
+        start = time.perf_counter()
+        await scorer.score(applicant)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_requests)))
+    elapsed = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return n_requests / elapsed, np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+
+async def main():
+    args = parse_args()
+    print("=" * 70)
+    print(f"ASYNC SCORING BENCHMARK - model {args.model}, queue size {args.queue_size}")
+    print("=" * 70)
+    for level in [int(level) for level in args.levels.split(',')]:
+        scorer = AsyncScorer.from_models(args.model, max_concurrency=level, queue_size=args.queue_size)
+        stream_rate, max_lag = await bench_stream(scorer, args.messages)
+        request_rate, p50, p99 = await bench_requests(scorer, args.requests)
+        scorer.close()
+        print(f"   concurrency {level:2d}: score_many {stream_rate:10,.0f} rows/sec (producer lag <= {max_lag:,})"
+              f" | score {request_rate:8,.0f} req/sec p50 {p50:7.2f} ms p99 {p99:7.2f} ms")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
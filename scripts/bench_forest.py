@@ -0,0 +1,83 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import engineer_features
+from src.forest import export_forest
+from src.scoring import load_models, scale_features
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+def latency_percentiles(predict_proba, rows, repeats=1000):
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        row = rows[i % len(rows)][None, :]
+        start = time.perf_counter()
+        predict_proba(row)
+        timings[i] = time.perf_counter() - start
+    return np.percentile(timings, 50) * 1e6, np.percentile(timings, 99) * 1e6
+
+
+def throughput(predict_proba, x):
+    start = time.perf_counter()
+    predict_proba(x)
+    return len(x) / (time.perf_counter() - start)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the flat forest against sklearn.")
+    parser.add_argument('--check', action='store_true',
+                        help="Exit non-zero if compiled scoring is slower than sklearn at any batch size")
+    parser.add_argument('--tolerance', type=float, default=0.8,
+                        help="Minimum compiled/sklearn throughput ratio allowed by --check (default: 0.8)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    _, scaler, rf_model, _ = load_models()
+    forest = export_forest(rf_model)
+    compiled = export_forest(rf_model, keep_fallback=True)
+    x = scale_features(scaler, engineer_features(pd.read_csv(data_path)))
+    x_large = x[np.random.default_rng(42).integers(0, len(x), size=100_000)]
+
+    print("=" * 70)
+    print("FLAT FOREST BENCHMARK")
+    print("=" * 70)
+
+    print("\nSingle-row latency (microseconds):")
+    sk_p50, sk_p99 = latency_percentiles(rf_model.predict_proba, x, repeats=300)
+    flat_p50, flat_p99 = latency_percentiles(forest.predict_proba, x)
+    print(f"   sklearn:     p50 {sk_p50:9.1f}   p99 {sk_p99:9.1f}")
+    print(f"   flat forest: p50 {flat_p50:9.1f}   p99 {flat_p99:9.1f}")
+    print(f"   p99 speedup: {sk_p99 / flat_p99:.1f}x")
+
+    print("\nBatch throughput (rows/sec):")
+    regressions = []
+    for n_rows in (1_000, 10_000, 100_000):
+        batch = x_large[:n_rows]
+        sklearn_rate = throughput(rf_model.predict_proba, batch)
+        compiled_rate = throughput(compiled.predict_proba, batch)
+        print(f"   {n_rows:>7,} rows: sklearn {sklearn_rate:12,.0f}"
+              f"   flat walk {throughput(forest.predict_proba, batch):12,.0f}"
+              f"   compiled {compiled_rate:12,.0f}")
+        if compiled_rate < args.tolerance * sklearn_rate:
+            regressions.append(n_rows)
+
+    if args.check and regressions:
+        print(f"\nFAILED: compiled scoring below {args.tolerance:.0%} of sklearn at {regressions} rows")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+# Each run is its own process so ru_maxrss is that run's peak alone. Forest
+# shards are fitted in-process (n_jobs=1) so no worker memory goes uncounted.
+OUT_OF_CORE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+from src.out_of_core import train_out_of_core
+start = time.perf_counter()
+result = train_out_of_core({path!r}, chunk_size={chunk_size}, n_jobs=1, timings={{}})
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, result['metrics']['lr']['roc_auc'])
+"""
+
+# What train_model.py does: the whole file in memory, then fit.
+IN_MEMORY = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from src.features import engineer_features
+start = time.perf_counter()
+frame = pd.read_csv({path!r})
+x_train, x_test, y_train, y_test = train_test_split(engineer_features(frame), frame['Defaulted?'].to_numpy(),
+                                                    test_size=0.33, random_state=42)
+scaler = StandardScaler().fit(x_train)
+model = LogisticRegression(class_weight='balanced', max_iter=1000).fit(scaler.transform(x_train), y_train)
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+      roc_auc_score(y_test, model.predict_proba(scaler.transform(x_test))[:, 1]))
+"""
+
+
+def write_scaled_dataset(path, scale, seed=0):
+    # Repeat the shipped data with a little multiplicative noise on the money
+    # columns, so larger files are not just exact duplicates.
+    base = pd.read_csv(data_path)
+    rng = np.random.default_rng(seed)
+    for copy in range(scale):
+        frame = base.copy()
+        if copy:
+            for column in ('Bank Balance', 'Annual Salary'):
+                frame[column] = (frame[column] * rng.normal(1.0, 0.02, len(frame))).round(2)
+        frame['Index'] += copy * len(base)
+        frame.to_csv(path, mode='a' if copy else 'w', header=not copy, index=False)
+
+
+def run(template, path, chunk_size):
+    code = template.format(root=project_root, path=path, chunk_size=chunk_size)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    seconds, peak_kb, auc = result.stdout.strip().splitlines()[-1].split()
+    return float(seconds), int(peak_kb) / 1024, float(auc)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Peak memory of out-of-core vs. in-memory training.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="Multiples of the shipped dataset (default: 1 10 100)")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Rows per chunk (default: 100000)")
+    parser.add_argument('--skip-in-memory', action='store_true', help="Only run out-of-core training")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"{'scale':>6}{'rows':>12}{'mode':>14}{'seconds':>10}{'peak MB':>10}{'LR AUC':>9}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in args.scales:
+            path = os.path.join(tmp_dir, f'applicants_{scale}x.csv')
+            write_scaled_dataset(path, scale)
+            rows = scale * (sum(1 for _ in open(data_path)) - 1)
+            modes = [('out-of-core', OUT_OF_CORE)] + ([] if args.skip_in_memory else [('in-memory', IN_MEMORY)])
+            for mode, template in modes:
+                seconds, peak_mb, auc = run(template, path, args.chunk_size)
+                print(f"{scale:>5}x{rows:>12,}{mode:>14}{seconds:>10.1f}{peak_mb:>10.0f}{auc:>9.4f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import RAW_COLUMNS
+from src.parallel import ParallelScorer
+from src.scoring import load_models, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure multi-process scoring speedup and worker memory.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--max-jobs', type=int, default=os.cpu_count())
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    _, scaler, rf_model, _ = load_models()
+
+    sample = pd.read_csv(data_path, usecols=RAW_COLUMNS).to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(42)
+    raw = sample[rng.integers(0, len(sample), size=args.rows)]
+
+    print("=" * 70)
+    print(f"PARALLEL SCORING BENCHMARK - Random Forest, {args.rows:,} rows")
+    print("=" * 70)
+
+    rf_model.n_jobs = 1
+    start = time.perf_counter()
+    expected, _ = score_batch(rf_model, scaler, raw)
+    baseline = time.perf_counter() - start
+    print(f"   single process: {baseline:.2f}s ({args.rows / baseline:,.0f} rows/sec)")
+
+    jobs = 2
+    while jobs <= args.max_jobs:
+        with ParallelScorer(rf_model, scaler, n_jobs=jobs) as scorer:
+            scorer.score(raw[:jobs])
+            start = time.perf_counter()
+            predictions, _ = scorer.score(raw)
+            elapsed = time.perf_counter() - start
+            growth = [g['private'] for g in scorer.memory_growth_kb.values() if g['private'] is not None]
+
+        assert np.array_equal(predictions, expected)
+        speedup = baseline / elapsed
+        memory = f"{max(growth) / 1024:.1f} MB" if growth else 'n/a'
+        print(f"   {jobs:3d} workers:    {elapsed:.2f}s  speedup {speedup:5.2f}x  "
+              f"efficiency {speedup / jobs:5.1%}  max worker growth {memory}")
+        jobs *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+
+# Each trial runs in a fresh interpreter so imports and page cache effects
+# look like a real cold start; the clock starts before anything is imported.
+TRIAL = """
+import time
+start = time.perf_counter()
+import sys
+sys.path.insert(0, {root!r})
+from src.scoring import ModelStore, model_scaler, score_applicant
+imported = time.perf_counter()
+store = ModelStore(compiled={compiled})
+model = store.get({model_key!r})
+score_applicant(model, model_scaler(model, store.scaler), 1, 10000.0, 300000.0)
+print(imported - start, time.perf_counter() - start)
+"""
+
+FORMATS = {
+    'pickle': False,
+    'npz': True,
+}
+
+
+def time_to_first_prediction(model_key, compiled):
+    code = TRIAL.format(root=project_root, compiled=compiled, model_key=model_key)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    import_seconds, total_seconds = map(float, result.stdout.strip().splitlines()[-1].split())
+    return import_seconds, total_seconds
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time-to-first-prediction for pickled vs. .npz model artifacts.")
+    parser.add_argument('--repeats', type=int, default=5, help="Cold starts per format and model (default: 5)")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = {}
+    for model_key in ('rf', 'improved_lr'):
+        for format_name, compiled in FORMATS.items():
+            trials = [time_to_first_prediction(model_key, compiled) for _ in range(args.repeats)]
+            totals = [total for _, total in trials]
+            results[f'{model_key}/{format_name}'] = {
+                'median_ms': statistics.median(totals) * 1000,
+                'min_ms': min(totals) * 1000,
+                # Load + first prediction, without the module imports both formats share.
+                'load_ms': statistics.median(total - imported for imported, total in trials) * 1000,
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'model/format':<22}{'median':>12}{'min':>12}{'load':>12}")
+    for name, timing in results.items():
+        print(f"{name:<22}{timing['median_ms']:>10.1f}ms{timing['min_ms']:>10.1f}ms{timing['load_ms']:>10.1f}ms")
+    for model_key in ('rf', 'improved_lr'):
+        speedup = results[f'{model_key}/pickle']['median_ms'] / results[f'{model_key}/npz']['median_ms']
+        print(f"{model_key}: npz starts {speedup:.1f}x faster than pickle")
+
+
+if __name__ == "__main__":
+    main()
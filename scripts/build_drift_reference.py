@@ -0,0 +1,57 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.drift import REFERENCE_BINS, DriftReference
+from src.feature_store import open_or_build
+from src.features import RAW_COLUMNS
+from src.scoring import DRIFT_REFERENCE_FILE, MODELS_DIR, MODEL_KEYS, ModelStore, model_scaler, score_batch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rebuild the drift monitor's reference histograms for the trained models, "
+                    "without retraining them."
+    )
+    parser.add_argument('--data', default=os.path.join(PROJECT_ROOT, 'data', 'Default_Fin.csv'),
+                        help="The training data; its train split is the feature reference")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--work-dir', default=os.path.join(PROJECT_ROOT, '.train_cache'),
+                        help="Where the parsed feature store is kept (default: .train_cache)")
+    parser.add_argument('--bins', type=int, default=REFERENCE_BINS,
+                        help=f"Quantile bins per feature (default: {REFERENCE_BINS})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ModelStore(args.models_dir, compiled=True)
+    models = {key: store.get(key) for key in MODEL_KEYS if store.available[key]}
+    if not models:
+        print("ERROR: No trained models found. Run 'python scripts/train_model.py' first.")
+        return 1
+
+    start = time.perf_counter()
+    # The same split train_model.py uses: features from train, probabilities
+    # from the held-out rows.
+    features = open_or_build(args.data, os.path.join(args.work_dir, 'features'))
+    train_raw = features.matrix(RAW_COLUMNS, rows=features.split('train'))
+    test_raw = features.matrix(RAW_COLUMNS, rows=features.split('test'))
+    p_default = {key: score_batch(model, model_scaler(model, store.scaler), test_raw,
+                                  calibrator=store.calibrator(key))[1][:, 1]
+                 for key, model in models.items()}
+    reference = DriftReference.build(train_raw, p_default, bins=args.bins)
+    reference.save(os.path.join(args.models_dir, DRIFT_REFERENCE_FILE))
+    print(f"   Built in {time.perf_counter() - start:.2f}s")
+    for name in reference.features:
+        print(f"   {name}: {len(reference.proportions[name])} bins over {reference.rows[name]:,} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.risk_grid import DEFAULT_PROBES, DEFAULT_SHAPE, axis_range
+from src.scoring import MODELS_DIR, MODEL_KEYS, ModelStore, model_scaler, save_risk_grids, score_batch
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Precompute P(default) over balance x salary for the trained models, for instant what-if answers."
+    )
+    parser.add_argument('--data', default=os.path.join(PROJECT_ROOT, 'data', 'Default_Fin.csv'),
+                        help="Applicant file the axis ranges are taken from")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--shape', type=int, nargs=2, default=DEFAULT_SHAPE, metavar=('BALANCE', 'SALARY'),
+                        help=f"Grid points per axis (default: {DEFAULT_SHAPE[0]} {DEFAULT_SHAPE[1]})")
+    parser.add_argument('--probes', type=int, default=DEFAULT_PROBES,
+                        help=f"Probes per axis inside each cell for its error bound (default: {DEFAULT_PROBES})")
+    return parser.parse_args(argv)
+
+
+def print_check(grids, store, balance_range, salary_range, n=50_000):
+    # Random applicants inside the grid, scored both ways.
+    rng = np.random.default_rng(0)
+    rows = np.column_stack([rng.integers(0, 2, n), rng.uniform(*balance_range, n), rng.uniform(*salary_range, n)])
+    for model_key, grid in grids.items():
+        model = store.get(model_key)
+        scaler = model_scaler(model, store.scaler)
+        calibrator = store.calibrator(model_key)
+        check = grid.check(lambda x: score_batch(model, scaler, x, calibrator=calibrator)[1][:, 1], rows)
+        print(f"   {model_key}: {grid.coverage():.1%} of cells within ±{grid.max_error:g}; "
+              f"{check['answered']:.1%} of random applicants answered from the grid, "
+              f"max error {check['max_error']:.4f}, {check['over_bound']:.2%} over the bound")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ModelStore(args.models_dir, compiled=True)
+    models = {key: store.get(key) for key in MODEL_KEYS if store.available[key]}
+    if not models:
+        print("ERROR: No trained models found. Run 'python scripts/train_model.py' first.")
+        return 1
+
+    data = pd.read_csv(args.data, usecols=['Bank Balance', 'Annual Salary'])
+    balance_range, salary_range = axis_range(data['Bank Balance']), axis_range(data['Annual Salary'])
+
+    start = time.perf_counter()
+    grids = save_risk_grids(models, store.scaler, args.models_dir, balance_range, salary_range,
+                            shape=tuple(args.shape), probes=args.probes,
+                            calibrators={key: store.calibrator(key) for key in models})
+    print(f"   Balance ₹{balance_range[0]:,.0f}-₹{balance_range[1]:,.0f}, "
+          f"salary ₹{salary_range[0]:,.0f}-₹{salary_range[1]:,.0f}, {args.shape[0]}x{args.shape[1]} points")
+    print(f"   Built in {time.perf_counter() - start:.2f}s")
+    print_check(grids, store, balance_range, salary_range)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.calibration import METHODS, Calibration, report_lines
+from src.feature_store import open_or_build
+from src.features import RAW_COLUMNS
+from src.scoring import CALIBRATION_FILE, MODELS_DIR, MODEL_KEYS, ModelStore, model_scaler, score_batch
+from src.training import RANDOM_STATE
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Fit each trained model's probability calibration on the held-out split, without retraining."
+    )
+    parser.add_argument('--data', default=os.path.join(PROJECT_ROOT, 'data', 'Default_Fin.csv'),
+                        help="The training data; the calibration is fitted on its test split")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--work-dir', default=os.path.join(PROJECT_ROOT, '.train_cache'),
+                        help="Where the parsed feature store is kept (default: .train_cache)")
+    parser.add_argument('--method', choices=('auto',) + METHODS, default='auto',
+                        help="auto keeps whichever of Platt and isotonic scores the lower Brier score "
+                             "(default: auto)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ModelStore(args.models_dir, compiled=True)
+    models = {key: store.get(key) for key in MODEL_KEYS if store.available[key]}
+    if not models:
+        print("ERROR: No trained models found. Run 'python scripts/train_model.py' first.")
+        return 1
+
+    features = open_or_build(args.data, os.path.join(args.work_dir, 'features'))
+    test_idx = features.split('test')
+    y_test = features.labels(test_idx)
+    test_raw = features.matrix(RAW_COLUMNS, rows=test_idx)
+    # The models' own probabilities, never an earlier calibration's.
+    p_default = {key: score_batch(model, model_scaler(model, store.scaler), test_raw)[1][:, 1]
+                 for key, model in models.items()}
+
+    start = time.perf_counter()
+    calibration = Calibration.fit(y_test, p_default, method=args.method, seed=RANDOM_STATE)
+    elapsed = time.perf_counter() - start
+    calibration.save(os.path.join(args.models_dir, CALIBRATION_FILE))
+    print(f"   Fitted in {elapsed:.3f}s")
+    for model_key, report in calibration.reports.items():
+        for line in report_lines(model_key, report):
+            print(f"   {line}")
+    print("   The cutoffs, drift reference and risk grids were fitted on the old probabilities: rerun "
+          "optimize_threshold.py, build_drift_reference.py and build_risk_grid.py.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
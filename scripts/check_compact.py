@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import COMPACT_DTYPES, RAW_COLUMNS, engineer_features
+from src.scoring import load_models, model_scaler, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+def compare(model, scaler, applicants, compact_applicants):
+    # Warm up first, so a lazily loaded batch fallback is not timed.
+    score_batch(model, scaler, applicants)
+    start = time.perf_counter()
+    predictions, probabilities = score_batch(model, scaler, applicants)
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    compact_predictions, compact_probabilities = score_batch(model, scaler, compact_applicants, dtype=np.float32)
+    compact_seconds = time.perf_counter() - start
+    difference = np.abs(compact_probabilities[:, 1] - probabilities[:, 1])
+    return {
+        'label_mismatches': int((compact_predictions != predictions).sum()),
+        'rows_changed': int((difference > 0).sum()),
+        'max_difference': float(difference.max()),
+        'float64_seconds': full_seconds,
+        'float32_seconds': compact_seconds,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Check the compact float32/uint8 path against float64.")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Tile the shipped data this many times, for timing (default: 1)")
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="Largest allowed change in default probability (default: 0.02)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    applicants = pd.concat([pd.read_csv(data_path, usecols=RAW_COLUMNS)] * args.repeat, ignore_index=True)
+    compact_applicants = applicants.astype(COMPACT_DTYPES)
+    improved_model, scaler, rf_model, _ = load_models(compiled=True)
+
+    raw_bytes = applicants.memory_usage(index=False).sum()
+    compact_raw_bytes = compact_applicants.memory_usage(index=False).sum()
+    feature_bytes = engineer_features(applicants).nbytes
+    compact_feature_bytes = engineer_features(compact_applicants, dtype=np.float32).nbytes
+    print(f"Rows: {len(applicants):,}")
+    print(f"Raw columns:      {raw_bytes / 1e6:8.2f} MB -> {compact_raw_bytes / 1e6:8.2f} MB")
+    print(f"Feature matrix:   {feature_bytes / 1e6:8.2f} MB -> {compact_feature_bytes / 1e6:8.2f} MB")
+
+    failed = False
+    for name, model in (('Random Forest', rf_model), ('Logistic Regression', improved_model)):
+        result = compare(model, model_scaler(model, scaler), applicants, compact_applicants)
+        print(f"\n{name}:")
+        print(f"   Label mismatches:        {result['label_mismatches']}")
+        print(f"   Probabilities changed:   {result['rows_changed']:,} rows, max {result['max_difference']:.2e}")
+        print(f"   Scoring time:            {result['float64_seconds']:.3f}s float64, "
+              f"{result['float32_seconds']:.3f}s float32")
+        if result['label_mismatches'] or result['max_difference'] > args.tolerance:
+            failed = True
+
+    print("\nPASS" if not failed else "\nFAIL: compact predictions diverge from float64")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
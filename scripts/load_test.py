@@ -0,0 +1,65 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+
+import numpy as np
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load generator for scripts/serve.py.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000, help="Total requests across all clients")
+    parser.add_argument('--model', default=None)
+    return parser.parse_args()
+
+
+def client(args, n_requests, seed, latencies):
+    rng = np.random.default_rng(seed)
+    connection = http.client.HTTPConnection(args.host, args.port)
+    for _ in range(n_requests):
+        payload = {
+            'employed': int(rng.integers(0, 2)),
+            'bank_balance': float(rng.uniform(1000, 30000)),
+            'annual_salary': float(rng.uniform(100000, 800000))
+        }
+        if args.model:
+            payload['model'] = args.model
+        body = json.dumps(payload)
+        start = time.perf_counter()
+        connection.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+    connection.close()
+
+
+def main():
+    args = parse_args()
+    per_client = args.requests // args.concurrency
+    latencies = []
+    threads = [threading.Thread(target=client, args=(args, per_client, i, latencies)) for i in range(args.concurrency)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    print("=" * 70)
+    print(f"LOAD TEST - {len(latencies):,} requests, concurrency {args.concurrency}")
+    print("=" * 70)
+    print(f"   p50 latency:  {np.percentile(latencies_ms, 50):.2f} ms")
+    print(f"   p99 latency:  {np.percentile(latencies_ms, 99):.2f} ms")
+    print(f"   Throughput:   {len(latencies) / elapsed:,.0f} requests/sec")
+
+
+if __name__ == '__main__':
+    main()
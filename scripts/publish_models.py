@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.registry import activate, publish, read_manifest
+from src.scoring import MODELS_DIR
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Publish the artifacts in models/ as a registry version, list versions, or roll back."
+    )
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--registry-dir', help="Default: <models-dir>/registry")
+    parser.add_argument('--metrics', help="JSON file of evaluation metrics stored with the version")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--activate', metavar='VERSION', help="Make an already published version current")
+    action.add_argument('--list', action='store_true', help="List published versions")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    registry_dir = args.registry_dir or os.path.join(args.models_dir, 'registry')
+
+    if args.list:
+        manifest = read_manifest(registry_dir)
+        for version, info in manifest['versions'].items():
+            marker = '*' if version == manifest['current'] else ' '
+            print(f" {marker} {version}  {info['published_at']}  {json.dumps(info['metrics'])}")
+        return 0
+
+    if args.activate:
+        try:
+            activate(args.activate, registry_dir)
+        except KeyError as exc:
+            print(f"ERROR: {exc.args[0]}")
+            return 1
+        print(f"   Current model version: {args.activate}")
+        return 0
+
+    metrics = None
+    if args.metrics:
+        with open(args.metrics) as f:
+            metrics = json.load(f)
+    try:
+        version = publish(args.models_dir, registry_dir, metrics=metrics)
+    except FileNotFoundError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+    print(f"   Published model version {version} to {registry_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import RAW_COLUMNS
+from src.forest import FlatForest
+from src.linear import FusedLinearModel
+from src.scoring import MODELS_DIR, ModelStore, load_scaler, model_scaler, score_applicant, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+benchmarks_dir = os.path.join(project_root, 'benchmarks')
+BASELINE_PATH = os.path.join(benchmarks_dir, 'baseline.json')
+RESULTS_PATH = os.path.join(benchmarks_dir, 'latest.json')
+
+MODEL_KEYS = {'lr': 'improved_lr', 'rf': 'rf'}
+BATCH_SIZES = (1, 1_000, 100_000)
+ARRAY_LOADERS = {
+    'loan_default_rf_flat.npz': FlatForest.load,
+    'loan_default_lr_fused.npz': FusedLinearModel.load,
+    'scaler_improved.npz': load_scaler,
+}
+
+# Times fall, throughputs rise; the suffix of each metric says which it is.
+HIGHER_IS_BETTER = ('_rows_per_sec',)
+
+
+def synthetic_applicants(n_rows, seed=0):
+    # The shipped rows, repeated with a little noise on the money columns.
+    base = pd.read_csv(data_path, usecols=RAW_COLUMNS)
+    rng = np.random.default_rng(seed)
+    rows = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+    for column in ('Bank Balance', 'Annual Salary'):
+        rows[column] = (rows[column] * rng.normal(1.0, 0.02, n_rows)).round(2)
+    return rows
+
+
+def bench_load(models_dir, repeats):
+    results = {}
+    # The first unpickle also imports sklearn; keep that out of every file's number.
+    joblib.load(os.path.join(models_dir, 'scaler_improved.pkl'))
+    for name in sorted(os.listdir(models_dir)):
+        path = os.path.join(models_dir, name)
+        if name.endswith('.pkl'):
+            loader = joblib.load
+        elif name in ARRAY_LOADERS:
+            loader = ARRAY_LOADERS[name]
+        else:
+            continue
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            loader(path)
+            timings.append(time.perf_counter() - start)
+        results[f'load/{name}_ms'] = float(np.median(timings)) * 1000
+    return results
+
+
+def bench_latency(store, applicants, calls, rounds=5):
+    # Each percentile is the best of several rounds: on a shared machine, the
+    # quietest round is the one that reflects the code rather than neighbours.
+    results = {}
+    rows = applicants.to_numpy()
+    for key, model_key in MODEL_KEYS.items():
+        model = store.get(model_key)
+        scaler = model_scaler(model, store.scaler)
+        score_applicant(model, scaler, *rows[0])
+        p50, p99 = float('inf'), float('inf')
+        for _ in range(rounds):
+            timings = np.empty(calls)
+            for i in range(calls):
+                employed, bank_balance, annual_salary = rows[i % len(rows)]
+                start = time.perf_counter()
+                score_applicant(model, scaler, employed, bank_balance, annual_salary)
+                timings[i] = time.perf_counter() - start
+            p50 = min(p50, float(np.percentile(timings, 50)))
+            p99 = min(p99, float(np.percentile(timings, 99)))
+        results[f'latency/{key}_p50_us'] = p50 * 1e6
+        results[f'latency/{key}_p99_us'] = p99 * 1e6
+    return results
+
+
+def best_rate(score, n_rows, rounds, min_seconds=0.2):
+    # Small batches are repeated until a round lasts min_seconds, so timer
+    # resolution and one-off stalls do not dominate.
+    score()
+    start = time.perf_counter()
+    score()
+    loops = max(1, int(min_seconds / max(time.perf_counter() - start, 1e-9)))
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            score()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return n_rows / best
+
+
+def bench_throughput(store, applicants, rounds):
+    results = {}
+    for key, model_key in MODEL_KEYS.items():
+        model = store.get(model_key)
+        scaler = model_scaler(model, store.scaler)
+        for n_rows in BATCH_SIZES:
+            batch = applicants.head(n_rows)
+            results[f'throughput/{key}_{n_rows}_rows_per_sec'] = best_rate(
+                lambda: score_batch(model, scaler, batch), n_rows, rounds
+            )
+    return results
+
+
+def bench_training(scale):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        train_path = os.path.join(tmp_dir, 'train.csv')
+        frame = pd.read_csv(data_path)
+        pd.concat([frame] * scale, ignore_index=True).to_csv(train_path, index=False)
+        timings_path = os.path.join(tmp_dir, 'timings.json')
+        subprocess.run(
+            [sys.executable, os.path.join(script_dir, 'train_model.py'), '--data', train_path,
+             '--models-dir', os.path.join(tmp_dir, 'models'), '--work-dir', os.path.join(tmp_dir, 'cache'),
+             '--timings', timings_path],
+            check=True, capture_output=True
+        )
+        with open(timings_path) as f:
+            for stage_name, seconds in json.load(f).items():
+                results[f'train/{stage_name}_seconds'] = seconds
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Metrics in both results and baseline that got worse by more than
+    tolerance (a fraction, e.g. 0.5 = 50%), as (name, baseline, current)."""
+    regressions = []
+    tolerances = baseline.get('tolerances', {})
+    for name, expected in baseline['metrics'].items():
+        if name not in results:
+            continue
+        allowed = tolerances.get(name, tolerance)
+        current = results[name]
+        if name.endswith(HIGHER_IS_BETTER):
+            worse = current < expected / (1 + allowed)
+        else:
+            worse = current > expected * (1 + allowed)
+        if worse:
+            regressions.append((name, expected, current))
+    return regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model loading, scoring and training.")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--output', default=RESULTS_PATH, help="Results JSON (default: benchmarks/latest.json)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline JSON (default: benchmarks/baseline.json)")
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help="Allowed slowdown before a metric counts as a regression (default: 1.0, i.e. 2x)")
+    parser.add_argument('--update-baseline', action='store_true', help="Write these results as the new baseline")
+    parser.add_argument('--quick', action='store_true', help="Fewer repeats, for a smoke run")
+    parser.add_argument('--train-scale', type=int, default=10,
+                        help="Time train_model.py on the shipped data repeated this many times (default: 10)")
+    parser.add_argument('--skip-training', action='store_true', help="Leave out the train_model.py stages")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    repeats = {'load': 3, 'latency': 200, 'throughput': 1} if args.quick \
+        else {'load': 7, 'latency': 1000, 'throughput': 5}
+
+    applicants = synthetic_applicants(max(BATCH_SIZES))
+    store = ModelStore(args.models_dir, compiled=True)
+    results = {}
+    for name, run in (
+        ('load', lambda: bench_load(args.models_dir, repeats['load'])),
+        ('latency', lambda: bench_latency(store, applicants, repeats['latency'])),
+        ('throughput', lambda: bench_throughput(store, applicants, repeats['throughput'])),
+        ('train', lambda: {} if args.skip_training else bench_training(args.train_scale)),
+    ):
+        start = time.perf_counter()
+        results.update(run())
+        print(f"[{name}] {time.perf_counter() - start:.1f}s")
+
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"   {name:<{width}} {value:14,.2f}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    payload = {'environment': environment(), 'metrics': results}
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        # Hand-set per-metric tolerances survive re-recording the numbers.
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                payload['tolerances'] = json.load(f).get('tolerances', {})
+        with open(args.baseline, 'w') as f:
+            json.dump(payload, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != payload['environment']:
+        print("WARNING: baseline was recorded in a different environment; comparisons may be noisy.")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (worse than baseline by more than {args.tolerance:.0%}):")
+        for name, expected, current in regressions:
+            print(f"   {name}: baseline {expected:,.2f}, now {current:,.2f}")
+        return 1
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
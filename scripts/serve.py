@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scoring import MODELS_DIR
+from src.router import parse_split
+from src.service import MODEL_NAMES, ScoringService, make_server
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the loan default HTTP scoring service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help="Most single requests merged into one model call (default: 64)")
+    parser.add_argument('--max-wait-ms', type=float, default=2.0,
+                        help="Longest a request waits for others to join its batch (default: 2.0)")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--routing', type=lambda text: parse_split(text, MODEL_NAMES),
+                        help="Champion/challenger split for requests that name no model, e.g. rf=90,lr=10; "
+                             "routed by applicant_id, with the other models shadow-scoring in the background")
+    parser.add_argument('--registry-dir',
+                        help="Serve the current version of this model registry (models/registry once "
+                             "train_model.py has published) and swap to new versions as they are published")
+    parser.add_argument('--drift-interval', type=float,
+                        help="Compare served features and probabilities with the training reference every this "
+                             "many seconds (GET /drift), printing an alert for each drifted feature")
+    return parser.parse_args()
+
+
+def print_drift_alert(alert):
+    print(f"DRIFT {alert.level.upper()}: {alert.feature} PSI {alert.psi:.3f}, KS {alert.ks:.3f} "
+          f"over {alert.rows:,} rows", flush=True)
+
+
+def main():
+    args = parse_args()
+    service = ScoringService(args.models_dir, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                             registry_dir=args.registry_dir, routing=args.routing,
+                             drift_interval=args.drift_interval, on_drift_alert=print_drift_alert)
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {', '.join(sorted(service.models))} on http://{args.host}:{args.port}")
+    print("   POST /predict, POST /predict/batch, GET /health" + (", GET /drift" if service.drift else ""))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.forest import export_forest
+from src.linear import fuse_linear_model
+from src.scoring import (IMPROVED_MODEL_FILE, LR_FUSED_FILE, MODELS_DIR, RF_FLAT_FILE, RF_MODEL_FILE,
+                         SCALER_ARRAYS_FILE, SCALER_FILE, save_scaler)
+from src.out_of_core import DEFAULT_CHUNK_SIZE, train_out_of_core
+from src.feature_store import open_or_build
+from src.training import (RANDOM_STATE, best_trials, build_trials, make_model, search, stage, subsample,
+                          write_json)
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+def optional_int(value):
+    return None if value.lower() == 'all' else int(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Train both models with a parallel, resumable hyperparameter search, "
+                    "or stream larger-than-memory data with --out-of-core."
+    )
+    parser.add_argument('--data', default=data_path, help="Training CSV (default: data/Default_Fin.csv)")
+    parser.add_argument('--models-dir', default=MODELS_DIR, help="Where the chosen models are written")
+    parser.add_argument('--work-dir', default=os.path.join(project_root, '.train_cache'),
+                        help="Feature store and trial checkpoints (default: .train_cache)")
+    parser.add_argument('--jobs', type=int, default=-1, help="Parallel trials (default: -1, all cores)")
+    parser.add_argument('--search-rows', type=optional_int, default=500_000,
+                        help="Training rows sampled for the search, or 'all' (default: 500000). "
+                             "The chosen models are refit on the full training split.")
+    parser.add_argument('--validation-size', type=float, default=0.2,
+                        help="Fraction of the search rows held out to rank trials (default: 0.2)")
+
+    out_of_core = parser.add_argument_group('out-of-core training', "Stream the data instead of loading it")
+    out_of_core.add_argument('--out-of-core', action='store_true',
+                             help="Train from chunks with partial_fit; memory stays flat as the data grows")
+    out_of_core.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                             help=f"Rows per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    out_of_core.add_argument('--epochs', type=int, default=3, help="SGD passes over the data (default: 3)")
+    out_of_core.add_argument('--alpha', type=float, default=1e-4, help="SGD regularization (default: 1e-4)")
+    out_of_core.add_argument('--eta0', type=float, default=0.01, help="SGD step size (default: 0.01)")
+    out_of_core.add_argument('--rf-shards', type=int, default=4,
+                             help="Forest shards, each fitted on its own sample; 0 skips the forest (default: 4)")
+    out_of_core.add_argument('--rf-shard-rows', type=int, default=100_000,
+                             help="Rows sampled per forest shard (default: 100000)")
+    out_of_core.add_argument('--rf-trees-per-shard', type=int, default=25,
+                             help="Trees fitted per shard (default: 25)")
+    out_of_core.add_argument('--rf-max-depth', type=int, default=10, help="Forest tree depth (default: 10)")
+    return parser.parse_args(argv)
+
+
+def save_models(models_dir, linear, scaler, forest):
+    os.makedirs(models_dir, exist_ok=True)
+    joblib.dump(linear, os.path.join(models_dir, IMPROVED_MODEL_FILE))
+    joblib.dump(scaler, os.path.join(models_dir, SCALER_FILE))
+    fuse_linear_model(linear, scaler).save(os.path.join(models_dir, LR_FUSED_FILE))
+    save_scaler(scaler, os.path.join(models_dir, SCALER_ARRAYS_FILE))
+    if forest is not None:
+        joblib.dump(forest, os.path.join(models_dir, RF_MODEL_FILE))
+        export_forest(forest).save(os.path.join(models_dir, RF_FLAT_FILE))
+    else:
+        # A forest left over from an earlier run was fitted against another scaler.
+        for name in (RF_MODEL_FILE, RF_FLAT_FILE):
+            if os.path.exists(os.path.join(models_dir, name)):
+                os.remove(os.path.join(models_dir, name))
+
+
+def print_timings(timings):
+    print("\nWall time per stage:")
+    for name, seconds in timings.items():
+        print(f"   {name:<10} {seconds:8.2f}s")
+
+
+def main_out_of_core(args):
+    timings = {}
+    run_start = time.perf_counter()
+    result = train_out_of_core(
+        args.data, chunk_size=args.chunk_size, epochs=args.epochs, alpha=args.alpha, eta0=args.eta0,
+        rf_shards=args.rf_shards, rf_shard_rows=args.rf_shard_rows, rf_trees_per_shard=args.rf_trees_per_shard,
+        rf_max_depth=args.rf_max_depth, n_jobs=args.jobs, timings=timings
+    )
+    print(f"   {result['rows']['train']:,} train / {result['rows']['test']:,} test rows")
+    for name, metrics in result['metrics'].items():
+        print(f"   {name}: accuracy {metrics['accuracy']:.4f}, ROC-AUC {metrics['roc_auc']:.4f} "
+              f"({metrics['holdout_rows']:,} holdout rows)")
+
+    with stage('save', timings):
+        save_models(args.models_dir, result['linear'], result['scaler'], result['forest'])
+
+    timings['total'] = time.perf_counter() - run_start
+    os.makedirs(args.work_dir, exist_ok=True)
+    write_json(os.path.join(args.work_dir, 'last_run.json'), {
+        'data': os.path.abspath(args.data),
+        'mode': 'out-of-core',
+        'rows': result['rows'],
+        'metrics': result['metrics'],
+        'stage_seconds': timings,
+    })
+    print_timings(timings)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.chunk_size <= 0:
+        raise SystemExit("--chunk-size must be positive")
+    if args.out_of_core:
+        return main_out_of_core(args)
+
+    timings = {}
+    run_start = time.perf_counter()
+
+    with stage('features', timings):
+        store = open_or_build(args.data, os.path.join(args.work_dir, 'features'))
+        fingerprint = store.manifest['fingerprint']
+        train_idx, test_idx = store.split('train'), store.split('test')
+        print(f"   {len(store):,} rows ({len(train_idx):,} train / {len(test_idx):,} test)")
+
+    with stage('scaler', timings):
+        x_train = store.features(train_idx)
+        scaler = StandardScaler().fit(x_train)
+        x_train = scaler.transform(x_train)
+        x_test = scaler.transform(store.features(test_idx))
+        y_train, y_test = store.labels(train_idx), store.labels(test_idx)
+
+    with stage('search', timings):
+        search_idx = subsample(np.arange(len(train_idx)), y_train, args.search_rows)
+        fit_idx, val_idx = train_test_split(search_idx, test_size=args.validation_size,
+                                            stratify=y_train[search_idx], random_state=RANDOM_STATE)
+        trials_dir = os.path.join(args.work_dir, f'trials-{fingerprint}-{len(search_idx)}')
+        results = search(build_trials(), x_train[fit_idx], y_train[fit_idx], x_train[val_idx], y_train[val_idx],
+                         trials_dir, n_jobs=args.jobs)
+        best = best_trials(results)
+        for result in sorted(results, key=lambda r: (r['model'], -r['roc_auc'])):
+            marker = '*' if best[result['model']] is result else ' '
+            print(f"  {marker} {result['trial_id']:<32} ROC-AUC {result['roc_auc']:.4f}  fit {result['fit_seconds']:.1f}s")
+
+    models = {}
+    for model_name in ('lr', 'rf'):
+        with stage(f'fit_{model_name}', timings):
+            model = make_model(model_name, best[model_name]['params'], n_jobs=args.jobs)
+            model.fit(x_train, y_train)
+            models[model_name] = model
+            test_auc = roc_auc_score(y_test, model.predict_proba(x_test)[:, 1])
+            print(f"   {best[model_name]['trial_id']}: accuracy {model.score(x_test, y_test):.4f}, "
+                  f"ROC-AUC {test_auc:.4f}")
+
+    with stage('save', timings):
+        save_models(args.models_dir, models['lr'], scaler, models['rf'])
+
+    timings['total'] = time.perf_counter() - run_start
+    write_json(os.path.join(args.work_dir, 'last_run.json'), {
+        'data': os.path.abspath(args.data),
+        'rows': len(store),
+        'best': {name: best[name] for name in ('lr', 'rf')},
+        'stage_seconds': timings,
+    })
+    print_timings(timings)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,25 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import joblib
+import pandas as pd
 import os
+import sys
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import scoring
+from src.cache import PredictionCache
+from src.drift import ALERT, OK, DriftMonitor
+from src.explain import explain_batch, explainer_for, reason_labels, top_reasons
+from src.features import FEATURE_COLUMNS
+from src.metrics import REGISTRY as METRICS, start_metrics_server
+from src.registry import REGISTRY_DIR, shared_live_store
+from src.risk_grid import GridScorer
+from src.router import ROUTING_ENV, ShadowRouter, TrafficSplit, parse_split
+from src.validation import check_applicant
+
+MODEL_LABELS = {'rf': "Random Forest", 'improved_lr': "Improved Logistic Regression"}
 
 st.set_page_config(
     page_title="Loan Default Prediction",
@@ -12,34 +29,129 @@ st.set_page_config(
 
 @st.cache_resource
 def load_models():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    improved_model_path = os.path.join(project_root, 'models', 'loan_default_model_improved.pkl')
-    improved_scaler_path = os.path.join(project_root, 'models', 'scaler_improved.pkl')
-    rf_model_path = os.path.join(project_root, 'models', 'loan_default_rf_model.pkl')
-    
-    models_available = {
-        'improved_lr': os.path.exists(improved_model_path) and os.path.exists(improved_scaler_path),
-        'rf': os.path.exists(rf_model_path) and os.path.exists(improved_scaler_path)
-    }
+    # Models are loaded the first time they are selected, not at startup.
+    model_store = scoring.ModelStore(compiled=True)
     
-    if not any(models_available.values()):
+    if not any(model_store.available.values()):
         st.warning("⚠️ Improved models not found. Run 'python scripts/train_model.py' first.")
         st.info("Falling back to basic model...")
-        return None, None, None, None
-    
-    improved_model = joblib.load(improved_model_path) if models_available['improved_lr'] else None
-    scaler = joblib.load(improved_scaler_path) if models_available['improved_lr'] else None
-    rf_model = joblib.load(rf_model_path) if models_available['rf'] else None
+        return None, None
     
-    return improved_model, scaler, rf_model, models_available
+    return model_store, model_store.available
 
-improved_model, scaler, rf_model, models_available = load_models()
+@st.cache_resource
+def get_live_models():
+    # Once train_model.py has published to a registry (LOAN_MODEL_REGISTRY,
+    # default models/registry), follow its manifest: new versions are loaded
+    # and warmed up in the background, then swapped in between requests.
+    return shared_live_store(os.environ.get('LOAN_MODEL_REGISTRY', REGISTRY_DIR))
+
+@st.cache_resource
+def get_prediction_cache():
+    # PREDICTION_CACHE_PRECISION rounds balance/salary to that many decimals
+    # before lookup (e.g. -2 for the nearest ₹100); unset means exact inputs.
+    precision = os.environ.get('PREDICTION_CACHE_PRECISION')
+    return PredictionCache(
+        maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 10_000)),
+        ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+        precision=int(precision) if precision else None
+    )
+
+@st.cache_resource
+def get_metrics():
+    # LOAN_METRICS=1 turns the stage timers on; LOAN_METRICS_PORT also serves
+    # them at http://127.0.0.1:<port>/metrics and LOAN_METRICS_FILE rewrites a
+    # Prometheus text file after every prediction.
+    port = os.environ.get('LOAN_METRICS_PORT')
+    if port or os.environ.get('LOAN_METRICS_FILE'):
+        METRICS.enable()
+    if port:
+        start_metrics_server(METRICS, port=int(port))
+    return METRICS
+
+@st.cache_resource
+def get_what_if_scorer(_model_store, model_key, model_version):
+    # Answers from the precomputed risk grid (train_model.py --risk-grid)
+    # when one exists and is accurate enough there, otherwise from the model.
+    model = _model_store.get(model_key)
+    score_rows = partial(scoring.score_batch, model, scoring.model_scaler(model, _model_store.scaler),
+                         threshold=_model_store.decision_threshold(model_key),
+                         calibrator=_model_store.calibrator(model_key))
+    return GridScorer(_model_store.risk_grid(model_key), score_rows)
+
+@st.cache_resource
+def get_explainer(_model_store, model_key, model_version):
+    # The app's scaler, not model_scaler(): linear attributions are measured
+    # from the training mean it holds.
+    return explainer_for(_model_store.get(model_key), _model_store.scaler)
+
+@st.cache_resource
+def get_router(_live_models, _model_store):
+    # LOAN_ROUTING (e.g. "rf=90,improved_lr=10") replaces the model picker:
+    # each applicant ID is routed to one model and the others shadow-score it
+    # in the background, always with the live model version.
+    routing = os.environ.get(ROUTING_ENV)
+    if not routing:
+        return None
+
+    def score(model_key, raw):
+        store = _live_models.current().store if _live_models is not None else _model_store
+        model = store.get(model_key)
+        return scoring.score_batch(model, scoring.model_scaler(model, store.scaler), raw,
+                                   threshold=store.decision_threshold(model_key),
+                                   calibrator=store.calibrator(model_key))
+
+    return ShadowRouter(TrafficSplit(parse_split(routing, scoring.MODEL_KEYS)), score)
+
+@st.cache_resource
+def get_drift_monitor(_model_store, model_version):
+    # Every prediction feeds the monitor; every LOAN_DRIFT_INTERVAL seconds
+    # (default 300) it compares them with the version's training reference.
+    reference = _model_store.drift_reference()
+    if reference is None:
+        return None
+    monitor = DriftMonitor(reference)
+    monitor.start(float(os.environ.get('LOAN_DRIFT_INTERVAL', 300)))
+    return monitor
+
+live_models = get_live_models()
+if live_models is not None:
+    # One version for the whole run: its scaler and models always match.
+    serving = live_models.current()
+    model_store, models_available, model_version = serving.store, serving.store.available, serving.version
+else:
+    (model_store, models_available), model_version = load_models(), None
+prediction_cache = get_prediction_cache()
+metrics = get_metrics()
+drift_monitor = get_drift_monitor(model_store, model_version) if model_store is not None else None
+metrics_file = os.environ.get('LOAN_METRICS_FILE')
 
 st.title("💰 Loan Default Prediction System")
 st.markdown("---")
 
-if models_available and any(models_available.values()):
+router = get_router(live_models, model_store) if models_available and any(models_available.values()) else None
+if router is not None:
+    unavailable = [model_key for model_key in router.split.models if not models_available[model_key]]
+    if unavailable:
+        st.error(f"{ROUTING_ENV} routes to models that are not trained: {', '.join(unavailable)}")
+        st.stop()
+    # The largest share is the champion; it drives the what-if view.
+    model_choice = MODEL_LABELS[max(router.split.weights, key=router.split.weights.get)]
+    st.sidebar.caption("Champion/challenger routing: " + " · ".join(
+        f"{MODEL_LABELS[model_key]} {percent:g}%" for model_key, percent in router.split.weights.items()
+    ))
+    routing_summary = router.summary()
+    st.sidebar.dataframe(pd.DataFrame({
+        MODEL_LABELS[model_key]: {
+            'Served': stats['served'],
+            'Shadow-scored': stats['shadowed'],
+            'Agreement %': None if stats['agreement'] is None else stats['agreement'] * 100,
+            'Mean |Δp|': stats['mean_abs_diff'],
+            'Serve p50 ms': None if stats['serve_p50'] is None else stats['serve_p50'] * 1000,
+        }
+        for model_key, stats in routing_summary.items()
+    }), use_container_width=True)
+elif models_available and any(models_available.values()):
     model_choice = st.sidebar.selectbox(
         "Select Model",
         options=[opt for opt, avail in [("Random Forest", models_available['rf']), 
@@ -50,12 +162,56 @@ else:
     model_choice = "Basic Model"
     st.sidebar.warning("Using basic model. Train improved model for better predictions.")
 
+cache_stats = prediction_cache.stats()
+st.sidebar.caption(
+    f"Prediction cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+    f"{cache_stats['evictions']} evictions · {cache_stats['size']} entries"
+)
+calibration = model_store.calibration() if model_store is not None else None
+if calibration is not None:
+    st.sidebar.caption("Calibrated probabilities: " + " · ".join(
+        f"{MODEL_LABELS[model_key]} {report['method']} "
+        f"(Brier {report['brier_before']:.4f} → {report['brier_after']:.4f})"
+        for model_key, report in calibration.reports.items() if model_key in MODEL_LABELS
+    ))
+decision_policy = model_store.decision_policy() if model_store is not None else None
+if decision_policy is not None:
+    st.sidebar.caption("Decision cutoffs (cost-optimal): " + " · ".join(
+        f"{MODEL_LABELS[model_key]} {summary['threshold']:.1%}"
+        for model_key, summary in decision_policy.summaries.items() if model_key in MODEL_LABELS
+    ))
+if live_models is not None:
+    st.sidebar.caption(f"Model version {model_version} · published {serving.info.get('published_at', 'unknown')}")
+if drift_monitor is not None:
+    drift_report = drift_monitor.last_report
+    if drift_report is None:
+        st.sidebar.caption("Drift: no check yet")
+    else:
+        drifted = {name: result for name, result in drift_report['features'].items() if result['status'] != OK}
+        if not drifted:
+            st.sidebar.caption(f"Drift: none at the last check "
+                               f"({max(result['rows'] for result in drift_report['features'].values())} rows)")
+        for name, result in drifted.items():
+            message = f"Drift in {name}: PSI {result['psi']:.3f}, KS {result['ks']:.3f} over {result['rows']} rows"
+            (st.sidebar.error if result['status'] == ALERT else st.sidebar.warning)(message)
+if metrics.enabled:
+    stage_stats = metrics.snapshot()['stages']
+    st.sidebar.caption("Stage latency, rolling p50: " + " · ".join(
+        f"{stage} {stats['p50'] * 1000:.2f} ms"
+        for stage, stats in stage_stats.items() if stats['p50'] is not None
+    ))
+
 col1, col2 = st.columns([2, 1])
 
 with col1:
     st.header("📝 Enter Applicant Information")
     
     with st.form("prediction_form"):
+        if router is not None:
+            applicant_id = st.text_input(
+                "Applicant ID",
+                help="Routes the applicant to the same model every time; left blank, the inputs are used"
+            )
         st.subheader("👤 Personal Information")
         col_p1, col_p2 = st.columns(2)
         with col_p1:
@@ -137,49 +293,48 @@ with col1:
         submitted = st.form_submit_button("🔮 Predict Default Risk", use_container_width=True)
         
         if submitted:
-            validation_errors = []
-            
-            if annual_salary <= 0:
-                validation_errors.append("❌ Annual Salary must be greater than zero")
-            
-            if bank_balance < 0:
-                validation_errors.append("❌ Bank Balance cannot be negative")
-            
-            if annual_salary == 0 and bank_balance == 0:
-                validation_errors.append("❌ Cannot process: Both income and balance are zero")
-            
-            if annual_salary < 50000 and bank_balance < 1000:
-                validation_errors.append("⚠️ Warning: Very low income with minimal savings - High risk")
-            
-            if loan_amount > 0 and annual_salary > 0 and (loan_amount / annual_salary) > 5:
-                validation_errors.append("⚠️ Warning: Loan amount is more than 5x annual salary - Extremely high risk")
+            with metrics.timer('validate'):
+                validation_errors, validation_warnings = check_applicant(bank_balance, annual_salary, loan_amount)
             
             if validation_errors:
+                metrics.inc('validation_failures_total')
                 st.error("**Input Validation Failed:**")
                 for error in validation_errors:
                     st.error(error)
                 st.info("Please correct the inputs and try again.")
                 st.stop()
             
+            for warning in validation_warnings:
+                st.warning(warning)
+            
             if models_available and any(models_available.values()):
-                x_input = pd.DataFrame({
-                    'Employed': [employed_value],
-                    'Bank Balance': [bank_balance],
-                    'Annual Salary': [annual_salary]
-                })
-                
-                x_input['Savings_Ratio'] = x_input['Bank Balance'] / (x_input['Annual Salary'] + 1)
-                x_input['Monthly_Salary'] = x_input['Annual Salary'] / 12
-                x_input['Balance_to_Salary'] = x_input['Bank Balance'] / (x_input['Monthly_Salary'] + 1)
+                if router is not None:
+                    model_key = router.route(applicant_id or f"{employed_value},{bank_balance:g},{annual_salary:g}")
+                    model_choice = MODEL_LABELS[model_key]
+                else:
+                    model_key = 'rf' if model_choice == "Random Forest" and models_available['rf'] else 'improved_lr'
                 
-                x_scaled = scaler.transform(x_input)
+                def score():
+                    metrics.inc('cache_misses_total', model=model_key)
+                    start = time.perf_counter()
+                    with metrics.timer('model_load'):
+                        model = model_store.get(model_key)
+                        scaler = scoring.model_scaler(model, model_store.scaler)
+                    result = scoring.score_applicant(model, scaler, employed_value, bank_balance, annual_salary,
+                                                     threshold=model_store.decision_threshold(model_key),
+                                                     calibrator=model_store.calibrator(model_key))
+                    if router is not None:
+                        router.record_served(model_key, time.perf_counter() - start)
+                        router.shadow((employed_value, bank_balance, annual_salary), model_key, *result)
+                    return result
                 
-                if model_choice == "Random Forest" and rf_model:
-                    prediction = rf_model.predict(x_scaled)[0]
-                    probability = rf_model.predict_proba(x_scaled)[0]
-                else:
-                    prediction = improved_model.predict(x_scaled)[0]
-                    probability = improved_model.predict_proba(x_scaled)[0]
+                with metrics.timer('prediction'):
+                    prediction, probability = prediction_cache.get_or_score(
+                        (model_choice, model_version), employed_value, bank_balance, annual_salary, score
+                    )
+                metrics.inc('predictions_total', model=model_key)
+                if drift_monitor is not None:
+                    drift_monitor.observe([employed_value, bank_balance, annual_salary], [probability[1]], model_key)
                 
                 savings_ratio = (bank_balance / (annual_salary + 1)) * 100
                 monthly_salary = annual_salary / 12
@@ -189,87 +344,146 @@ with col1:
                 st.error("Improved models not available. Please train them first.")
                 st.stop()
             
-            no_default_prob = probability[0] * 100
-            default_prob = probability[1] * 100
+            with metrics.timer('render'):
+                no_default_prob = probability[0] * 100
+                default_prob = probability[1] * 100
             
-            st.markdown("---")
-            st.subheader("📊 Prediction Results")
+                st.markdown("---")
+                st.subheader("📊 Prediction Results")
             
-            with st.expander("🔍 Detailed Analysis"):
-                st.write(f"**Personal Information:**")
-                st.write(f"- Age: {age} years")
-                st.write(f"- Marital Status: {marital_status}")
-                st.write(f"- Employment Status: {'Employed' if employed_value == 1 else 'Unemployed'}")
+                with st.expander("🔍 Detailed Analysis"):
+                    st.write(f"**Personal Information:**")
+                    st.write(f"- Age: {age} years")
+                    st.write(f"- Marital Status: {marital_status}")
+                    st.write(f"- Employment Status: {'Employed' if employed_value == 1 else 'Unemployed'}")
                 
-                st.write(f"\n**Financial Information:**")
-                st.write(f"- Bank Balance: ₹{bank_balance:,.2f}")
-                st.write(f"- Annual Salary: ₹{annual_salary:,.2f}")
-                st.write(f"- Credit Score: {credit_score}")
+                    st.write(f"\n**Financial Information:**")
+                    st.write(f"- Bank Balance: ₹{bank_balance:,.2f}")
+                    st.write(f"- Annual Salary: ₹{annual_salary:,.2f}")
+                    st.write(f"- Credit Score: {credit_score}")
                 
-                st.write(f"\n**Loan Details:**")
-                st.write(f"- Loan Amount: ₹{loan_amount:,.2f}")
-                st.write(f"- Loan Term: {loan_term} months")
-                loan_to_income = (loan_amount / (annual_salary + 1)) * 100 if annual_salary > 0 else 0
-                st.write(f"- Loan-to-Income Ratio: {loan_to_income:.2f}%")
+                    st.write(f"\n**Loan Details:**")
+                    st.write(f"- Loan Amount: ₹{loan_amount:,.2f}")
+                    st.write(f"- Loan Term: {loan_term} months")
+                    loan_to_income = (loan_amount / (annual_salary + 1)) * 100 if annual_salary > 0 else 0
+                    st.write(f"- Loan-to-Income Ratio: {loan_to_income:.2f}%")
                 
-                st.write(f"\n**Engineered Features:**")
-                st.write(f"- Savings Ratio: {savings_ratio:.2f}%")
-                st.write(f"- Monthly Salary: ₹{monthly_salary:,.2f}")
-                st.write(f"- Balance Coverage: {balance_months:.1f} months")
+                    st.write(f"\n**Engineered Features:**")
+                    st.write(f"- Savings Ratio: {savings_ratio:.2f}%")
+                    st.write(f"- Monthly Salary: ₹{monthly_salary:,.2f}")
+                    st.write(f"- Balance Coverage: {balance_months:.1f} months")
                 
-                st.write(f"\n**Model:** {model_choice}")
-                st.write(f"**Prediction:** {prediction} ({'No Default' if prediction == 0 else 'Default'})")
-                st.write(f"\n**Note:** New fields (Age, Marital Status, Loan Amount, Loan Term, Credit Score) are collected but not yet used in current model. They will be used when model is retrained with these features.")
+                    st.write(f"\n**Model:** {model_choice}")
+                    st.write(f"**Prediction:** {prediction} ({'No Default' if prediction == 0 else 'Default'})")
+                    threshold = model_store.decision_threshold(model_key)
+                    if threshold is not None:
+                        st.write(f"**Decision Cutoff:** Default at P(default) ≥ {threshold:.1%} (cost-optimal)")
+                
+                    explainer = get_explainer(model_store, model_key, model_version)
+                    contributions = explain_batch(explainer, [[employed_value, bank_balance, annual_salary]])
+                    reasons = reason_labels(top_reasons(contributions)[0]).dropna()
+                    st.write(f"\n**Top Reasons Toward Default:** {', '.join(reasons) if len(reasons) else 'None'}")
+                    st.caption(f"Contribution of each model feature ({explainer.units}, positive raises default risk); "
+                               f"baseline {explainer.base_value:.3f}")
+                    st.bar_chart(pd.DataFrame({'Contribution': contributions[0]},
+                                              index=pd.Index(FEATURE_COLUMNS, name='Feature')))
+                    st.write(f"\n**Note:** New fields (Age, Marital Status, Loan Amount, Loan Term, Credit Score) are collected but not yet used in current model. They will be used when model is retrained with these features.")
             
-            if prediction == 0:
-                st.success(f"✅ **No Default Risk** - Applicant is likely to repay the loan")
-                st.metric("Default Probability", f"{default_prob:.2f}%")
-                st.metric("Repayment Probability", f"{no_default_prob:.2f}%")
-            else:
-                st.error(f"⚠️ **High Default Risk** - Applicant may default on the loan")
-                st.metric("Default Probability", f"{default_prob:.2f}%")
-                st.metric("Repayment Probability", f"{no_default_prob:.2f}%")
+                if prediction == 0:
+                    st.success(f"✅ **No Default Risk** - Applicant is likely to repay the loan")
+                    st.metric("Default Probability", f"{default_prob:.2f}%")
+                    st.metric("Repayment Probability", f"{no_default_prob:.2f}%")
+                else:
+                    st.error(f"⚠️ **High Default Risk** - Applicant may default on the loan")
+                    st.metric("Default Probability", f"{default_prob:.2f}%")
+                    st.metric("Repayment Probability", f"{no_default_prob:.2f}%")
             
-            col_a, col_b = st.columns(2)
-            with col_a:
-                st.progress(no_default_prob / 100, text=f"Repayment: {no_default_prob:.1f}%")
-            with col_b:
-                st.progress(default_prob / 100, text=f"Default: {default_prob:.1f}%")
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    st.progress(no_default_prob / 100, text=f"Repayment: {no_default_prob:.1f}%")
+                with col_b:
+                    st.progress(default_prob / 100, text=f"Default: {default_prob:.1f}%")
             
-            st.markdown("---")
-            st.subheader("💡 Financial Health Indicators")
-            col_i1, col_i2, col_i3, col_i4 = st.columns(4)
-            with col_i1:
-                if savings_ratio > 5:
-                    st.success(f"💰 Savings Ratio: {savings_ratio:.1f}%")
-                elif savings_ratio > 2:
-                    st.warning(f"💰 Savings Ratio: {savings_ratio:.1f}%")
-                else:
-                    st.error(f"💰 Savings Ratio: {savings_ratio:.1f}%")
+                st.markdown("---")
+                st.subheader("💡 Financial Health Indicators")
+                col_i1, col_i2, col_i3, col_i4 = st.columns(4)
+                with col_i1:
+                    if savings_ratio > 5:
+                        st.success(f"💰 Savings Ratio: {savings_ratio:.1f}%")
+                    elif savings_ratio > 2:
+                        st.warning(f"💰 Savings Ratio: {savings_ratio:.1f}%")
+                    else:
+                        st.error(f"💰 Savings Ratio: {savings_ratio:.1f}%")
             
-            with col_i2:
-                if balance_months > 3:
-                    st.success(f"📅 Balance: {balance_months:.1f} months")
-                elif balance_months > 1:
-                    st.warning(f"📅 Balance: {balance_months:.1f} months")
-                else:
-                    st.error(f"📅 Balance: {balance_months:.1f} months")
+                with col_i2:
+                    if balance_months > 3:
+                        st.success(f"📅 Balance: {balance_months:.1f} months")
+                    elif balance_months > 1:
+                        st.warning(f"📅 Balance: {balance_months:.1f} months")
+                    else:
+                        st.error(f"📅 Balance: {balance_months:.1f} months")
             
-            with col_i3:
-                if credit_score >= 750:
-                    st.success(f"⭐ Credit: {credit_score}")
-                elif credit_score >= 650:
-                    st.warning(f"⭐ Credit: {credit_score}")
-                else:
-                    st.error(f"⭐ Credit: {credit_score}")
+                with col_i3:
+                    if credit_score >= 750:
+                        st.success(f"⭐ Credit: {credit_score}")
+                    elif credit_score >= 650:
+                        st.warning(f"⭐ Credit: {credit_score}")
+                    else:
+                        st.error(f"⭐ Credit: {credit_score}")
             
-            with col_i4:
-                if loan_to_income < 50:
-                    st.success(f"📊 Loan/Income: {loan_to_income:.1f}%")
-                elif loan_to_income < 100:
-                    st.warning(f"📊 Loan/Income: {loan_to_income:.1f}%")
-                else:
-                    st.error(f"📊 Loan/Income: {loan_to_income:.1f}%")
+                with col_i4:
+                    if loan_to_income < 50:
+                        st.success(f"📊 Loan/Income: {loan_to_income:.1f}%")
+                    elif loan_to_income < 100:
+                        st.warning(f"📊 Loan/Income: {loan_to_income:.1f}%")
+                    else:
+                        st.error(f"📊 Loan/Income: {loan_to_income:.1f}%")
+            
+            if metrics_file:
+                metrics.write_textfile(metrics_file)
+    
+    if models_available and any(models_available.values()):
+        st.markdown("---")
+        st.header("🎚️ What-if Analysis")
+        what_if_key = 'rf' if model_choice == "Random Forest" and models_available['rf'] else 'improved_lr'
+        what_if = get_what_if_scorer(model_store, what_if_key, model_version)
+        if what_if.grid is not None:
+            balance_max, salary_max = what_if.grid.balance_range[1], what_if.grid.salary_range[1]
+        else:
+            balance_max, salary_max = 50000.0, 1000000.0
+        
+        col_w1, col_w2, col_w3 = st.columns(3)
+        with col_w1:
+            what_if_employed = st.radio("Employment", options=[1, 0], horizontal=True,
+                                        format_func=lambda x: "Employed" if x == 1 else "Unemployed",
+                                        index=0 if employed_value == 1 else 1, key="what_if_employed")
+        with col_w2:
+            what_if_balance = st.slider("Bank Balance (₹)", 0.0, balance_max,
+                                        min(float(bank_balance), balance_max), step=100.0, key="what_if_balance")
+        with col_w3:
+            what_if_salary = st.slider("Annual Salary (₹)", 1000.0, salary_max,
+                                       min(max(float(annual_salary), 1000.0), salary_max), step=1000.0,
+                                       key="what_if_salary")
+        
+        with metrics.timer('what_if'):
+            _, what_if_probability = what_if(what_if_employed, what_if_balance, what_if_salary)
+            balances = np.linspace(0.0, balance_max, 200)
+            salaries = np.linspace(1000.0, salary_max, 200)
+            by_balance = what_if.curve(what_if_employed, balances, what_if_salary)
+            by_salary = what_if.curve(what_if_employed, what_if_balance, salaries)
+        
+        st.metric("Default Probability (what-if)", f"{what_if_probability[1] * 100:.2f}%")
+        col_s1, col_s2 = st.columns(2)
+        with col_s1:
+            st.caption("Default probability vs bank balance")
+            st.line_chart(pd.DataFrame({'Default %': by_balance * 100}, index=pd.Index(balances, name='Bank Balance')))
+        with col_s2:
+            st.caption("Default probability vs annual salary")
+            st.line_chart(pd.DataFrame({'Default %': by_salary * 100}, index=pd.Index(salaries, name='Annual Salary')))
+        st.caption(
+            f"{'Risk grid' if what_if.grid is not None else 'No risk grid; model'} answers: "
+            f"{what_if.hits} from the grid · {what_if.misses} from the model"
+        )
 
 with col2:
     st.header("ℹ️ Model Information")
@@ -0,0 +1,79 @@
+import io
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+HEADER_MEMBER = 'header.json'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Size of a zip local file header before the file name and extra field.
+_LOCAL_HEADER_SIZE = 30
+# Extra-field id used by Android's zipalign for padding; readers skip it.
+_PADDING_FIELD_ID = 0xD935
+
+
+def _aligned_zipinfo(name, offset, npy_header_size):
+    info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_STORED
+    data_start = offset + _LOCAL_HEADER_SIZE + len(name.encode('utf-8')) + 4 + npy_header_size
+    padding = -data_start % ALIGNMENT
+    info.extra = struct.pack('<HH', _PADDING_FIELD_ID, padding) + b'\0' * padding
+    return info
+
+
+def save_bundle(path, kind, header, arrays):
+    # An uncompressed .npz (still readable with np.load) plus a JSON header.
+    # Array data is stored uncompressed and 64-byte aligned so load_bundle can
+    # memory-map it straight out of the archive.
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as bundle:
+        bundle.writestr(HEADER_MEMBER, json.dumps({'kind': kind, 'format_version': FORMAT_VERSION, **header}))
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, array, allow_pickle=False)
+            npy_bytes = buffer.getvalue()
+            npy_header_size = len(npy_bytes) - array.nbytes
+            info = _aligned_zipinfo(f'{name}.npy', bundle.fp.tell(), npy_header_size)
+            bundle.writestr(info, npy_bytes)
+
+
+def _member_array(fp, path, info, mmap):
+    fp.seek(info.header_offset)
+    local_header = fp.read(_LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+    fp.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+    if not mmap or info.compress_type != zipfile.ZIP_STORED or dtype.hasobject:
+        return None
+    order = 'F' if fortran_order else 'C'
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype, order=order)
+    # A plain ndarray view; the memmap stays alive as its base.
+    return np.memmap(path, dtype=dtype, mode='r', offset=fp.tell(), shape=shape, order=order).view(np.ndarray)
+
+
+def load_bundle(path, expected_kind=None, mmap=True):
+    arrays = {}
+    with zipfile.ZipFile(path) as bundle, open(path, 'rb') as fp:
+        header = json.loads(bundle.read(HEADER_MEMBER))
+        if expected_kind is not None and header.get('kind') != expected_kind:
+            raise ValueError(f"{path} holds a '{header.get('kind')}' artifact, expected '{expected_kind}'")
+        if header.get('format_version', 0) > FORMAT_VERSION:
+            raise ValueError(f"{path} was written by a newer version (format {header['format_version']})")
+        for info in bundle.infolist():
+            if not info.filename.endswith('.npy'):
+                continue
+            name = info.filename[:-len('.npy')]
+            array = _member_array(fp, path, info, mmap)
+            if array is None:
+                with bundle.open(info) as member:
+                    array = np.lib.format.read_array(member, allow_pickle=False)
+            arrays[name] = array
+    return header, arrays
@@ -0,0 +1,153 @@
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from src.scoring import MODELS_DIR, ModelStore, load_models, model_scaler, score_batch
+
+_END = object()
+
+
+def applicant_row(applicant):
+    if isinstance(applicant, dict):
+        return (applicant['employed'], applicant['bank_balance'], applicant['annual_salary'])
+    return tuple(applicant)
+
+
+class AsyncScorer:
+    def __init__(self, model, scaler, max_concurrency=4, queue_size=1024, batch_size=256, executor=None,
+                 threshold=None, calibrator=None):
+        self.model = model
+        self.scaler = model_scaler(model, scaler)
+        self.threshold = threshold
+        self.calibrator = calibrator
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    @classmethod
+    def from_models(cls, model_key='rf', models_dir=MODELS_DIR, **kwargs):
+        improved_model, scaler, rf_model, _ = load_models(models_dir, compiled=True)
+        model = rf_model if model_key == 'rf' else improved_model
+        if model is None:
+            raise FileNotFoundError(f"Model '{model_key}' not found in {models_dir}")
+        store_key = 'rf' if model_key == 'rf' else 'improved_lr'
+        store = ModelStore(models_dir)
+        kwargs.setdefault('threshold', store.decision_threshold(store_key))
+        kwargs.setdefault('calibrator', store.calibrator(store_key))
+        return cls(model, scaler, **kwargs)
+
+    def _loop_semaphore(self):
+        # asyncio primitives bind to the loop that first waits on them, so each
+        # event loop the scorer runs under gets its own in-flight cap.
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _score_rows(self, rows):
+        loop = asyncio.get_running_loop()
+        raw = np.array(rows, dtype=np.float64)
+        score = partial(score_batch, threshold=self.threshold, calibrator=self.calibrator)
+        return await loop.run_in_executor(self.executor, score, self.model, self.scaler, raw)
+
+    async def score(self, applicant):
+        async with self._loop_semaphore():
+            predictions, probabilities = await self._score_rows([applicant_row(applicant)])
+        return predictions[0], probabilities[0]
+
+    async def _produce(self, applicants, queue):
+        try:
+            if hasattr(applicants, '__aiter__'):
+                async for applicant in applicants:
+                    await queue.put(applicant_row(applicant))
+            else:
+                for applicant in applicants:
+                    await queue.put(applicant_row(applicant))
+        except asyncio.CancelledError:
+            # score_many is shutting down and will not read the queue again;
+            # a blocking put here could never complete.
+            raise
+        except BaseException:
+            await queue.put(_END)
+            raise
+        await queue.put(_END)
+
+    def _drain_batch(self, first, queue):
+        rows = []
+        item = first
+        while item is not _END:
+            rows.append(item)
+            if len(rows) >= self.batch_size or queue.empty():
+                return rows, False
+            item = queue.get_nowait()
+        return rows, True
+
+    async def score_many(self, applicants):
+        # The bounded queue blocks the producer once it is queue_size rows
+        # ahead. A semaphore slot is held from dispatch until a batch's results
+        # are handed back, so scored-but-unread rows count against the cap too.
+        semaphore = self._loop_semaphore()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        producer = asyncio.create_task(self._produce(applicants, queue))
+        pending = collections.deque()
+        next_item = None
+        rows = None
+        finished = False
+        try:
+            while True:
+                while pending and pending[0].done():
+                    task = pending.popleft()
+                    try:
+                        predictions, probabilities = task.result()
+                    finally:
+                        semaphore.release()
+                    for prediction, probability in zip(predictions, probabilities):
+                        yield prediction, probability
+
+                if rows is not None:
+                    if semaphore.locked() and pending:
+                        await asyncio.wait([pending[0]])
+                        continue
+                    await semaphore.acquire()
+                    pending.append(asyncio.create_task(self._score_rows(rows)))
+                    rows = None
+                    continue
+
+                if finished:
+                    if not pending:
+                        break
+                    await asyncio.wait([pending[0]])
+                    continue
+
+                if next_item is None:
+                    next_item = asyncio.ensure_future(queue.get())
+                if pending and not next_item.done():
+                    # Hand back finished results while the producer is idle.
+                    await asyncio.wait([next_item, pending[0]], return_when=asyncio.FIRST_COMPLETED)
+                    if not next_item.done():
+                        continue
+
+                first = await next_item
+                next_item = None
+                rows, finished = self._drain_batch(first, queue)
+                if not rows:
+                    rows = None
+            await producer
+        finally:
+            for task in [producer, next_item, *pending]:
+                if task is not None:
+                    task.cancel()
+            for _ in pending:
+                semaphore.release()
+
+    def close(self):
+        if self._own_executor:
+            self.executor.shutdown()
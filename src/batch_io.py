@@ -0,0 +1,72 @@
+import os
+
+import pandas as pd
+
+from src.features import RAW_COLUMNS
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+
+def is_parquet(path):
+    return os.path.splitext(path)[1].lower() in PARQUET_EXTENSIONS
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet files need pyarrow. Install it with 'pip install pyarrow'.") from exc
+    return pyarrow
+
+
+def source_columns(path):
+    if is_parquet(path):
+        return list(_require_pyarrow().parquet.ParquetFile(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_applicant_chunks(path, chunk_size, extra_columns=(), dtypes=None):
+    columns = list(extra_columns) + RAW_COLUMNS
+    if is_parquet(path):
+        pa = _require_pyarrow()
+        parquet_file = pa.parquet.ParquetFile(path)
+        missing = [column for column in columns if column not in parquet_file.schema_arrow.names]
+        if missing:
+            raise ValueError(f"Columns not found in {path}: {missing}")
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            frame = batch.to_pandas()
+            yield frame if dtypes is None else frame.astype(dtypes)
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size, dtype=dtypes)
+
+
+class ResultWriter:
+    def __init__(self, path):
+        self.path = path
+        self.parquet = is_parquet(path)
+        self._writer = None
+        self._header_written = False
+
+    def write(self, frame):
+        if self.parquet:
+            pa = _require_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='a' if self._header_written else 'w',
+                         header=not self._header_written, index=False)
+            self._header_written = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,106 @@
+import collections
+import os
+import threading
+import time
+
+from src.scoring import MODELS_DIR
+
+
+def models_signature(models_dir=MODELS_DIR):
+    try:
+        entries = sorted(os.scandir(models_dir), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return ()
+    return tuple(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in entries if entry.is_file()
+    )
+
+
+class PredictionCache:
+    def __init__(self, maxsize=10_000, ttl=3600.0, precision=None, models_dir=MODELS_DIR,
+                 check_interval=1.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.precision = precision
+        self.models_dir = models_dir
+        self.check_interval = check_interval
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = models_signature(models_dir)
+        self._version = 0
+        self._next_check = clock() + check_interval
+
+    def _check_models(self, now):
+        # A retrain rewrites files in models/; stat them at most once per
+        # check_interval rather than on every lookup.
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        signature = models_signature(self.models_dir)
+        if signature != self._signature:
+            self._signature = signature
+            self._version += 1
+            self._entries.clear()
+
+    def _quantize(self, value):
+        value = float(value)
+        return value if self.precision is None else round(value, self.precision)
+
+    def key(self, model_key, employed, bank_balance, annual_salary):
+        return (self._version, model_key, int(employed), self._quantize(bank_balance), self._quantize(annual_salary))
+
+    def get(self, model_key, employed, bank_balance, annual_salary):
+        with self._lock:
+            now = self.clock()
+            self._check_models(now)
+            key = self.key(model_key, employed, bank_balance, annual_salary)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, model_key, employed, bank_balance, annual_salary, result):
+        with self._lock:
+            now = self.clock()
+            self._check_models(now)
+            key = self.key(model_key, employed, bank_balance, annual_salary)
+            self._entries[key] = (now + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_score(self, model_key, employed, bank_balance, annual_salary, score_fn):
+        result = self.get(model_key, employed, bank_balance, annual_salary)
+        if result is None:
+            result = score_fn()
+            self.put(model_key, employed, bank_balance, annual_salary, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'model_version': self._version
+            }
@@ -0,0 +1,159 @@
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+
+PLATT = 'platt'
+ISOTONIC = 'isotonic'
+METHODS = (PLATT, ISOTONIC)
+RELIABILITY_BINS = 10
+# Keeps logit() finite for probabilities of exactly 0 or 1.
+LOGIT_EPSILON = 1e-6
+
+
+def _logit(p):
+    p = np.clip(p, LOGIT_EPSILON, 1.0 - LOGIT_EPSILON)
+    return np.log(p) - np.log1p(-p)
+
+
+class Calibrator:
+    """Monotone map from a model's P(default) to a calibrated one.
+
+    Isotonic: piecewise linear through sorted breakpoints, a few dozen
+    points found by binary search (np.interp) and clipped at both ends.
+    Platt: sigmoid(a * logit(p) + b).
+    """
+
+    def __init__(self, method, breakpoints=(), values=(), coef=(1.0, 0.0)):
+        if method not in METHODS:
+            raise ValueError(f"Unknown calibration method {method!r}, expected one of {METHODS}")
+        self.method = method
+        self.breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.coef = tuple(float(value) for value in coef)
+
+    def __call__(self, p_default):
+        p_default = np.asarray(p_default, dtype=np.float64)
+        if self.method == PLATT:
+            a, b = self.coef
+            return 1.0 / (1.0 + np.exp(-(a * _logit(p_default) + b)))
+        return np.interp(p_default, self.breakpoints, self.values)
+
+    @classmethod
+    def fit(cls, method, p_default, y_true):
+        """Fit on held-out predictions; sklearn is only needed here."""
+        p_default = np.asarray(p_default, dtype=np.float64)
+        if method == PLATT:
+            from sklearn.linear_model import LogisticRegression
+            # Effectively unregularised: two parameters, thousands of rows.
+            model = LogisticRegression(C=1e6).fit(_logit(p_default)[:, None], y_true)
+            return cls(PLATT, coef=(model.coef_[0, 0], model.intercept_[0]))
+        if method == ISOTONIC:
+            from sklearn.isotonic import IsotonicRegression
+            model = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip').fit(p_default, y_true)
+            # Only the ends of each flat step are kept, so the table is tiny.
+            return cls(ISOTONIC, model.X_thresholds_, model.y_thresholds_)
+        raise ValueError(f"Unknown calibration method {method!r}, expected one of {METHODS}")
+
+
+def brier_score(y_true, p_default):
+    return float(np.mean((np.asarray(p_default, dtype=np.float64) - np.asarray(y_true)) ** 2))
+
+
+def reliability_curve(y_true, p_default, bins=RELIABILITY_BINS):
+    """Per equal-width probability bin that has rows: the mean predicted
+    P(default), the observed default rate and the row count."""
+    p_default = np.asarray(p_default, dtype=np.float64)
+    index = np.minimum((p_default * bins).astype(np.intp), bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    predicted = np.bincount(index, weights=p_default, minlength=bins)
+    observed = np.bincount(index, weights=np.asarray(y_true, dtype=np.float64), minlength=bins)
+    rows = counts > 0
+    return {
+        'bin_start': (np.flatnonzero(rows) / bins).tolist(),
+        'predicted': (predicted[rows] / counts[rows]).tolist(),
+        'observed': (observed[rows] / counts[rows]).tolist(),
+        'rows': counts[rows].tolist(),
+    }
+
+
+def report_lines(model_key, report):
+    """Human-readable Brier scores and reliability curves for one entry of
+    Calibration.reports."""
+    lines = [f"{model_key}: {report['method']}, Brier {report['brier_before']:.4f} -> {report['brier_after']:.4f} "
+             f"on {report['eval_rows']:,} held-out rows (fitted on {report['fit_rows']:,})"]
+    for label in ('before', 'after'):
+        curve = report[f'reliability_{label}']
+        lines.append(f"   Reliability {label}: bin, rows, mean predicted, observed default rate")
+        for start, rows, predicted, observed in zip(curve['bin_start'], curve['rows'], curve['predicted'],
+                                                    curve['observed']):
+            lines.append(f"      {start:.1f}  {rows:8,}  {predicted:.4f}  {observed:.4f}")
+    return lines
+
+
+def calibration_folds(n_rows, seed=0):
+    """Split held-out rows in two: one half to fit the calibrator, the other
+    to compare Brier scores and reliability before and after."""
+    order = np.random.default_rng(seed).permutation(n_rows)
+    return np.sort(order[:n_rows // 2]), np.sort(order[n_rows // 2:])
+
+
+class Calibration:
+    """One Calibrator per model, plus the before/after report it was chosen
+    by (Brier scores and reliability curves on the evaluation fold)."""
+
+    def __init__(self, calibrators, reports):
+        self.calibrators = calibrators
+        self.reports = reports
+
+    @property
+    def models(self):
+        return list(self.calibrators)
+
+    def get(self, model_key):
+        return self.calibrators.get(model_key)
+
+    @classmethod
+    def fit(cls, y_true, p_default, method='auto', seed=0):
+        """p_default maps model keys to their probabilities for the held-out
+        rows y_true. method 'auto' keeps whichever of Platt and isotonic has
+        the lower Brier score on the evaluation fold."""
+        y_true = np.asarray(y_true)
+        fit_rows, eval_rows = calibration_folds(len(y_true), seed)
+        calibrators, reports = {}, {}
+        for model_key, values in p_default.items():
+            values = np.asarray(values, dtype=np.float64)
+            candidates = {candidate: Calibrator.fit(candidate, values[fit_rows], y_true[fit_rows])
+                          for candidate in (METHODS if method == 'auto' else (method,))}
+            briers = {candidate: brier_score(y_true[eval_rows], calibrator(values[eval_rows]))
+                      for candidate, calibrator in candidates.items()}
+            chosen = min(briers, key=briers.get)
+            calibrators[model_key] = candidates[chosen]
+            reports[model_key] = {
+                'method': chosen,
+                'fit_rows': len(fit_rows),
+                'eval_rows': len(eval_rows),
+                'brier_before': brier_score(y_true[eval_rows], values[eval_rows]),
+                'brier_after': briers[chosen],
+                'brier_by_method': briers,
+                'reliability_before': reliability_curve(y_true[eval_rows], values[eval_rows]),
+                'reliability_after': reliability_curve(y_true[eval_rows], candidates[chosen](values[eval_rows])),
+            }
+        return cls(calibrators, reports)
+
+    def save(self, path):
+        header = {'models': {model_key: {'method': calibrator.method, 'coef': calibrator.coef}
+                             for model_key, calibrator in self.calibrators.items()},
+                  'reports': self.reports}
+        arrays = {}
+        for i, calibrator in enumerate(self.calibrators.values()):
+            arrays[f'breakpoints_{i}'] = calibrator.breakpoints
+            arrays[f'values_{i}'] = calibrator.values
+        save_bundle(path, 'calibration', header, arrays)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        header, data = load_bundle(path, 'calibration', mmap=mmap)
+        calibrators = {model_key: Calibrator(spec['method'], data[f'breakpoints_{i}'], data[f'values_{i}'],
+                                             spec['coef'])
+                       for i, (model_key, spec) in enumerate(header['models'].items())}
+        return cls(calibrators, header['reports'])
@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+
+# What the models' own predict() amounts to.
+DEFAULT_THRESHOLD = 0.5
+# The cost curve is stored at this many evenly spaced cutoffs in [0, 1].
+CURVE_POINTS = 501
+
+# Per applicant, as fractions of the loan: approving one who defaults loses
+# loss_given_default; declining one who would have repaid loses the interest.
+CostMatrix = namedtuple('CostMatrix', ['loss_given_default', 'lost_interest'])
+DEFAULT_COSTS = CostMatrix(loss_given_default=0.45, lost_interest=0.10)
+
+
+def decide(p_default, threshold):
+    """0 (approve) or 1 (decline) per applicant: decline when P(default)
+    reaches the cutoff."""
+    return (np.asarray(p_default) >= threshold).astype(np.intp)
+
+
+def cost_curve(y_true, p_default, costs=DEFAULT_COSTS):
+    """Total cost of every distinct cutoff, from one sort and two cumulative
+    sums instead of a pass over the rows per cutoff.
+
+    Returns (thresholds, cost), thresholds descending: declining the rows
+    with P(default) >= thresholds[i] costs cost[i]. The first cutoff is inf,
+    declining nobody.
+    """
+    p_default = np.asarray(p_default, dtype=np.float64)
+    # Unstable (about 5x faster): the order among ties does not matter.
+    order = np.argsort(p_default)[::-1]
+    p_sorted = p_default[order]
+    declined_defaults = np.cumsum(np.asarray(y_true)[order] == 1)
+    declined_repaid = np.arange(1, len(p_sorted) + 1) - declined_defaults
+    # Rows with the same probability are declined together, so only the
+    # last row of each run is a real cutoff.
+    cut = np.flatnonzero(np.append(p_sorted[1:] != p_sorted[:-1], True))
+    total_defaults = declined_defaults[-1] if len(cut) else 0
+    thresholds = np.concatenate([[np.inf], p_sorted[cut]])
+    missed_defaults = total_defaults - np.concatenate([[0], declined_defaults[cut]])
+    lost_repaid = np.concatenate([[0], declined_repaid[cut]])
+    return thresholds, missed_defaults * costs.loss_given_default + lost_repaid * costs.lost_interest
+
+
+def cost_at(thresholds, cost, cutoffs):
+    """Read the cost of arbitrary cutoffs off a cost_curve."""
+    # The cost of cutoff c is that of the smallest curve threshold >= c.
+    index = np.searchsorted(-thresholds, -np.asarray(cutoffs, dtype=np.float64), side='right') - 1
+    return cost[index]
+
+
+class DecisionPolicy:
+    """Cost-optimal cutoff per model, fitted on held-out predictions.
+
+    summaries holds, per model, the cutoff, the number of rows it was fitted
+    on and the cost per applicant at that cutoff and at DEFAULT_THRESHOLD;
+    curves holds the cost per applicant at CURVE_POINTS cutoffs.
+    """
+
+    def __init__(self, costs, summaries, curves):
+        self.costs = CostMatrix(*costs)
+        self.summaries = summaries
+        self.curves = curves
+
+    @property
+    def models(self):
+        return list(self.summaries)
+
+    def threshold(self, model_key):
+        summary = self.summaries.get(model_key)
+        return DEFAULT_THRESHOLD if summary is None else summary['threshold']
+
+    @classmethod
+    def fit(cls, y_true, p_default, costs=DEFAULT_COSTS):
+        """p_default maps model keys to their default probabilities for the
+        labelled rows y_true."""
+        costs = CostMatrix(*costs)
+        summaries, curves = {}, {}
+        grid = np.linspace(0.0, 1.0, CURVE_POINTS)
+        for model_key, values in p_default.items():
+            thresholds, cost = cost_curve(y_true, values, costs)
+            best = int(np.argmin(cost))
+            rows = max(len(values), 1)
+            summaries[model_key] = {
+                # inf (decline nobody) is stored as anything above 1.
+                'threshold': float(min(thresholds[best], np.nextafter(1.0, 2.0))),
+                'cost_per_applicant': float(cost[best] / rows),
+                'default_cost_per_applicant': float(cost_at(thresholds, cost, DEFAULT_THRESHOLD) / rows),
+                'rows': len(values),
+            }
+            curves[model_key] = cost_at(thresholds, cost, grid) / rows
+        return cls(costs, summaries, curves)
+
+    def save(self, path):
+        save_bundle(path, 'decision_policy', {'costs': self.costs._asdict(), 'summaries': self.summaries},
+                    {f'curve_{i}': self.curves[model_key] for i, model_key in enumerate(self.models)})
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        header, data = load_bundle(path, 'decision_policy', mmap=mmap)
+        summaries = header['summaries']
+        curves = {model_key: data[f'curve_{i}'] for i, model_key in enumerate(summaries)}
+        return cls(CostMatrix(**header['costs']), summaries, curves)
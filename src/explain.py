@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from src.features import FEATURE_COLUMNS, engineer_features
+from src.forest import FlatForest, export_forest
+from src.linear import FusedLinearModel, fuse_linear_model
+from src.scoring import DEFAULT_CHUNK_SIZE, scale_features
+
+REASON_COUNT = 3
+REASON_COLUMNS = [f'Reason_{i + 1}' for i in range(REASON_COUNT)]
+
+
+class LinearExplainer:
+    """Exact attributions for logistic regression: each feature's term of the
+    log-odds measured from the training mean, coef * (x - mean). base_value
+    plus a row's attributions is its log-odds."""
+
+    units = 'log-odds'
+
+    def __init__(self, model, scaler):
+        if not isinstance(model, FusedLinearModel):
+            model = fuse_linear_model(model, scaler)
+        self.coef = np.asarray(model.coef, dtype=np.float64)
+        if scaler is not None and scaler.with_mean:
+            self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        else:
+            self.mean = np.zeros_like(self.coef)
+        self.base_value = model.intercept + float(self.coef @ self.mean)
+
+    def contributions(self, features):
+        features -= self.mean
+        features *= self.coef
+        return features
+
+
+class TreeExplainer:
+    """Path attributions (FlatForest.contributions) for a random forest.
+    base_value plus a row's attributions is its default probability."""
+
+    units = 'probability'
+
+    def __init__(self, model, scaler):
+        # A pickled forest is flattened once, up front.
+        self.forest = model if isinstance(model, FlatForest) else export_forest(model)
+        self.scaler = scaler
+        self.base_value = self.forest.base_value()
+
+    def contributions(self, features):
+        if self.scaler is not None:
+            features = scale_features(self.scaler, features)
+        return self.forest.contributions(features)
+
+
+def explainer_for(model, scaler):
+    """The explainer for a model from ModelStore.get; scaler is the store's
+    scaler even for a fused linear model."""
+    if isinstance(model, FusedLinearModel) or hasattr(model, 'coef_'):
+        return LinearExplainer(model, scaler)
+    return TreeExplainer(model, scaler)
+
+
+def explain_batch(explainer, data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(N, len(FEATURE_COLUMNS)) attributions toward default for raw
+    applicant rows, in explainer.units."""
+    features = engineer_features(data)
+    contributions = np.empty_like(features)
+    for start in range(0, len(features), chunk_size):
+        stop = min(start + chunk_size, len(features))
+        contributions[start:stop] = explainer.contributions(features[start:stop])
+    return contributions
+
+
+def top_reasons(contributions, count=REASON_COUNT):
+    """Indices into FEATURE_COLUMNS of the features pushing each row hardest
+    toward default, strongest first; -1 once a row runs out of features
+    with a positive attribution."""
+    order = np.argsort(-contributions, axis=1, kind='stable')[:, :count]
+    reasons = order.astype(np.int8)
+    reasons[np.take_along_axis(contributions, order, axis=1) <= 0] = -1
+    return reasons
+
+
+def reason_labels(reasons):
+    """top_reasons indices as a Categorical of feature names (missing for -1)."""
+    return pd.Categorical.from_codes(reasons, categories=FEATURE_COLUMNS)
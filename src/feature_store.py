@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from src.batch_io import iter_applicant_chunks, source_columns
+from src.features import FEATURE_COLUMNS, RAW_COLUMNS, engineer_features
+from src.training import RANDOM_STATE, TARGET_COLUMN, TEST_SIZE, data_fingerprint, split_indices, write_json
+
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 100_000
+
+# 0/1 columns are stored as one byte per row.
+FLAG_COLUMNS = ('Employed', TARGET_COLUMN)
+
+
+def column_file(column):
+    return column.lower().replace(' ', '_').replace('?', '') + '.npy'
+
+
+def is_feature_store(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def _column_dtype(column, dtype):
+    return np.dtype(np.uint8) if column in FLAG_COLUMNS else np.dtype(dtype)
+
+
+def _write_npy(path, raw_path, dtype, n_rows):
+    # Columns are appended to a raw file while the CSV streams past, since the
+    # row count (part of the .npy header) is only known at the end.
+    with open(path, 'wb') as out, open(raw_path, 'rb') as raw:
+        np.lib.format.write_array_header_1_0(out, {
+            'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (n_rows,)
+        })
+        shutil.copyfileobj(raw, out, 1 << 20)
+    os.remove(raw_path)
+
+
+def build_feature_store(data_path, store_dir, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, id_columns=()):
+    """Parse an applicant file once into one memory-mappable .npy per column.
+
+    Holds raw and engineered features (flags as uint8, everything else in
+    dtype), the label when the file has one, any numeric id columns, and the
+    train/test split indices used by train_model.py.
+    """
+    labelled = TARGET_COLUMN in source_columns(data_path)
+    columns = list(id_columns) + FEATURE_COLUMNS + ([TARGET_COLUMN] if labelled else [])
+    if len(set(columns)) != len(columns):
+        raise ValueError("Id columns must not repeat feature or label columns")
+
+    os.makedirs(store_dir, exist_ok=True)
+    manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+    # The manifest is written last, so a half-built store is never opened.
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    dtypes = {column: _column_dtype(column, dtype) for column in FEATURE_COLUMNS + [TARGET_COLUMN]}
+    raw_paths = {column: os.path.join(store_dir, column_file(column) + '.raw') for column in columns}
+    raw_files = {column: open(path, 'wb') for column, path in raw_paths.items()}
+    n_rows = 0
+    try:
+        extra_columns = list(id_columns) + ([TARGET_COLUMN] if labelled else [])
+        for chunk in iter_applicant_chunks(data_path, chunk_size, extra_columns):
+            features = engineer_features(chunk, dtype=dtype)
+            values = {column: features[:, i] for i, column in enumerate(FEATURE_COLUMNS)}
+            for column in extra_columns:
+                if not pd.api.types.is_numeric_dtype(chunk[column]):
+                    raise ValueError(f"'{column}' must be numeric to be stored")
+                values[column] = chunk[column].to_numpy()
+                dtypes.setdefault(column, values[column].dtype)
+            for column in FLAG_COLUMNS:
+                if column in values and not np.isin(values[column], (0, 1)).all():
+                    raise ValueError(f"'{column}' must only contain 0 and 1")
+            for column in columns:
+                raw_files[column].write(np.ascontiguousarray(values[column], dtype=dtypes[column]).tobytes())
+            n_rows += len(chunk)
+    finally:
+        for f in raw_files.values():
+            f.close()
+
+    for column in columns:
+        dtypes.setdefault(column, np.dtype(np.int64))
+        _write_npy(os.path.join(store_dir, column_file(column)), raw_paths[column], dtypes[column], n_rows)
+    if labelled:
+        train_idx, test_idx = split_indices(n_rows) if n_rows > 1 else (np.arange(n_rows), np.arange(0))
+        np.save(os.path.join(store_dir, 'train_index.npy'), train_idx)
+        np.save(os.path.join(store_dir, 'test_index.npy'), test_idx)
+
+    write_json(manifest_path, {
+        'format_version': FORMAT_VERSION,
+        'source': os.path.abspath(data_path),
+        'fingerprint': data_fingerprint(data_path),
+        'rows': n_rows,
+        'dtype': np.dtype(dtype).name,
+        'columns': {column: {'file': column_file(column), 'dtype': str(dtypes[column])} for column in columns},
+        'split': {'test_size': TEST_SIZE, 'random_state': RANDOM_STATE} if labelled else None,
+    })
+    return FeatureStore(store_dir)
+
+
+class FeatureStore:
+    """Read-only view of a store written by build_feature_store.
+
+    Columns are memory-mapped, so opening a store and slicing rows reads only
+    the pages that are touched.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        if self.manifest['format_version'] > FORMAT_VERSION:
+            raise ValueError(f"{store_dir} was written by a newer version (format {self.manifest['format_version']})")
+        self._columns = {}
+
+    def __len__(self):
+        return self.manifest['rows']
+
+    @property
+    def columns(self):
+        return list(self.manifest['columns'])
+
+    @property
+    def has_labels(self):
+        return TARGET_COLUMN in self.manifest['columns']
+
+    def is_current(self, data_path):
+        return self.manifest['fingerprint'] == data_fingerprint(data_path)
+
+    def column(self, name):
+        if name not in self._columns:
+            if name not in self.manifest['columns']:
+                raise KeyError(f"Column '{name}' is not in the feature store; available: {self.columns}")
+            path = os.path.join(self.store_dir, self.manifest['columns'][name]['file'])
+            self._columns[name] = np.load(path, mmap_mode='r')
+        return self._columns[name]
+
+    def split(self, name):
+        if name not in ('train', 'test'):
+            raise ValueError(f"Split must be 'train' or 'test', got '{name}'")
+        if not self.has_labels:
+            raise ValueError("This feature store has no label column, so no train/test split")
+        return np.load(os.path.join(self.store_dir, f'{name}_index.npy'), mmap_mode='r')
+
+    def matrix(self, columns=FEATURE_COLUMNS, rows=None, dtype=None):
+        """Stack columns into an (N, len(columns)) array, optionally for a
+        slice or an index array of rows. This is the one copy made: the
+        layout models expect."""
+        arrays = [self.column(name) if rows is None else self.column(name)[rows] for name in columns]
+        if dtype is None:
+            dtype = np.result_type(*(array.dtype for array in arrays))
+        n_rows = len(arrays[0]) if arrays else 0
+        out = np.empty((n_rows, len(columns)), dtype=dtype)
+        for i, array in enumerate(arrays):
+            out[:, i] = array
+        return out
+
+    def features(self, rows=None, dtype=None):
+        return self.matrix(FEATURE_COLUMNS, rows, dtype)
+
+    def labels(self, rows=None):
+        labels = self.column(TARGET_COLUMN)
+        return np.asarray(labels if rows is None else labels[rows])
+
+    def iter_frames(self, chunk_size, columns=RAW_COLUMNS):
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            yield pd.DataFrame({name: self.column(name)[start:stop] for name in columns}, columns=columns)
+
+
+def open_or_build(data_path, store_dir, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, id_columns=()):
+    """The store in store_dir if it was built from this version of data_path
+    with the same options, otherwise a freshly built one."""
+    if is_feature_store(store_dir):
+        store = FeatureStore(store_dir)
+        if (store.is_current(data_path) and store.manifest['dtype'] == np.dtype(dtype).name
+                and all(column in store.manifest['columns'] for column in id_columns)):
+            return store
+    return build_feature_store(data_path, store_dir, chunk_size=chunk_size, dtype=dtype, id_columns=id_columns)
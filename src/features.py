@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+RAW_COLUMNS = ['Employed', 'Bank Balance', 'Annual Salary']
+ENGINEERED_COLUMNS = ['Savings_Ratio', 'Monthly_Salary', 'Balance_to_Salary']
+FEATURE_COLUMNS = RAW_COLUMNS + ENGINEERED_COLUMNS
+
+# The compact data path: 0/1 flags in one byte, money in float32.
+COMPACT_DTYPES = {'Employed': np.uint8, 'Bank Balance': np.float32, 'Annual Salary': np.float32}
+
+
+def raw_matrix(data, dtype=np.float64):
+    if isinstance(data, pd.DataFrame):
+        x = data[RAW_COLUMNS].to_numpy(dtype=dtype)
+    else:
+        x = np.asarray(data, dtype=dtype)
+    if x.ndim == 1:
+        x = x.reshape(1, -1)
+    if x.ndim != 2 or x.shape[1] != len(RAW_COLUMNS):
+        raise ValueError(f"Expected an (N, {len(RAW_COLUMNS)}) array of {RAW_COLUMNS}, got shape {x.shape}")
+    if not np.isfinite(x).all():
+        raise ValueError(f"{RAW_COLUMNS} must be finite numbers, got NaN or infinity")
+    return x
+
+
+def engineer_features(data, dtype=np.float64):
+    raw = raw_matrix(data, dtype=dtype)
+    features = np.empty((raw.shape[0], len(FEATURE_COLUMNS)), dtype=dtype)
+    features[:, :3] = raw
+    bank_balance = features[:, 1]
+    annual_salary = features[:, 2]
+
+    np.divide(bank_balance, annual_salary + 1, out=features[:, 3])
+    np.divide(annual_salary, 12, out=features[:, 4])
+    np.divide(bank_balance, features[:, 4] + 1, out=features[:, 5])
+    return features
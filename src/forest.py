@@ -0,0 +1,197 @@
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+
+# Rows x trees walked at once; small enough that the per-level index
+# arrays stay in cache, large enough to amortise NumPy call overhead.
+BLOCK_CELLS = 1 << 16
+
+# Below this many rows the flat walk beats sklearn's per-call overhead; above
+# it sklearn's compiled tree loop is faster, so large batches are handed to
+# the original model when one is attached.
+FALLBACK_MIN_ROWS = 2048
+
+
+class FlatForest:
+    def __init__(self, feature, threshold, children, value, roots, classes, n_features, max_depth, fallback=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+        # Either a fitted model or a zero-argument loader, resolved on the
+        # first batch large enough to need it.
+        self.fallback = fallback
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def _check_input(self, X):
+        # sklearn evaluates splits on float32 inputs against float64 thresholds.
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got shape {X.shape}")
+        if not np.isfinite(X).all():
+            raise ValueError("Input contains NaN or infinity")
+        return X
+
+    def apply(self, X):
+        X = self._check_input(X)
+        flat_x = X.ravel()
+        row_offset = (np.arange(X.shape[0], dtype=np.int32) * self.n_features_in_)[:, None]
+        nodes = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        index = np.empty_like(nodes)
+        x_value = np.empty(nodes.shape, dtype=np.float32)
+        go_right = np.empty(nodes.shape, dtype=bool)
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=index)
+            index += row_offset
+            np.take(flat_x, index, out=x_value)
+            np.greater(x_value, np.take(self.threshold, nodes), out=go_right)
+            np.take(self.children, nodes, out=nodes)
+            nodes += go_right
+        return nodes
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        n_rows = X.shape[0]
+        if self.fallback is not None and n_rows >= FALLBACK_MIN_ROWS:
+            if callable(self.fallback):
+                self.fallback = self.fallback()
+            return self.fallback.predict_proba(X)
+        proba = np.empty((n_rows, len(self.classes_)), dtype=np.float64)
+        block = max(1, BLOCK_CELLS // self.n_estimators)
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            leaves = self.apply(X[start:stop])
+            for k in range(len(self.classes_)):
+                proba[start:stop, k] = np.take(self.value[:, k], leaves).sum(axis=1) / self.n_estimators
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def contributions(self, X, column=1):
+        """Per-feature attributions of predict_proba(X)[:, column] (Saabas'
+        path method): each split on a row's path credits its feature with the
+        change in the node value from parent to child, averaged over trees.
+        A row's attributions plus base_value(column) sum to its probability."""
+        X = self._check_input(X)
+        n_rows = X.shape[0]
+        contributions = np.empty((n_rows, self.n_features_in_), dtype=np.float64)
+        block = max(1, BLOCK_CELLS // self.n_estimators)
+        node_value = np.ascontiguousarray(self.value[:, column])
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            contributions[start:stop] = self._path_contributions(X[start:stop], node_value)
+        contributions /= self.n_estimators
+        return contributions
+
+    def _path_contributions(self, X, node_value):
+        n_rows = X.shape[0]
+        flat_x = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int32) * self.n_features_in_)[:, None]
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        index = np.empty_like(nodes)
+        x_value = np.empty(nodes.shape, dtype=np.float32)
+        go_right = np.empty(nodes.shape, dtype=bool)
+        parent_value = np.take(node_value, nodes)
+        child_value = np.empty_like(parent_value)
+        totals = np.zeros(n_rows * self.n_features_in_, dtype=np.float64)
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=index)
+            index += row_offset
+            np.take(flat_x, index, out=x_value)
+            np.greater(x_value, np.take(self.threshold, nodes), out=go_right)
+            np.take(self.children, nodes, out=nodes)
+            nodes += go_right
+            # Leaves point back at themselves, so their steps add zero.
+            np.take(node_value, nodes, out=child_value)
+            parent_value -= child_value
+            totals += np.bincount(index.ravel(), weights=parent_value.ravel(), minlength=len(totals))
+            parent_value, child_value = child_value, parent_value
+        # Accumulated as parent - child above.
+        return -totals.reshape(n_rows, self.n_features_in_)
+
+    def base_value(self, column=1):
+        return float(self.value[self.roots, column].mean())
+
+    def save(self, path):
+        save_bundle(
+            path, 'flat_forest',
+            {'n_features': self.n_features_in_, 'max_depth': self.max_depth},
+            {'feature': self.feature, 'threshold': self.threshold, 'children': self.children,
+             'value': self.value, 'roots': self.roots, 'classes': self.classes_}
+        )
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        header, data = load_bundle(path, 'flat_forest', mmap=mmap)
+        return cls(data['feature'], data['threshold'], data['children'], data['value'],
+                   data['roots'], data['classes'], header['n_features'], header['max_depth'])
+
+
+def float32_thresholds(threshold):
+    # Inputs are float32 by the time they are compared, and for a float32 x,
+    # x <= t exactly when x <= the largest float32 not above t. Rounding each
+    # threshold down to that value halves its size without changing a split.
+    rounded = threshold.astype(np.float32)
+    too_high = rounded > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _breadth_first_order(tree):
+    # Children of every split node end up next to each other, so the right
+    # child is always children[node] + 1.
+    order = [0]
+    for node in order:
+        if tree.children_left[node] != -1:
+            order.append(tree.children_left[node])
+            order.append(tree.children_right[node])
+    return np.array(order)
+
+
+def export_forest(rf_model, keep_fallback=False):
+    trees = [estimator.tree_ for estimator in rf_model.estimators_]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    n_nodes = offsets[-1]
+
+    feature = np.zeros(n_nodes, dtype=np.int32)
+    threshold = np.empty(n_nodes, dtype=np.float64)
+    children = np.empty(n_nodes, dtype=np.int32)
+    value = np.empty((n_nodes, rf_model.n_classes_), dtype=np.float64)
+
+    for tree, offset in zip(trees, offsets):
+        order = _breadth_first_order(tree)
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        nodes = position + offset
+        is_leaf = tree.children_left == -1
+
+        feature[nodes] = np.where(is_leaf, 0, tree.feature)
+        # Leaves never go right and point back at themselves, so every row can
+        # take exactly max_depth steps regardless of where its path ends.
+        threshold[nodes] = np.where(is_leaf, np.inf, tree.threshold)
+        children[nodes] = np.where(is_leaf, nodes, position[tree.children_left] + offset)
+
+        leaf_value = tree.value[:, 0, :]
+        normalizer = leaf_value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        value[nodes] = leaf_value / normalizer
+
+    return FlatForest(
+        feature=feature,
+        threshold=float32_thresholds(threshold),
+        children=children,
+        value=value,
+        roots=offsets[:-1].astype(np.int32),
+        classes=np.asarray(rf_model.classes_),
+        n_features=rf_model.n_features_in_,
+        max_depth=max(tree.max_depth for tree in trees),
+        fallback=rf_model if keep_fallback else None
+    )
@@ -0,0 +1,51 @@
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+
+
+def _sigmoid(z):
+    # exp() only ever sees non-positive arguments, so large |z| cannot overflow.
+    e = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1.0 / (1.0 + e), e / (1.0 + e))
+
+
+class FusedLinearModel:
+    def __init__(self, coef, intercept, classes):
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.classes_ = classes
+        self.n_features_in_ = len(coef)
+
+    def decision_function(self, features):
+        return np.asarray(features, dtype=np.float64) @ self.coef + self.intercept
+
+    def predict_proba(self, features):
+        p_default = _sigmoid(self.decision_function(features))
+        return np.column_stack([1.0 - p_default, p_default])
+
+    def predict(self, features):
+        return self.classes_.take((self.decision_function(features) > 0).astype(np.intp))
+
+    def save(self, path):
+        save_bundle(path, 'fused_linear', {'intercept': self.intercept},
+                    {'coef': self.coef, 'classes': self.classes_})
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        header, data = load_bundle(path, 'fused_linear', mmap=mmap)
+        return cls(data['coef'], header['intercept'], data['classes'])
+
+
+def fuse_linear_model(lr_model, scaler):
+    if lr_model.coef_.shape[0] != 1:
+        raise ValueError("Only binary logistic regression models can be fused")
+
+    coef = lr_model.coef_[0].astype(np.float64)
+    intercept = float(lr_model.intercept_[0])
+    # w . (x - mean) / scale + b  ==  (w / scale) . x + (b - (w / scale) . mean)
+    if scaler.with_std:
+        coef = coef / scaler.scale_
+    if scaler.with_mean:
+        intercept -= float(coef @ scaler.mean_)
+
+    return FusedLinearModel(coef, intercept, np.asarray(lr_model.classes_))
@@ -0,0 +1,245 @@
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Upper bounds, in seconds, of the latency buckets (Prometheus "le" labels).
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+ENABLE_ENV = 'LOAN_METRICS'
+
+
+class RollingHistogram:
+    """Latency histogram kept two ways: cumulative since start (what
+    Prometheus scrapes) and over the last window_seconds, split into slots
+    that are recycled as time moves on."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window_seconds=60.0, slots=6, clock=time.monotonic):
+        self.buckets = tuple(buckets)
+        self.slot_seconds = window_seconds / slots
+        self._clock = clock
+        self.counts = np.zeros(len(self.buckets) + 1, dtype=np.int64)
+        self.total = 0.0
+        self._slot_counts = np.zeros((slots, len(self.buckets) + 1), dtype=np.int64)
+        self._slot_epochs = np.full(slots, -1, dtype=np.int64)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        self.counts[index] += 1
+        self.total += seconds
+        epoch = int(self._clock() // self.slot_seconds)
+        slot = epoch % len(self._slot_epochs)
+        if self._slot_epochs[slot] != epoch:
+            self._slot_epochs[slot] = epoch
+            self._slot_counts[slot] = 0
+        self._slot_counts[slot, index] += 1
+
+    def window_counts(self):
+        epoch = int(self._clock() // self.slot_seconds)
+        live = self._slot_epochs > epoch - len(self._slot_epochs)
+        return self._slot_counts[live].sum(axis=0)
+
+    def quantile(self, q, counts=None):
+        # Linear interpolation inside the bucket holding the q-th observation;
+        # the overflow bucket reports the largest bound.
+        counts = self.window_counts() if counts is None else counts
+        total = counts.sum()
+        if total == 0:
+            return None
+        rank = q * total
+        cumulative = np.cumsum(counts)
+        index = int(np.searchsorted(cumulative, rank))
+        if index >= len(self.buckets):
+            return self.buckets[-1]
+        lower = self.buckets[index - 1] if index else 0.0
+        below = cumulative[index - 1] if index else 0
+        fraction = (rank - below) / counts[index] if counts[index] else 1.0
+        return lower + (self.buckets[index] - lower) * fraction
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.registry.inc('stage_errors_total', stage=self.stage)
+        return False
+
+
+class MetricsRegistry:
+    """Stage timers and counters for the prediction path.
+
+    Disabled registries hand out one shared no-op timer, so instrumented code
+    costs a method call and an empty with-block (well under a microsecond).
+    """
+
+    def __init__(self, enabled=False, namespace='loan', buckets=DEFAULT_BUCKETS, window_seconds=60.0,
+                 clock=time.monotonic):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def timer(self, stage):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = RollingHistogram(
+                    self.buckets, self.window_seconds, clock=self._clock
+                )
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """Per-stage count, mean and rolling p50/p99 (seconds), plus counters."""
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                window = histogram.window_counts()
+                stages[stage] = {
+                    'count': histogram.count,
+                    'mean': histogram.total / histogram.count if histogram.count else None,
+                    'p50': histogram.quantile(0.5, window),
+                    'p99': histogram.quantile(0.99, window),
+                }
+            counters = {
+                name + ''.join(f'[{key}={value}]' for key, value in labels): value
+                for (name, labels), value in self._counters.items()
+            }
+        return {'stages': stages, 'counters': counters}
+
+    def render_prometheus(self):
+        histogram_name = f'{self.namespace}_stage_seconds'
+        lines = [
+            f'# HELP {histogram_name} Wall time per prediction pipeline stage.',
+            f'# TYPE {histogram_name} histogram',
+        ]
+        rolling = []
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                cumulative = np.cumsum(histogram.counts)
+                for bound, count in zip(histogram.buckets, cumulative):
+                    lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="{bound:g}"}} {count}')
+                lines.append(f'{histogram_name}_bucket{{stage="{stage}",le="+Inf"}} {cumulative[-1]}')
+                lines.append(f'{histogram_name}_sum{{stage="{stage}"}} {histogram.total:.9g}')
+                lines.append(f'{histogram_name}_count{{stage="{stage}"}} {cumulative[-1]}')
+                window = histogram.window_counts()
+                for q in (0.5, 0.9, 0.99):
+                    value = histogram.quantile(q, window)
+                    if value is not None:
+                        rolling.append(f'{histogram_name}_rolling{{stage="{stage}",quantile="{q}"}} {value:.9g}')
+
+            if rolling:
+                lines.append(f'# HELP {histogram_name}_rolling Estimated quantiles over the last '
+                             f'{self.window_seconds:g}s.')
+                lines.append(f'# TYPE {histogram_name}_rolling gauge')
+                lines.extend(rolling)
+
+            counter_names = sorted({name for name, _ in self._counters})
+            for name in counter_names:
+                full_name = f'{self.namespace}_{name}'
+                lines.append(f'# TYPE {full_name} counter')
+                for (counter_name, labels), value in sorted(self._counters.items()):
+                    if counter_name != name:
+                        continue
+                    label_text = ','.join(f'{key}="{value_}"' for key, value_ in labels)
+                    lines.append(f'{full_name}{{{label_text}}} {value}' if label_text else f'{full_name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        # Written then renamed, as node_exporter's textfile collector expects.
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _metrics_handler(registry):
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MetricsRequestHandler
+
+
+def start_metrics_server(registry, host='127.0.0.1', port=9108):
+    """Serve GET /metrics from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _metrics_handler(registry))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Shared by the scoring engine and the app; off unless LOAN_METRICS=1.
+REGISTRY = MetricsRegistry(enabled=os.environ.get(ENABLE_ENV, '') not in ('', '0'))
@@ -0,0 +1,150 @@
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+from src.batch_io import iter_applicant_chunks
+from src.features import FEATURE_COLUMNS, engineer_features
+from src.scoring import scale_features
+from src.training import RANDOM_STATE, TARGET_COLUMN, TEST_SIZE, stage
+
+DEFAULT_CHUNK_SIZE = 100_000
+CLASSES = np.array([0, 1])
+
+
+def iter_labeled_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Each chunk's holdout mask comes from a seed fixed by its position, so
+    # every pass over the file puts the same rows in the test split.
+    chunks = iter_applicant_chunks(path, chunk_size, extra_columns=[TARGET_COLUMN])
+    for number, chunk in enumerate(chunks):
+        labels = chunk[TARGET_COLUMN].to_numpy()
+        if len(labels) and (labels.min() < CLASSES[0] or labels.max() > CLASSES[-1]):
+            raise ValueError(f"'{TARGET_COLUMN}' must only contain 0 and 1")
+        is_test = np.random.default_rng([RANDOM_STATE, number]).random(len(labels)) < TEST_SIZE
+        yield engineer_features(chunk), labels, is_test
+
+
+class RowSample:
+    """Bernoulli sample of streamed rows, capped at max_rows.
+
+    Storage is allocated once up front, so memory does not depend on how many
+    rows are offered.
+    """
+
+    def __init__(self, max_rows, expected_rows, seed):
+        self.rate = min(1.0, max_rows / max(expected_rows, 1))
+        self.features = np.empty((max_rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+        self.labels = np.empty(max_rows, dtype=np.int64)
+        self.size = 0
+        self._rng = np.random.default_rng(seed)
+
+    def offer(self, features, labels):
+        rows = np.flatnonzero(self._rng.random(len(labels)) < self.rate)[:len(self.labels) - self.size]
+        stop = self.size + len(rows)
+        self.features[self.size:stop] = features[rows]
+        self.labels[self.size:stop] = labels[rows]
+        self.size = stop
+
+    def arrays(self):
+        return self.features[:self.size], self.labels[:self.size]
+
+
+def _fit_shard(features, labels, n_estimators, max_depth, seed):
+    if len(np.unique(labels)) != len(CLASSES):
+        raise ValueError("A forest shard sampled only one class; raise rf_shard_rows")
+    forest = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, class_weight='balanced',
+                                    random_state=seed, n_jobs=1)
+    return forest.fit(features, labels)
+
+
+def combine_forests(forests):
+    # Trees are independent, so forests fitted on different shards of the
+    # same feature space average into one forest by pooling their estimators.
+    combined = forests[0]
+    for forest in forests[1:]:
+        if not np.array_equal(forest.classes_, combined.classes_):
+            raise ValueError("Forests were fitted on different classes")
+        combined.estimators_ += forest.estimators_
+    combined.n_estimators = len(combined.estimators_)
+    return combined
+
+
+def train_out_of_core(path, chunk_size=DEFAULT_CHUNK_SIZE, epochs=3, alpha=1e-4, eta0=0.01, rf_shards=4,
+                      rf_shard_rows=100_000, rf_trees_per_shard=25, rf_max_depth=10,
+                      eval_rows=200_000, n_jobs=-1, timings=None):
+    """Fit the scaler, an SGD logistic regression and optionally a sharded
+    forest while holding only one chunk of the file in memory at a time.
+
+    The file is read once for the scaler and class counts, then once per SGD
+    epoch. The forest shards and the evaluation holdout are fixed-size
+    samples taken during the first epoch.
+    """
+    timings = {} if timings is None else timings
+
+    scaler = StandardScaler()
+    class_counts = np.zeros(len(CLASSES), dtype=np.int64)
+    n_test = 0
+    with stage('scaler', timings):
+        for features, labels, is_test in iter_labeled_chunks(path, chunk_size):
+            train = ~is_test
+            if train.any():
+                scaler.partial_fit(features[train])
+            class_counts += np.bincount(labels[train], minlength=len(CLASSES))
+            n_test += int(is_test.sum())
+    n_train = int(class_counts.sum())
+    if (class_counts == 0).any():
+        raise ValueError(f"Training rows must contain both classes, got counts {class_counts.tolist()}")
+    # Same weights as class_weight='balanced'.
+    class_weight = n_train / (len(CLASSES) * class_counts)
+
+    # A small constant step: sklearn's default 'optimal' schedule starts with
+    # steps large enough that the balanced weights (~15x on defaults) make the
+    # first chunks swing the coefficients far off.
+    linear = SGDClassifier(loss='log_loss', alpha=alpha, learning_rate='constant', eta0=eta0,
+                           random_state=RANDOM_STATE)
+    shards = [RowSample(rf_shard_rows, n_train, [RANDOM_STATE, 1, i]) for i in range(rf_shards)]
+    holdout = RowSample(eval_rows, n_test, [RANDOM_STATE, 2])
+    with stage('sgd', timings):
+        for epoch in range(epochs):
+            rng = np.random.default_rng([RANDOM_STATE, 3, epoch])
+            for features, labels, is_test in iter_labeled_chunks(path, chunk_size):
+                scale_features(scaler, features)
+                if epoch == 0:
+                    holdout.offer(features[is_test], labels[is_test])
+                x_train, y_train = features[~is_test], labels[~is_test]
+                if epoch == 0:
+                    for shard in shards:
+                        shard.offer(x_train, y_train)
+                order = rng.permutation(len(y_train))
+                linear.partial_fit(x_train[order], y_train[order], classes=CLASSES,
+                                   sample_weight=class_weight[y_train[order]])
+
+    forest = None
+    if shards:
+        with stage('rf', timings):
+            forest = combine_forests(Parallel(n_jobs=n_jobs)(
+                delayed(_fit_shard)(*shard.arrays(), rf_trees_per_shard, rf_max_depth, RANDOM_STATE + i)
+                for i, shard in enumerate(shards)
+            ))
+
+    metrics = {}
+    with stage('evaluate', timings):
+        x_holdout, y_holdout = holdout.arrays()
+        for name, model in (('lr', linear), ('rf', forest)):
+            if model is None or len(np.unique(y_holdout)) < len(CLASSES):
+                continue
+            metrics[name] = {
+                'accuracy': float(model.score(x_holdout, y_holdout)),
+                'roc_auc': float(roc_auc_score(y_holdout, model.predict_proba(x_holdout)[:, 1])),
+                'holdout_rows': int(len(y_holdout)),
+            }
+
+    return {
+        'scaler': scaler,
+        'linear': linear,
+        'forest': forest,
+        'metrics': metrics,
+        'rows': {'train': n_train, 'test': n_test},
+    }
@@ -0,0 +1,145 @@
+import streamlit as st
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src import scoring
+from src.batch_io import is_parquet
+from src.batch_scoring import read_applicants, results_bytes, score_applicants, summarize
+from src.explain import explainer_for
+from src.metrics import REGISTRY as METRICS
+from src.registry import REGISTRY_DIR, shared_live_store
+
+st.set_page_config(
+    page_title="Batch Scoring - Loan Default Prediction",
+    page_icon="📦",
+    layout="wide"
+)
+
+MODEL_OPTIONS = {"Random Forest": 'rf', "Improved Logistic Regression": 'improved_lr'}
+CHUNK_SIZE = 100_000
+
+@st.cache_resource
+def load_model_store():
+    return scoring.ModelStore(compiled=True)
+
+@st.cache_resource
+def get_live_models():
+    # The same registry, and the same loaded versions, as the main page.
+    return shared_live_store(os.environ.get('LOAN_MODEL_REGISTRY', REGISTRY_DIR))
+
+@st.cache_resource
+def get_explainer(_model_store, model_key, model_version):
+    return explainer_for(_model_store.get(model_key), _model_store.scaler)
+
+@st.cache_data(max_entries=2, show_spinner="Reading file...")
+def read_upload(data, name):
+    return read_applicants(io.BytesIO(data), name)
+
+st.title("📦 Batch Scoring")
+st.markdown(
+    "Upload a CSV or Parquet file with `Employed`, `Bank Balance` and `Annual Salary` columns "
+    "(and optionally `Loan Amount`). Every row is checked with the same rules as the single-applicant form: "
+    "rows with errors are kept in the results with the reason and no prediction, rows with only warnings are "
+    "scored and keep their warnings."
+)
+
+live_models = get_live_models()
+if live_models is not None:
+    serving = live_models.current()
+    model_store, model_version = serving.store, serving.version
+else:
+    model_store, model_version = load_model_store(), None
+options = [name for name, key in MODEL_OPTIONS.items() if model_store.available[key]]
+if not options:
+    st.error("Improved models not available. Run 'python scripts/train_model.py' first.")
+    st.stop()
+
+model_choice = st.sidebar.selectbox("Select Model", options=options, index=0)
+model_key = MODEL_OPTIONS[model_choice]
+threshold = model_store.decision_threshold(model_key)
+if threshold is not None:
+    st.sidebar.caption(f"Decision cutoff: default at P(default) ≥ {threshold:.1%} (cost-optimal)")
+explain = st.sidebar.checkbox("Add top reasons per row", value=True,
+                              help="Reason_1..Reason_3: the features pushing each scored row hardest toward default")
+
+uploaded = st.file_uploader("Applicant file", type=['csv', 'parquet', 'pq'])
+if uploaded is None:
+    st.stop()
+
+try:
+    applicants = read_upload(uploaded.getvalue(), uploaded.name)
+except (ValueError, ImportError) as exc:
+    st.error(f"❌ Could not read {uploaded.name}: {exc}")
+    st.stop()
+
+st.caption(f"{len(applicants):,} rows · {len(applicants.columns)} columns")
+st.dataframe(applicants.head(100), use_container_width=True)
+
+# Results survive the reruns the download button and widgets trigger.
+run_key = (uploaded.file_id, model_key, explain, model_version)
+if st.button(f"🔮 Score {len(applicants):,} applicants", use_container_width=True):
+    model = model_store.get(model_key)
+    progress = st.progress(0.0, text="Scoring...")
+
+    def report(done, total):
+        progress.progress(done / total, text=f"Scored {done:,} of {total:,} valid rows")
+
+    with METRICS.timer('batch_score'):
+        results, validation = score_applicants(applicants, model, scoring.model_scaler(model, model_store.scaler),
+                                               chunk_size=CHUNK_SIZE, progress=report, threshold=threshold,
+                                               calibrator=model_store.calibrator(model_key),
+                                               explainer=get_explainer(model_store, model_key, model_version) if explain else None)
+    METRICS.inc('batch_rows_total', len(results), model=model_key)
+    progress.progress(1.0, text="Preparing download...")
+    st.session_state['batch_results'] = {
+        'run_key': run_key,
+        'summary': summarize(results, validation),
+        'preview': results.head(100),
+        'download': results_bytes(results, parquet=is_parquet(uploaded.name)),
+    }
+    progress.empty()
+
+batch = st.session_state.get('batch_results')
+if batch is None or batch['run_key'] != run_key:
+    st.stop()
+
+summary = batch['summary']
+st.markdown("---")
+st.subheader("📊 Summary")
+col_m1, col_m2, col_m3, col_m4, col_m5 = st.columns(5)
+col_m1.metric("Rows", f"{summary['rows']:,}")
+col_m2.metric("Scored", f"{summary['scored']:,}")
+col_m3.metric("Scored with warnings", f"{summary['with_warnings']:,}")
+col_m4.metric("Rejected by validation", f"{summary['rejected']:,}")
+col_m5.metric("Predicted defaults", f"{summary['predicted_defaults']:,}")
+if summary['mean_default_probability'] is not None:
+    st.caption(f"Mean default probability of scored rows: {summary['mean_default_probability'] * 100:.2f}%")
+
+col_c1, col_c2 = st.columns(2)
+with col_c1:
+    st.caption("Default probability distribution (scored rows)")
+    st.bar_chart(summary['histogram'])
+with col_c2:
+    st.caption("By employment status")
+    st.dataframe(summary['by_employment'], use_container_width=True)
+    if summary['validation']:
+        st.caption("Validation errors and warnings")
+        st.table({'Rule': list(summary['validation']), 'Rows': list(summary['validation'].values())})
+    if summary['top_reasons']:
+        st.caption("Strongest reason toward default (scored rows)")
+        st.table({'Feature': list(summary['top_reasons']), 'Rows': list(summary['top_reasons'].values())})
+
+st.caption("First 100 results")
+st.dataframe(batch['preview'], use_container_width=True)
+
+extension = 'parquet' if is_parquet(uploaded.name) else 'csv'
+st.download_button(
+    "⬇️ Download results",
+    data=batch['download'],
+    file_name=f"{os.path.splitext(uploaded.name)[0]}_scored.{extension}",
+    mime='application/octet-stream' if extension == 'parquet' else 'text/csv',
+    use_container_width=True
+)
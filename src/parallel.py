@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+from src.features import raw_matrix
+from src.forest import FlatForest, export_forest
+from src.linear import FusedLinearModel, fuse_linear_model
+from src.scoring import scaler_arrays, score_batch
+
+_worker_model = None
+_worker_scaler = None
+_worker_baseline = None
+
+
+def memory_usage_kb():
+    # Private pages are what a worker actually adds on top of the parent;
+    # RSS also counts pages still shared copy-on-write after fork.
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, value = line.split(':', 1)
+                if key in ('Rss', 'Private_Clean', 'Private_Dirty'):
+                    usage[key] = int(value.split()[0])
+    except OSError:
+        return {'rss': None, 'private': None}
+    return {'rss': usage['Rss'], 'private': usage['Private_Clean'] + usage['Private_Dirty']}
+
+
+def shareable_model(model, scaler):
+    # Only plain NumPy arrays stay shared when memory-mapped; sklearn copies
+    # tree nodes into private buffers when unpickled. Convert to the flat
+    # array forms, which are scored without the scaler or a sklearn fallback.
+    if isinstance(model, FlatForest):
+        forest = FlatForest.__new__(FlatForest)
+        forest.__dict__.update(model.__dict__, fallback=None)
+        return forest, scaler_arrays(scaler)
+    if isinstance(model, FusedLinearModel):
+        return model, None
+    if hasattr(model, 'estimators_'):
+        return export_forest(model), scaler_arrays(scaler)
+    if hasattr(model, 'coef_'):
+        return fuse_linear_model(model, scaler), None
+    raise ValueError(f"{type(model).__name__} cannot be shared through memory mapping; use the fork start method")
+
+
+def dump_shared(model, scaler, directory):
+    attributes = {}
+    for name, value in model.__dict__.items():
+        if isinstance(value, np.ndarray):
+            path = os.path.join(directory, f'{name}.npy')
+            np.save(path, value)
+            attributes[name] = ('npy', path)
+        else:
+            attributes[name] = ('value', value)
+    spec_path = os.path.join(directory, 'model.joblib')
+    joblib.dump((type(model), attributes, scaler), spec_path)
+    return spec_path
+
+
+def load_shared(spec_path):
+    cls, attributes, scaler = joblib.load(spec_path)
+    model = cls.__new__(cls)
+    for name, (kind, value) in attributes.items():
+        setattr(model, name, np.load(value, mmap_mode='r') if kind == 'npy' else value)
+    return model, scaler
+
+
+def _init_worker(model, scaler, spec_path):
+    global _worker_model, _worker_scaler, _worker_baseline
+    _worker_baseline = memory_usage_kb()
+    if spec_path is not None:
+        model, scaler = load_shared(spec_path)
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = 1
+    _worker_model, _worker_scaler = model, scaler
+
+
+def _score_slice(raw):
+    predictions, probabilities = score_batch(_worker_model, _worker_scaler, raw, dtype=raw.dtype)
+    usage = memory_usage_kb()
+    growth = {
+        key: None if usage[key] is None or _worker_baseline[key] is None else usage[key] - _worker_baseline[key]
+        for key in usage
+    }
+    return predictions, probabilities, os.getpid(), growth
+
+
+class ParallelScorer:
+    def __init__(self, model, scaler, n_jobs=-1, start_method=None, dtype=np.float64):
+        self.dtype = dtype
+        self.n_jobs = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        self.memory_growth_kb = {}
+        self._tmp_dir = None
+
+        if start_method == 'fork':
+            # Forked workers inherit the loaded model; its tree buffers stay
+            # shared copy-on-write instead of being unpickled per worker.
+            initargs = (model, scaler, None)
+        else:
+            model, scaler = shareable_model(model, scaler)
+            self._tmp_dir = tempfile.mkdtemp(prefix='loan_scoring_')
+            initargs = (None, None, dump_shared(model, scaler, self._tmp_dir))
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=initargs
+        )
+
+    def score(self, data, slices_per_worker=4):
+        raw = raw_matrix(data, dtype=self.dtype)
+        n_slices = max(1, min(len(raw), self.n_jobs * slices_per_worker))
+        parts = np.array_split(raw, n_slices)
+
+        predictions = []
+        probabilities = []
+        for part_predictions, part_probabilities, pid, growth in self._executor.map(_score_slice, parts):
+            predictions.append(part_predictions)
+            probabilities.append(part_probabilities)
+            self.memory_growth_kb[pid] = growth
+        return np.concatenate(predictions), np.concatenate(probabilities)
+
+    def close(self):
+        self._executor.shutdown()
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parallel_score_batch(model, scaler, data, n_jobs=-1, start_method=None, dtype=np.float64):
+    with ParallelScorer(model, scaler, n_jobs=n_jobs, start_method=start_method, dtype=dtype) as scorer:
+        return scorer.score(data)
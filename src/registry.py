@@ -0,0 +1,214 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from src.metrics import REGISTRY as METRICS
+from src.scoring import CALIBRATION_FILE, DECISION_POLICY_FILE, DRIFT_REFERENCE_FILE, IMPROVED_MODEL_FILE, \
+    LR_FUSED_FILE, MODEL_KEYS, MODELS_DIR, RF_FLAT_FILE, RF_MODEL_FILE, RISK_GRID_FILES, SCALER_ARRAYS_FILE, \
+    SCALER_FILE, ModelStore, model_scaler, score_batch
+
+REGISTRY_DIR = os.path.join(MODELS_DIR, 'registry')
+MANIFEST_FILE = 'manifest.json'
+ARTIFACT_FILES = (IMPROVED_MODEL_FILE, SCALER_FILE, RF_MODEL_FILE, RF_FLAT_FILE, LR_FUSED_FILE, SCALER_ARRAYS_FILE,
+                  DRIFT_REFERENCE_FILE, CALIBRATION_FILE, DECISION_POLICY_FILE) + tuple(RISK_GRID_FILES.values())
+VERSION_LENGTH = 12
+
+# Scored by every model of a new version before it goes live, so the first
+# real request does not pay for lazy loading.
+WARM_UP_ROWS = np.array([[1, 10000.0, 300000.0], [0, 500.0, 20000.0], [1, 0.0, 1.0], [0, 40000.0, 1000000.0]])
+
+ModelVersion = namedtuple('ModelVersion', ['version', 'store', 'info'])
+
+
+def content_version(models_dir, names):
+    """Hash of the named files' names and bytes: the same artifacts always
+    get the same version."""
+    digest = hashlib.sha256()
+    for name in sorted(names):
+        digest.update(name.encode('utf-8') + b'\0')
+        with open(os.path.join(models_dir, name), 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:VERSION_LENGTH]
+
+
+def read_manifest(registry_dir=REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'current': None, 'versions': {}}
+
+
+def _write_manifest(registry_dir, manifest):
+    # Readers only ever see the old manifest or the new one.
+    path = os.path.join(registry_dir, MANIFEST_FILE)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def has_manifest(registry_dir=REGISTRY_DIR):
+    return os.path.exists(os.path.join(registry_dir, MANIFEST_FILE))
+
+
+def publish(models_dir=MODELS_DIR, registry_dir=REGISTRY_DIR, metrics=None):
+    """Copy the artifacts in models_dir into registry_dir/<version>/ and make
+    that version current; returns the version."""
+    names = [name for name in ARTIFACT_FILES if os.path.exists(os.path.join(models_dir, name))]
+    if not names:
+        raise FileNotFoundError(f"No model artifacts in {models_dir}")
+    version = content_version(models_dir, names)
+    os.makedirs(registry_dir, exist_ok=True)
+    target = os.path.join(registry_dir, version)
+    if not os.path.isdir(target):
+        # Copied next to the target and renamed into place, so a watcher
+        # never finds a half-copied version directory.
+        staging = os.path.join(registry_dir, f'.{version}.{os.getpid()}.tmp')
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for name in names:
+            shutil.copy2(os.path.join(models_dir, name), os.path.join(staging, name))
+        os.replace(staging, target)
+
+    manifest = read_manifest(registry_dir)
+    manifest['versions'][version] = {
+        'published_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'files': names,
+        'metrics': metrics or {},
+    }
+    manifest['current'] = version
+    _write_manifest(registry_dir, manifest)
+    return version
+
+
+def activate(version, registry_dir=REGISTRY_DIR):
+    """Point the manifest at an already published version, e.g. to roll back."""
+    manifest = read_manifest(registry_dir)
+    if version not in manifest['versions']:
+        raise KeyError(f"Unknown model version: {version}")
+    manifest['current'] = version
+    _write_manifest(registry_dir, manifest)
+
+
+def warm_up(store):
+    """Load every available model, the scaler, the calibration, the decision
+    policy and the risk grids, and score WARM_UP_ROWS with each model."""
+    for model_key in MODEL_KEYS:
+        model = store.get(model_key)
+        if model is None:
+            continue
+        score_batch(model, model_scaler(model, store.scaler), WARM_UP_ROWS,
+                    threshold=store.decision_threshold(model_key), calibrator=store.calibrator(model_key))
+        store.risk_grid(model_key)
+
+
+class LiveModelStore:
+    """Serves the manifest's current version and follows the manifest.
+
+    A background thread polls the manifest every poll_interval seconds. A new
+    version is loaded and warmed up off the request path, then swapped in with
+    one assignment: callers take current() once per request and use its store
+    for both the scaler and the model, so no request mixes versions. A version
+    that fails to load is skipped and the old one keeps serving.
+    """
+
+    def __init__(self, registry_dir=REGISTRY_DIR, compiled=True, poll_interval=2.0):
+        self.registry_dir = registry_dir
+        self.compiled = compiled
+        self.poll_interval = poll_interval
+        self.swaps = 0
+        self.last_error = None
+        self._check_lock = threading.Lock()
+        self._manifest_stat = None
+        self._failed_version = None
+        manifest = self._read_if_changed()
+        if manifest is None or manifest['current'] is None:
+            raise FileNotFoundError(f"No published model version in {registry_dir}")
+        self._current = self._load(manifest['current'], manifest)
+        self._stop = threading.Event()
+        self._thread = None
+        if poll_interval:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+
+    def current(self):
+        return self._current
+
+    def _read_if_changed(self):
+        try:
+            stat = os.stat(os.path.join(self.registry_dir, MANIFEST_FILE))
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self._manifest_stat:
+            return None
+        self._manifest_stat = signature
+        return read_manifest(self.registry_dir)
+
+    def _load(self, version, manifest):
+        store = ModelStore(os.path.join(self.registry_dir, version), compiled=self.compiled)
+        if not any(store.available.values()):
+            raise FileNotFoundError(f"Model version {version} has no usable models")
+        warm_up(store)
+        return ModelVersion(version, store, manifest['versions'].get(version, {}))
+
+    def check(self):
+        """Swap to the manifest's current version if it changed; True if it did."""
+        with self._check_lock:
+            manifest = self._read_if_changed()
+            if manifest is None:
+                return False
+            version = manifest['current']
+            if version is None or version == self._current.version or version == self._failed_version:
+                return False
+            try:
+                loaded = self._load(version, manifest)
+            except Exception as exc:
+                self._failed_version = version
+                self.last_error = f"{version}: {exc}"
+                METRICS.inc('model_swap_failures_total')
+                return False
+            self._current = loaded
+            self._failed_version = None
+            self.swaps += 1
+            METRICS.inc('model_swaps_total')
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except (OSError, ValueError) as exc:
+                # A hand-edited manifest that does not parse; keep serving.
+                self.last_error = str(exc)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_live_store(registry_dir=REGISTRY_DIR):
+    """One LiveModelStore per registry per process, so the app's pages share
+    the loaded models and the watcher; None if nothing has been published."""
+    registry_dir = os.path.abspath(registry_dir)
+    with _shared_lock:
+        if registry_dir not in _shared:
+            if not has_manifest(registry_dir):
+                return None
+            _shared[registry_dir] = LiveModelStore(registry_dir)
+        return _shared[registry_dir]
@@ -0,0 +1,202 @@
+import math
+
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+from src.decision import DEFAULT_THRESHOLD, decide
+
+# Probabilities and error bounds are stored as uint16 fractions of QUANTUM.
+QUANTUM = 65535
+DEFAULT_SHAPE = (384, 384)
+DEFAULT_PROBES = 2
+DEFAULT_MAX_ERROR = 0.01
+
+
+def _grid_rows(employed, balances, salaries):
+    employed_values, balance_values, salary_values = np.meshgrid(employed, balances, salaries, indexing='ij')
+    return np.column_stack([employed_values.ravel(), balance_values.ravel(), salary_values.ravel()])
+
+
+def build_risk_grid(predict_default, balance_range, salary_range, shape=DEFAULT_SHAPE, probes=DEFAULT_PROBES):
+    """Tabulate P(default) over balance x salary for Employed = 0 and 1.
+
+    predict_default maps an (N, 3) array of raw (employed, balance, salary)
+    rows to N default probabilities. Each cell's error bound is the largest
+    of the spread of its corners (which bounds the error wherever the model
+    is monotone across the cell) and the interpolation error measured at
+    probes x probes points inside it, plus the rounding of the stored values.
+    A step narrower than the probe spacing can still slip through, so the
+    bound is an estimate, not a guarantee.
+    """
+    n_balance, n_salary = shape
+    if n_balance < 2 or n_salary < 2:
+        raise ValueError(f"A risk grid needs at least 2 points per axis, got {shape}")
+    balances = np.linspace(*balance_range, n_balance)
+    salaries = np.linspace(*salary_range, n_salary)
+
+    corners = predict_default(_grid_rows([0, 1], balances, salaries)).reshape(2, n_balance, n_salary)
+    prob = np.round(np.clip(corners, 0.0, 1.0) * QUANTUM).astype(np.uint16)
+
+    stored = prob / QUANTUM
+    p00, p10, p01, p11 = stored[:, :-1, :-1], stored[:, 1:, :-1], stored[:, :-1, 1:], stored[:, 1:, 1:]
+    error = np.maximum.reduce([p00, p10, p01, p11]) - np.minimum.reduce([p00, p10, p01, p11])
+    offsets = (np.arange(probes) + 0.5) / probes
+    for dx in offsets:
+        for dy in offsets:
+            probe_balances = balances[:-1] + dx * np.diff(balances)
+            probe_salaries = salaries[:-1] + dy * np.diff(salaries)
+            actual = predict_default(_grid_rows([0, 1], probe_balances, probe_salaries)).reshape(error.shape)
+            interpolated = (p00 * (1 - dx) + p10 * dx) * (1 - dy) + (p01 * (1 - dx) + p11 * dx) * dy
+            error = np.maximum(error, np.abs(interpolated - actual))
+    error = np.minimum(np.ceil(error * QUANTUM) + 1, QUANTUM).astype(np.uint16)
+    return RiskGrid(prob, error, balance_range, salary_range)
+
+
+class RiskGrid:
+    """P(default) tabulated on a uniform balance x salary grid per Employed
+    flag, answered by bilinear interpolation.
+
+    lookup returns None whenever the answer could differ from the model by
+    more than max_error, or the decision at threshold could flip: outside the grid, for a
+    non 0/1 Employed flag, or in a cell whose error bound is too large. The
+    caller then asks the model itself.
+    """
+
+    def __init__(self, prob, error, balance_range, salary_range, max_error=DEFAULT_MAX_ERROR,
+                 threshold=DEFAULT_THRESHOLD):
+        self.prob = prob
+        self.threshold = threshold
+        self.error = error
+        self.balance_range = tuple(float(value) for value in balance_range)
+        self.salary_range = tuple(float(value) for value in salary_range)
+        self.max_error = max_error
+        _, n_balance, n_salary = prob.shape
+        self._balance_scale = (n_balance - 1) / (self.balance_range[1] - self.balance_range[0])
+        self._salary_scale = (n_salary - 1) / (self.salary_range[1] - self.salary_range[0])
+        self._last_balance = n_balance - 2
+        self._last_salary = n_salary - 2
+
+    @property
+    def shape(self):
+        return self.prob.shape[1:]
+
+    def coverage(self, max_error=None):
+        """Fraction of cells answered from the grid at this error bound."""
+        max_error = self.max_error if max_error is None else max_error
+        return float(np.mean(self.error <= max_error * QUANTUM))
+
+    def check(self, predict_default, rows):
+        """Compare grid answers with the model on (N, 3) raw rows: the
+        fraction answered from the grid, the largest error among those, and
+        the fraction of them whose error exceeds max_error."""
+        rows = np.asarray(rows, dtype=np.float64)
+        answers = self.lookup_batch(rows[:, 0], rows[:, 1], rows[:, 2])
+        answered = ~np.isnan(answers)
+        errors = np.abs(answers[answered] - predict_default(rows[answered]))
+        return {
+            'answered': float(answered.mean()) if len(rows) else 0.0,
+            'max_error': float(errors.max()) if len(errors) else 0.0,
+            'over_bound': float(np.mean(errors > self.max_error)) if len(errors) else 0.0,
+        }
+
+    def lookup(self, employed, bank_balance, annual_salary):
+        """P(default) for one applicant, or None if the model must be asked."""
+        # Scalar arithmetic only: a single what-if answer costs a few microseconds.
+        x = (bank_balance - self.balance_range[0]) * self._balance_scale
+        y = (annual_salary - self.salary_range[0]) * self._salary_scale
+        if employed not in (0, 1) or not (0.0 <= x <= self._last_balance + 1 and 0.0 <= y <= self._last_salary + 1):
+            return None
+        i = min(int(x), self._last_balance)
+        j = min(int(y), self._last_salary)
+        e = int(employed)
+        bound = int(self.error[e, i, j]) / QUANTUM
+        if bound > self.max_error:
+            return None
+        prob = self.prob[e]
+        dx, dy = x - i, y - j
+        p = ((int(prob[i, j]) * (1 - dx) + int(prob[i + 1, j]) * dx) * (1 - dy)
+             + (int(prob[i, j + 1]) * (1 - dx) + int(prob[i + 1, j + 1]) * dx) * dy) / QUANTUM
+        if abs(p - self.threshold) <= bound:
+            return None
+        return p
+
+    def lookup_batch(self, employed, bank_balance, annual_salary):
+        """Vectorised lookup; NaN where the model must be asked."""
+        employed = np.asarray(employed, dtype=np.float64)
+        x = (np.asarray(bank_balance, dtype=np.float64) - self.balance_range[0]) * self._balance_scale
+        y = (np.asarray(annual_salary, dtype=np.float64) - self.salary_range[0]) * self._salary_scale
+        employed, x, y = np.broadcast_arrays(employed, x, y)
+        valid = ((employed == 0) | (employed == 1)) & (x >= 0) & (x <= self._last_balance + 1) \
+            & (y >= 0) & (y <= self._last_salary + 1)
+        e = np.where(valid, employed, 0).astype(np.intp)
+        i = np.clip(np.where(valid, x, 0), 0, self._last_balance).astype(np.intp)
+        j = np.clip(np.where(valid, y, 0), 0, self._last_salary).astype(np.intp)
+        dx, dy = x - i, y - j
+        prob = self.prob.astype(np.float64)
+        p = ((prob[e, i, j] * (1 - dx) + prob[e, i + 1, j] * dx) * (1 - dy)
+             + (prob[e, i, j + 1] * (1 - dx) + prob[e, i + 1, j + 1] * dx) * dy) / QUANTUM
+        bound = self.error[e, i, j] / QUANTUM
+        valid &= (bound <= self.max_error) & (np.abs(p - self.threshold) > bound)
+        return np.where(valid, p, np.nan)
+
+    def save(self, path):
+        save_bundle(path, 'risk_grid', {'balance_range': self.balance_range, 'salary_range': self.salary_range},
+                    {'prob': self.prob, 'error': self.error})
+
+    @classmethod
+    def load(cls, path, mmap=True, max_error=DEFAULT_MAX_ERROR, threshold=DEFAULT_THRESHOLD):
+        header, data = load_bundle(path, 'risk_grid', mmap=mmap)
+        return cls(data['prob'], data['error'], header['balance_range'], header['salary_range'], max_error,
+                   threshold)
+
+
+class GridScorer:
+    """Answers like score_applicant, from the grid when it can and from the
+    model otherwise.
+
+    score_rows takes an (N, 3) array of raw rows and returns (predictions,
+    probabilities), e.g. functools.partial(score_batch, model, scaler). With
+    grid=None every answer comes from the model.
+    """
+
+    def __init__(self, grid, score_rows):
+        self.grid = grid
+        self.score_rows = score_rows
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, employed, bank_balance, annual_salary):
+        p_default = None if self.grid is None else self.grid.lookup(employed, bank_balance, annual_salary)
+        if p_default is None:
+            self.misses += 1
+            predictions, probabilities = self.score_rows(np.array([[employed, bank_balance, annual_salary]],
+                                                                  dtype=np.float64))
+            return predictions[0], probabilities[0]
+        self.hits += 1
+        return int(decide(p_default, self.grid.threshold)), np.array([1.0 - p_default, p_default])
+
+    def curve(self, employed, bank_balance, annual_salary):
+        """Default probabilities for broadcast inputs (e.g. a sensitivity
+        sweep); points the grid cannot answer are scored in one batch."""
+        if self.grid is None:
+            shape = np.broadcast_shapes(np.shape(employed), np.shape(bank_balance), np.shape(annual_salary))
+            p_default = np.full(shape, np.nan)
+        else:
+            p_default = self.grid.lookup_batch(employed, bank_balance, annual_salary)
+        missing = np.isnan(p_default)
+        if missing.any():
+            rows = np.column_stack([np.broadcast_to(np.asarray(values, dtype=np.float64), p_default.shape)[missing]
+                                    for values in (employed, bank_balance, annual_salary)])
+            p_default[missing] = self.score_rows(rows)[1][:, 1]
+        self.misses += int(missing.sum())
+        self.hits += int(missing.size - missing.sum())
+        return p_default
+
+
+def axis_range(values, headroom=0.1):
+    # From zero to a little past the largest value seen, rounded up.
+    top = float(np.max(values)) * (1 + headroom)
+    if top <= 0:
+        return 0.0, 1.0
+    magnitude = 10 ** max(math.floor(math.log10(top)) - 1, 0)
+    return 0.0, float(math.ceil(top / magnitude) * magnitude)
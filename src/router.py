@@ -0,0 +1,204 @@
+import hashlib
+import queue
+import threading
+import time
+
+import numpy as np
+
+from src.metrics import REGISTRY as METRICS, RollingHistogram
+
+ROUTING_ENV = 'LOAN_ROUTING'
+HASH_BUCKETS = 10_000
+
+
+def parse_split(text, known_keys):
+    """'rf=90,improved_lr=10' as {model_key: percent}. A model at 0% is a
+    pure challenger: it only ever shadow-scores."""
+    weights = {}
+    for part in text.split(','):
+        key, separator, percent = part.partition('=')
+        key = key.strip()
+        if not separator or key not in known_keys:
+            raise ValueError(f"Expected model=percent with model in {sorted(known_keys)}, got {part.strip()!r}")
+        if key in weights:
+            raise ValueError(f"Model {key!r} is listed twice")
+        weights[key] = float(percent)
+    return weights
+
+
+def route_bucket(applicant_id):
+    # Stable across processes and restarts, unlike hash() on a str.
+    digest = hashlib.blake2b(str(applicant_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % HASH_BUCKETS
+
+
+class TrafficSplit:
+    """Sticky percentage routing: an applicant ID always hashes to the same
+    bucket, and buckets are handed out to models by cumulative percentage."""
+
+    def __init__(self, weights):
+        if not weights:
+            raise ValueError("A traffic split needs at least one model")
+        if any(percent < 0 for percent in weights.values()):
+            raise ValueError("Traffic percentages cannot be negative")
+        if abs(sum(weights.values()) - 100.0) > 1e-9:
+            raise ValueError(f"Traffic percentages must add up to 100, got {sum(weights.values()):g}")
+        self.weights = dict(weights)
+        self.models = tuple(weights)
+        self._bounds = np.round(np.cumsum(list(weights.values())) * HASH_BUCKETS / 100.0).astype(np.int64)
+
+    def route(self, applicant_id):
+        return self.models[int(np.searchsorted(self._bounds, route_bucket(applicant_id), side='right'))]
+
+
+class ModelStats:
+    def __init__(self):
+        self.served = 0
+        self.shadowed = 0
+        self.agreements = 0
+        self.abs_diff_total = 0.0
+        self.serve_latency = RollingHistogram()
+        self.shadow_latency = RollingHistogram()
+
+    def summary(self):
+        compared = self.shadowed
+        return {
+            'served': self.served,
+            'shadowed': self.shadowed,
+            'agreement': self.agreements / compared if compared else None,
+            'mean_abs_diff': self.abs_diff_total / compared if compared else None,
+            'serve_p50': self.serve_latency.quantile(0.5),
+            'serve_p99': self.serve_latency.quantile(0.99),
+            # Per background scoring call, which covers a whole queued batch.
+            'shadow_batch_p50': self.shadow_latency.quantile(0.5),
+        }
+
+
+class ShadowRouter:
+    """Champion/challenger routing with shadow scoring.
+
+    Each applicant is served by the model its ID routes to. Every other model
+    in the split scores the same row on a background thread, compared against
+    the served prediction for agreement and probability difference. The
+    request path only enqueues the row; when the queue is full the shadow
+    work is dropped (and counted) rather than slowing requests down.
+
+    score_fn(model_key, raw) returns (predictions, probabilities) for an
+    (N, 3) array of raw applicant rows.
+    """
+
+    def __init__(self, split, score_fn, max_queue=10_000, max_batch=1024, linger_ms=100.0):
+        self.split = split
+        self.score_fn = score_fn
+        self.max_batch = max_batch
+        self.linger = linger_ms / 1000.0
+        self.dropped = 0
+        self.stats = {model_key: ModelStats() for model_key in split.models}
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closing = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def route(self, applicant_id):
+        return self.split.route(applicant_id)
+
+    def record_served(self, model_key, seconds, count=1):
+        """Count count applicants served by model_key in one call of seconds."""
+        with self._stats_lock:
+            self.stats[model_key].served += count
+            self.stats[model_key].serve_latency.observe(seconds)
+        METRICS.observe(f'serve_{model_key}', seconds)
+        METRICS.inc('routed_predictions_total', count, model=model_key)
+
+    def shadow(self, row, served_key, prediction, probability):
+        """Queue the other models' scoring of a row already served by served_key."""
+        if len(self.split.models) < 2:
+            return
+        try:
+            self._queue.put_nowait((row, served_key, prediction, float(probability[1])))
+        except queue.Full:
+            self.dropped += 1
+            METRICS.inc('shadow_dropped_total')
+
+    def predict(self, applicant_id, row):
+        """Serve one applicant; returns (model_key, prediction, probability)."""
+        model_key = self.route(applicant_id)
+        start = time.perf_counter()
+        predictions, probabilities = self.score_fn(model_key, np.array([row], dtype=np.float64))
+        self.record_served(model_key, time.perf_counter() - start)
+        self.shadow(row, model_key, predictions[0], probabilities[0])
+        return model_key, predictions[0], probabilities[0]
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stopping = False
+            # Shadow work competes with requests for the GIL, so the thread
+            # sleeps while rows pile up and then scores them in one vectorized
+            # call per model, instead of waking up for every request.
+            if self._queue.qsize() < self.max_batch:
+                self._closing.wait(self.linger)
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Finish this batch, then stop.
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._score_shadows(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def _score_shadows(self, batch):
+        raw = np.array([row for row, _, _, _ in batch], dtype=np.float64)
+        served_keys = np.array([served_key for _, served_key, _, _ in batch])
+        served_predictions = np.array([prediction for _, _, prediction, _ in batch])
+        served_p_default = np.array([p_default for _, _, _, p_default in batch])
+        for model_key in self.split.models:
+            rows = served_keys != model_key
+            if not rows.any():
+                continue
+            start = time.perf_counter()
+            try:
+                predictions, probabilities = self.score_fn(model_key, raw[rows])
+            except Exception:
+                METRICS.inc('shadow_errors_total', model=model_key)
+                continue
+            seconds = time.perf_counter() - start
+            agreements = int(np.count_nonzero(predictions == served_predictions[rows]))
+            abs_diff = float(np.abs(probabilities[:, 1] - served_p_default[rows]).sum())
+            with self._stats_lock:
+                stats = self.stats[model_key]
+                stats.shadowed += int(rows.sum())
+                stats.agreements += agreements
+                stats.abs_diff_total += abs_diff
+                stats.shadow_latency.observe(seconds)
+            METRICS.inc('shadow_scored_total', int(rows.sum()), model=model_key)
+            METRICS.inc('shadow_agreements_total', agreements, model=model_key)
+
+    def flush(self):
+        """Block until every queued shadow row has been scored."""
+        self._queue.join()
+
+    def summary(self):
+        with self._stats_lock:
+            return {model_key: {'share': self.split.weights[model_key], **stats.summary()}
+                    for model_key, stats in self.stats.items()}
+
+    def close(self):
+        self._closing.set()
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,256 @@
+import os
+import threading
+from functools import partial
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.artifacts import load_bundle, save_bundle
+from src.calibration import Calibration
+from src.decision import DEFAULT_THRESHOLD, DecisionPolicy, decide
+from src.drift import DriftReference
+from src.features import engineer_features
+from src.forest import FlatForest, export_forest
+from src.linear import FusedLinearModel, fuse_linear_model
+from src.metrics import REGISTRY as METRICS
+from src.risk_grid import DEFAULT_PROBES, DEFAULT_SHAPE, RiskGrid, build_risk_grid
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'models')
+
+IMPROVED_MODEL_FILE = 'loan_default_model_improved.pkl'
+SCALER_FILE = 'scaler_improved.pkl'
+RF_MODEL_FILE = 'loan_default_rf_model.pkl'
+RF_FLAT_FILE = 'loan_default_rf_flat.npz'
+LR_FUSED_FILE = 'loan_default_lr_fused.npz'
+
+SCALER_ARRAYS_FILE = 'scaler_improved.npz'
+RISK_GRID_FILES = {'improved_lr': 'risk_grid_lr.npz', 'rf': 'risk_grid_rf.npz'}
+DRIFT_REFERENCE_FILE = 'drift_reference.npz'
+DECISION_POLICY_FILE = 'decision_policy.npz'
+CALIBRATION_FILE = 'calibration.npz'
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+MODEL_KEYS = ('improved_lr', 'rf')
+
+
+def scaler_arrays(scaler):
+    # Just what scale_features reads, so scoring never needs sklearn.
+    return SimpleNamespace(with_mean=bool(scaler.with_mean), mean_=np.asarray(scaler.mean_),
+                           with_std=bool(scaler.with_std), scale_=np.asarray(scaler.scale_))
+
+
+def save_scaler(scaler, path):
+    save_bundle(path, 'standard_scaler', {'with_mean': bool(scaler.with_mean), 'with_std': bool(scaler.with_std)},
+                {'mean': scaler.mean_, 'scale': scaler.scale_})
+
+
+def load_scaler(path, mmap=True):
+    header, data = load_bundle(path, 'standard_scaler', mmap=mmap)
+    return SimpleNamespace(with_mean=header['with_mean'], mean_=data['mean'],
+                           with_std=header['with_std'], scale_=data['scale'])
+
+
+def _unpickle(path):
+    # joblib (and sklearn behind the pickles) is only imported when a pickle
+    # is actually read, which keeps .npz cold starts short.
+    import joblib
+    return joblib.load(path)
+
+
+class ModelStore:
+    """Loads each model, and the scaler, the first time it is asked for.
+
+    With compiled=True the array artifacts (.npz) are preferred over the
+    pickles, so a cold start never has to import sklearn; the pickled random
+    forest is only unpickled if a batch is large enough to need it.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, compiled=False):
+        self.models_dir = models_dir
+        self.compiled = compiled
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+        has_scaler = self._exists(SCALER_FILE) or (compiled and self._exists(SCALER_ARRAYS_FILE))
+        self.available = {
+            'improved_lr': self._exists(IMPROVED_MODEL_FILE) and self._exists(SCALER_FILE)
+                           or compiled and self._exists(LR_FUSED_FILE),
+            'rf': has_scaler and (self._exists(RF_MODEL_FILE) or compiled and self._exists(RF_FLAT_FILE))
+        }
+
+    def _path(self, name):
+        return os.path.join(self.models_dir, name)
+
+    def _exists(self, name):
+        return os.path.exists(self._path(name))
+
+    def _load_once(self, key, loader):
+        if key not in self._loaded:
+            with self._lock:
+                if key not in self._loaded:
+                    self._loaded[key] = loader()
+        return self._loaded[key]
+
+    @property
+    def scaler(self):
+        return self._load_once('scaler', self._load_scaler)
+
+    def get(self, model_key):
+        if model_key not in MODEL_KEYS:
+            raise KeyError(model_key)
+        if not self.available[model_key]:
+            return None
+        loader = self._load_linear if model_key == 'improved_lr' else self._load_forest
+        return self._load_once(model_key, loader)
+
+    def risk_grid(self, model_key):
+        # Optional: only present if the grids were built (train_model.py --risk-grid).
+        if model_key not in MODEL_KEYS:
+            raise KeyError(model_key)
+        if not self._exists(RISK_GRID_FILES[model_key]):
+            return None
+        threshold = self.decision_threshold(model_key)
+        return self._load_once(f'risk_grid_{model_key}', lambda: RiskGrid.load(
+            self._path(RISK_GRID_FILES[model_key]), threshold=DEFAULT_THRESHOLD if threshold is None else threshold))
+
+    def calibration(self):
+        # Optional: written by train_model.py (or scripts/calibrate_models.py).
+        if not self._exists(CALIBRATION_FILE):
+            return None
+        return self._load_once('calibration', lambda: Calibration.load(self._path(CALIBRATION_FILE)))
+
+    def calibrator(self, model_key):
+        """The model's probability calibrator, or None to use its
+        probabilities as they are."""
+        calibration = self.calibration()
+        return None if calibration is None else calibration.get(model_key)
+
+    def decision_policy(self):
+        # Optional: written by train_model.py (or scripts/optimize_threshold.py).
+        if not self._exists(DECISION_POLICY_FILE):
+            return None
+        return self._load_once('decision_policy', lambda: DecisionPolicy.load(self._path(DECISION_POLICY_FILE)))
+
+    def decision_threshold(self, model_key):
+        """The model's cost-optimal cutoff, or None (the model's own 0.5)
+        without a decision policy."""
+        policy = self.decision_policy()
+        return None if policy is None else policy.threshold(model_key)
+
+    def drift_reference(self):
+        # Optional: written by train_model.py (or scripts/build_drift_reference.py).
+        if not self._exists(DRIFT_REFERENCE_FILE):
+            return None
+        return self._load_once('drift_reference', lambda: DriftReference.load(self._path(DRIFT_REFERENCE_FILE)))
+
+    def _load_scaler(self):
+        if self.compiled and self._exists(SCALER_ARRAYS_FILE):
+            return load_scaler(self._path(SCALER_ARRAYS_FILE))
+        if self._exists(SCALER_FILE):
+            return _unpickle(self._path(SCALER_FILE))
+        return None
+
+    def _load_linear(self):
+        if self.compiled and self._exists(LR_FUSED_FILE):
+            return FusedLinearModel.load(self._path(LR_FUSED_FILE))
+        model = _unpickle(self._path(IMPROVED_MODEL_FILE))
+        if self.compiled:
+            model = fuse_linear_model(model, _unpickle(self._path(SCALER_FILE)))
+        return model
+
+    def _load_forest(self):
+        rf_model_path = self._path(RF_MODEL_FILE)
+        if self.compiled and self._exists(RF_FLAT_FILE):
+            flat_forest = FlatForest.load(self._path(RF_FLAT_FILE))
+            if os.path.exists(rf_model_path):
+                flat_forest.fallback = partial(_unpickle, rf_model_path)
+            return flat_forest
+        rf_model = _unpickle(rf_model_path)
+        if self.compiled:
+            rf_model = export_forest(rf_model, keep_fallback=True)
+        return rf_model
+
+
+def load_models(models_dir=MODELS_DIR, compiled=False):
+    store = ModelStore(models_dir, compiled=compiled)
+    if not any(store.available.values()):
+        return None, None, None, store.available
+    return store.get('improved_lr'), store.scaler, store.get('rf'), store.available
+
+
+def scale_features(scaler, features):
+    # Same arithmetic as StandardScaler.transform, done in place so the
+    # engineered matrix is not copied again per chunk.
+    if scaler.with_mean:
+        features -= scaler.mean_
+    if scaler.with_std:
+        features /= scaler.scale_
+    return features
+
+
+def model_scaler(model, scaler):
+    # Fused linear models already carry the scaler in their coefficients.
+    return None if isinstance(model, FusedLinearModel) else scaler
+
+
+def score_batch(model, scaler, data, chunk_size=DEFAULT_CHUNK_SIZE, dtype=np.float64, threshold=None,
+                calibrator=None):
+    # dtype=np.float32 is the compact path: half the feature memory, with
+    # probabilities still returned as float64. A calibrator (e.g.
+    # ModelStore.calibrator) maps the model's P(default) to a calibrated one
+    # before anything is decided. With a threshold (e.g.
+    # ModelStore.decision_threshold) rows at or above it are predicted to
+    # default; without one the most probable class is.
+    with METRICS.timer('features'):
+        features = engineer_features(data, dtype=dtype)
+    n_rows = features.shape[0]
+    probabilities = np.empty((n_rows, len(model.classes_)), dtype=np.float64)
+
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        x_chunk = features[start:stop]
+        if scaler is not None:
+            with METRICS.timer('scale'):
+                x_chunk = scale_features(scaler, x_chunk)
+        with METRICS.timer('predict_proba'):
+            probabilities[start:stop] = model.predict_proba(x_chunk)
+
+    if calibrator is not None:
+        with METRICS.timer('calibrate'):
+            probabilities[:, 1] = calibrator(probabilities[:, 1])
+            probabilities[:, 0] = 1.0 - probabilities[:, 1]
+
+    with METRICS.timer('predict'):
+        if threshold is None:
+            predictions = model.classes_.take(np.argmax(probabilities, axis=1))
+        else:
+            predictions = model.classes_.take(decide(probabilities[:, 1], threshold))
+    METRICS.inc('scored_rows_total', n_rows)
+    return predictions, probabilities
+
+
+def save_risk_grids(models, scaler, models_dir, balance_range, salary_range, shape=DEFAULT_SHAPE,
+                    probes=DEFAULT_PROBES, calibrators=None):
+    """Build a risk grid for each {model_key: model} and save it next to the
+    models; returns the grids. calibrators ({model_key: Calibrator}) makes
+    the grids hold calibrated probabilities."""
+    calibrators = calibrators or {}
+    grids = {}
+    for model_key, model in models.items():
+        grid_scaler = model_scaler(model, scaler)
+        calibrator = calibrators.get(model_key)
+        def p_default(rows):
+            return score_batch(model, grid_scaler, rows, calibrator=calibrator)[1][:, 1]
+        grid = build_risk_grid(p_default,
+                               balance_range, salary_range, shape=shape, probes=probes)
+        grid.save(os.path.join(models_dir, RISK_GRID_FILES[model_key]))
+        grids[model_key] = grid
+    return grids
+
+
+def score_applicant(model, scaler, employed, bank_balance, annual_salary, threshold=None, calibrator=None):
+    predictions, probabilities = score_batch(model, scaler, [[employed, bank_balance, annual_salary]],
+                                             threshold=threshold, calibrator=calibrator)
+    return predictions[0], probabilities[0]
@@ -0,0 +1,386 @@
+import json
+import math
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.drift import DriftMonitor
+from src.registry import LiveModelStore
+from src.router import ShadowRouter, TrafficSplit
+from src.scoring import MODELS_DIR, ModelStore, load_models, model_scaler, score_batch
+from src.validation import ENGINE, check_applicant
+
+MODEL_NAMES = {'rf': 'Random Forest', 'lr': 'Improved Logistic Regression'}
+STORE_KEYS = {'rf': 'rf', 'lr': 'improved_lr'}
+
+
+class MicroBatcher:
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=2.0, on_scored=None):
+        self.score_fn = score_fn
+        # Called with (raw, probabilities) after a batch's futures are
+        # resolved, so it never holds up the requests in that batch.
+        self.on_scored = on_scored
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                raw = np.array([row for row, _ in batch], dtype=np.float64)
+                predictions, probabilities = self.score_fn(raw)
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for i, (_, future) in enumerate(batch):
+                future.set_result((predictions[i], probabilities[i]))
+            if self.on_scored is not None:
+                self.on_scored(raw, probabilities)
+
+
+class RequestError(ValueError):
+    pass
+
+
+def parse_fields(payload):
+    """(employed, bank_balance, annual_salary, loan_amount) as numbers, or
+    None and the errors for a payload that is not shaped like an applicant."""
+    if not isinstance(payload, dict):
+        return None, ["❌ Each applicant must be a JSON object"]
+    try:
+        employed = payload['employed']
+        bank_balance = float(payload['bank_balance'])
+        annual_salary = float(payload['annual_salary'])
+        loan_amount = float(payload.get('loan_amount', 0.0))
+    except KeyError as exc:
+        return None, [f"❌ Missing field: {exc.args[0]}"]
+    except (TypeError, ValueError) as exc:
+        return None, [f"❌ Invalid value: {exc}"]
+    if isinstance(employed, bool) or not isinstance(employed, (int, float)):
+        return None, ["❌ Employed must be 0 or 1"]
+    return (employed, bank_balance, annual_salary, loan_amount), []
+
+
+def parse_applicant(payload):
+    """The (employed, bank_balance, annual_salary) row to score, the errors
+    that block it, and the warnings to return with its result."""
+    fields, errors = parse_fields(payload)
+    if errors:
+        return None, errors, []
+    employed, bank_balance, annual_salary, loan_amount = fields
+    if employed not in (0, 1):
+        return None, ["❌ Employed must be 0 or 1"], []
+    # json.loads accepts NaN and Infinity, and every validation rule compares
+    # False against NaN, so non-finite values would otherwise reach the model.
+    if not all(math.isfinite(value) for value in (bank_balance, annual_salary, loan_amount)):
+        return None, ["❌ Bank Balance, Annual Salary and Loan Amount must be finite numbers"], []
+
+    validation_errors, validation_warnings = check_applicant(bank_balance, annual_salary, loan_amount)
+    if validation_errors:
+        return None, validation_errors, validation_warnings
+    return (int(employed), bank_balance, annual_salary), [], validation_warnings
+
+
+def format_result(model_key, prediction, probability, warnings=()):
+    result = {
+        'model': MODEL_NAMES[model_key],
+        'prediction': int(prediction),
+        'label': 'No Default' if prediction == 0 else 'Default',
+        'default_probability': float(probability[1]),
+        'repayment_probability': float(probability[0])
+    }
+    if warnings:
+        result['warnings'] = list(warnings)
+    return result
+
+
+def routing_id(payload, row):
+    # Sticky on applicant_id; without one, the same inputs route the same way.
+    applicant_id = payload.get('applicant_id')
+    return applicant_id if applicant_id is not None else ','.join(f'{float(value):g}' for value in row)
+
+
+class ScoringService:
+    def __init__(self, models_dir=None, max_batch_size=64, max_wait_ms=2.0, registry_dir=None, routing=None,
+                 drift_interval=None, on_drift_alert=None):
+        # With registry_dir the service follows the registry's manifest
+        # instead, and each micro-batch is scored by whichever version is live.
+        self.live = LiveModelStore(registry_dir) if registry_dir else None
+        self.models_dir = models_dir or MODELS_DIR
+        if self.live is not None:
+            store = self.live.current().store
+            improved_model, scaler, rf_model = store.get('improved_lr'), store.scaler, store.get('rf')
+        else:
+            improved_model, scaler, rf_model, _ = load_models(models_dir, compiled=True) if models_dir \
+                else load_models(compiled=True)
+            # For the optional artifacts next to the models: decision policy
+            # and drift reference.
+            self._artifacts = ModelStore(self.models_dir)
+        self.models = {key: model for key, model in (('rf', rf_model), ('lr', improved_model)) if model is not None}
+        if not self.models:
+            raise FileNotFoundError("No trained models found. Run 'python scripts/train_model.py' first.")
+        self.scaler = scaler
+        # With drift_interval (seconds), every served row and its default
+        # probability feed a DriftMonitor, checked against the models' drift
+        # reference on that schedule. Shadow scores are not counted.
+        self.drift = None
+        self.drift_interval = drift_interval
+        if drift_interval:
+            reference, self._drift_version = self._drift_reference()
+            if reference is None:
+                if self.live is not None:
+                    self.live.close()
+                raise FileNotFoundError(
+                    "No drift reference found. Run 'python scripts/build_drift_reference.py' first.")
+            self.drift = DriftMonitor(reference, on_alert=on_drift_alert)
+            self.drift.start(drift_interval)
+        self.batchers = {
+            key: MicroBatcher(self._score_fn(key), max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                              on_scored=self._drift_observer(key))
+            for key in self.models
+        }
+        # With routing ({model_key: percent}), requests that do not name a
+        # model are routed by applicant_id and the other models shadow-score.
+        self.router = None
+        if routing:
+            unknown = set(routing) - set(self.models)
+            if unknown:
+                self.close()
+                raise ValueError(f"Cannot route to unavailable models: {sorted(unknown)}")
+            self.router = ShadowRouter(TrafficSplit(routing), lambda key, raw: self._score_fn(key)(raw))
+
+    def _score_fn(self, model_key):
+        if self.live is not None:
+            def score_live(raw):
+                store = self.live.current().store
+                model = store.get(STORE_KEYS[model_key])
+                return score_batch(model, model_scaler(model, store.scaler), raw,
+                                   threshold=store.decision_threshold(STORE_KEYS[model_key]),
+                                   calibrator=store.calibrator(STORE_KEYS[model_key]))
+            return score_live
+        model = self.models[model_key]
+        scaler = model_scaler(model, self.scaler)
+        threshold = self._artifacts.decision_threshold(STORE_KEYS[model_key])
+        calibrator = self._artifacts.calibrator(STORE_KEYS[model_key])
+        return lambda raw: score_batch(model, scaler, raw, threshold=threshold, calibrator=calibrator)
+
+    def _drift_reference(self):
+        if self.live is not None:
+            current = self.live.current()
+            return current.store.drift_reference(), current.version
+        return self._artifacts.drift_reference(), None
+
+    def _drift_observer(self, model_key):
+        if self.drift is None:
+            return None
+
+        def observe(raw, probabilities):
+            if self.live is not None and self.live.current().version != self._drift_version:
+                # A new model version brings its own reference; a version
+                # without one keeps the old reference.
+                reference, self._drift_version = self._drift_reference()
+                if reference is not None:
+                    self.drift.set_reference(reference)
+            self.drift.observe(raw, probabilities[:, 1], STORE_KEYS[model_key])
+        return observe
+
+    def resolve_model(self, model_key):
+        if model_key is None:
+            return next(iter(self.models))
+        if not isinstance(model_key, str) or model_key not in self.models:
+            raise RequestError(f"❌ Unknown model: {model_key!r}")
+        return model_key
+
+    def _routed(self, payload):
+        return self.router is not None and payload.get('model') is None
+
+    def predict(self, payload):
+        routed = self._routed(payload)
+        model_key = None if routed else self.resolve_model(payload.get('model'))
+        row, validation_errors, validation_warnings = parse_applicant(payload)
+        if validation_errors:
+            return 422, {'errors': validation_errors}
+        if routed:
+            model_key = self.router.route(routing_id(payload, row))
+        start = time.perf_counter()
+        prediction, probability = self.batchers[model_key].submit(row).result()
+        if routed:
+            self.router.record_served(model_key, time.perf_counter() - start)
+            self.router.shadow(row, model_key, prediction, probability)
+        return 200, format_result(model_key, prediction, probability, validation_warnings)
+
+    def predict_batch(self, payload):
+        routed = self._routed(payload)
+        model_key = None if routed else self.resolve_model(payload.get('model'))
+        applicants = payload.get('applicants')
+        if not isinstance(applicants, list):
+            return 400, {'errors': ["❌ 'applicants' must be a list"]}
+
+        results = [None] * len(applicants)
+        parsed_rows = []
+        parsed_positions = []
+        for i, applicant in enumerate(applicants):
+            fields, parse_errors = parse_fields(applicant)
+            if parse_errors:
+                results[i] = {'errors': parse_errors}
+            else:
+                parsed_rows.append(fields)
+                parsed_positions.append(i)
+        if not parsed_rows:
+            return 200, {'results': results}
+
+        # Every rule runs once over the whole batch; only rows with errors
+        # are left out of scoring.
+        columns = np.array(parsed_rows, dtype=np.float64)
+        validation = ENGINE.evaluate(*columns.T)
+        valid = np.flatnonzero(~validation.rejected)
+        for row in np.flatnonzero(validation.rejected):
+            results[parsed_positions[row]] = {'errors': validation.row_messages(row)[0]}
+        if not len(valid):
+            return 200, {'results': results}
+        if routed:
+            row_keys = np.array([self.router.route(routing_id(applicants[parsed_positions[row]], columns[row, :3]))
+                                 for row in valid])
+        else:
+            row_keys = np.full(len(valid), model_key)
+        for key in np.unique(row_keys):
+            rows = valid[row_keys == key]
+            start = time.perf_counter()
+            predictions, probabilities = self._score_fn(key)(columns[rows, :3])
+            if routed:
+                self.router.record_served(key, time.perf_counter() - start, count=len(rows))
+            if self.drift is not None:
+                self._drift_observer(key)(columns[rows, :3], probabilities)
+            for row, prediction, probability in zip(rows, predictions, probabilities):
+                warnings = validation.row_messages(row)[1] if validation.warnings[row] else ()
+                results[parsed_positions[row]] = format_result(key, prediction, probability, warnings)
+                if routed:
+                    self.router.shadow(tuple(columns[row, :3]), key, prediction, probability)
+        return 200, {'results': results}
+
+    def health(self):
+        body = {'status': 'ok', 'models': sorted(self.models)}
+        if self.live is not None:
+            body['version'] = self.live.current().version
+        if self.router is not None:
+            body['routing'] = self.router.summary()
+        return body
+
+    def drift_report(self):
+        """The last scheduled drift check; None until the first one runs."""
+        if self.drift is None:
+            return None
+        return {'interval': self.drift_interval, 'report': self.drift.last_report}
+
+    def close(self):
+        for batcher in self.batchers.values():
+            batcher.close()
+        if self.router is not None:
+            self.router.close()
+        if self.drift is not None:
+            self.drift.close()
+        if self.live is not None:
+            self.live.close()
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; with Nagle enabled every
+    # keep-alive response would wait on the client's delayed ACK.
+    disable_nagle_algorithm = True
+    service = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.service.health())
+        elif self.path == '/drift':
+            report = self.service.drift_report()
+            if report is None:
+                self._send_json(404, {'errors': ["Drift monitoring is off; start the service with --drift-interval"]})
+            else:
+                self._send_json(200, report)
+        else:
+            self._send_json(404, {'errors': [f"Unknown path {self.path}"]})
+
+    def do_POST(self):
+        routes = {'/predict': self.service.predict, '/predict/batch': self.service.predict_batch}
+        if self.path not in routes:
+            self._send_json(404, {'errors': [f"Unknown path {self.path}"]})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                raise ValueError("negative Content-Length")
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as exc:
+            # Whatever is left of the body cannot be framed, so do not reuse the connection.
+            self.close_connection = True
+            self._send_json(400, {'errors': [f"❌ Invalid JSON body: {exc}"]})
+            return
+        try:
+            status, body = routes[self.path](payload)
+        except RequestError as exc:
+            status, body = 400, {'errors': [str(exc)]}
+        except Exception as exc:
+            status, body = 500, {'errors': [f"❌ Scoring failed: {exc}"]}
+        self._send_json(status, body)
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(service, host='127.0.0.1', port=8000):
+    handler = type('BoundScoringRequestHandler', (ScoringRequestHandler,), {'service': service})
+    return ScoringHTTPServer((host, port), handler)
@@ -0,0 +1,123 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+
+TARGET_COLUMN = 'Defaulted?'
+FEATURE_CACHE_VERSION = 1
+
+# Same split as train_model.py, so results stay comparable.
+TEST_SIZE = 0.33
+RANDOM_STATE = 42
+
+RF_GRID = {'n_estimators': [50, 100, 200], 'max_depth': [6, 10, 14]}
+LR_GRID = {'C': [0.01, 0.1, 1.0, 10.0, 100.0]}
+
+
+@contextmanager
+def stage(name, timings):
+    start = time.perf_counter()
+    print(f"[{name}] started")
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+        print(f"[{name}] {timings[name]:.2f}s")
+
+
+def write_json(path, payload):
+    # Write then rename, so an interrupted run never leaves half a checkpoint.
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def data_fingerprint(data_path):
+    stat = os.stat(data_path)
+    key = f'{os.path.abspath(data_path)}:{stat.st_size}:{stat.st_mtime_ns}:{FEATURE_CACHE_VERSION}'
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def split_indices(n_rows):
+    return train_test_split(np.arange(n_rows), test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+
+def build_trials(rf_grid=RF_GRID, lr_grid=LR_GRID):
+    trials = []
+    for model_name, grid in (('rf', rf_grid), ('lr', lr_grid)):
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid.keys(), values))
+            suffix = '-'.join(f'{key}={value}' for key, value in params.items())
+            trials.append({'trial_id': f'{model_name}-{suffix}', 'model': model_name, 'params': params})
+    return trials
+
+
+def make_model(model_name, params, n_jobs=1):
+    if model_name == 'rf':
+        return RandomForestClassifier(class_weight='balanced', random_state=RANDOM_STATE, n_jobs=n_jobs, **params)
+    if model_name == 'lr':
+        return LogisticRegression(class_weight='balanced', max_iter=1000, **params)
+    raise ValueError(f"Unknown model '{model_name}'")
+
+
+def run_trial(trial, x_fit, y_fit, x_val, y_val, checkpoint_path):
+    start = time.perf_counter()
+    model = make_model(trial['model'], trial['params'])
+    model.fit(x_fit, y_fit)
+    result = dict(trial, roc_auc=float(roc_auc_score(y_val, model.predict_proba(x_val)[:, 1])),
+                  fit_seconds=time.perf_counter() - start)
+    write_json(checkpoint_path, result)
+    return result
+
+
+def search(trials, x_fit, y_fit, x_val, y_val, trials_dir, n_jobs=-1):
+    """Fit every trial not already checkpointed in trials_dir, in parallel.
+
+    Each worker writes its own checkpoint as soon as its trial finishes, so
+    rerunning after an interruption only fits the trials that were missing.
+    Returns every trial result, finished earlier or now.
+    """
+    os.makedirs(trials_dir, exist_ok=True)
+    results, pending = [], []
+    for trial in trials:
+        checkpoint_path = os.path.join(trials_dir, f"{trial['trial_id']}.json")
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                results.append(json.load(f))
+        else:
+            pending.append((trial, checkpoint_path))
+
+    print(f"   {len(results)} trials restored from checkpoints, {len(pending)} to run")
+    # Largest forests first, so the slowest trials do not start last.
+    pending.sort(key=lambda item: -item[0]['params'].get('n_estimators', 0) * item[0]['params'].get('max_depth', 1))
+    results += Parallel(n_jobs=n_jobs)(
+        delayed(run_trial)(trial, x_fit, y_fit, x_val, y_val, checkpoint_path)
+        for trial, checkpoint_path in pending
+    )
+    return results
+
+
+def best_trials(results):
+    best = {}
+    for result in results:
+        if result['model'] not in best or result['roc_auc'] > best[result['model']]['roc_auc']:
+            best[result['model']] = result
+    return best
+
+
+def subsample(indices, labels, max_rows, random_state=RANDOM_STATE):
+    if max_rows is None or len(indices) <= max_rows:
+        return indices
+    sample, _ = train_test_split(indices, train_size=max_rows, stratify=labels[indices], random_state=random_state)
+    return sample
@@ -0,0 +1,131 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# check(employed, bank_balance, annual_salary, loan_amount) is written with
+# comparisons and & only, so it evaluates the same way on one applicant's
+# floats and on whole numpy columns. Comparisons with NaN are False, so a
+# missing value only ever trips the 'not_finite' rule.
+Rule = namedtuple('Rule', ['code', 'severity', 'message', 'check'])
+
+# Checks the form's widgets and the HTTP service's parser make implicitly;
+# files need them explicitly.
+INPUT_RULES = (
+    Rule('employed_not_binary', ERROR, "❌ Employed must be 0 or 1",
+         lambda employed, bank_balance, annual_salary, loan_amount: (employed != 0) & (employed != 1)),
+    Rule('not_finite', ERROR, "❌ Bank Balance, Annual Salary and Loan Amount must be finite numbers",
+         lambda employed, bank_balance, annual_salary, loan_amount: ~(np.isfinite(bank_balance)
+                                                                      & np.isfinite(annual_salary)
+                                                                      & np.isfinite(loan_amount))),
+)
+
+APPLICANT_RULES = (
+    Rule('salary_not_positive', ERROR, "❌ Annual Salary must be greater than zero",
+         lambda employed, bank_balance, annual_salary, loan_amount: annual_salary <= 0),
+    Rule('balance_negative', ERROR, "❌ Bank Balance cannot be negative",
+         lambda employed, bank_balance, annual_salary, loan_amount: bank_balance < 0),
+    Rule('income_and_balance_zero', ERROR, "❌ Cannot process: Both income and balance are zero",
+         lambda employed, bank_balance, annual_salary, loan_amount: (annual_salary == 0) & (bank_balance == 0)),
+    Rule('low_income_low_savings', WARNING, "⚠️ Warning: Very low income with minimal savings - High risk",
+         lambda employed, bank_balance, annual_salary, loan_amount: (annual_salary < 50000) & (bank_balance < 1000)),
+    Rule('loan_over_5x_salary', WARNING,
+         "⚠️ Warning: Loan amount is more than 5x annual salary - Extremely high risk",
+         lambda employed, bank_balance, annual_salary, loan_amount: (loan_amount > 0) & (annual_salary > 0)
+         & (loan_amount > 5 * annual_salary)),
+)
+
+RULES = INPUT_RULES + APPLICANT_RULES
+
+
+def check_applicant(bank_balance, annual_salary, loan_amount=0.0):
+    """(errors, warnings) messages for one applicant. Errors block scoring;
+    warnings are shown alongside the prediction."""
+    errors, warnings = [], []
+    for rule in APPLICANT_RULES:
+        if rule.check(None, bank_balance, annual_salary, loan_amount):
+            (errors if rule.severity == ERROR else warnings).append(rule.message)
+    return errors, warnings
+
+
+def validate_applicant(bank_balance, annual_salary, loan_amount=0.0):
+    return [rule.message for rule in APPLICANT_RULES if rule.check(None, bank_balance, annual_salary, loan_amount)]
+
+
+class ValidationResult:
+    """Per-row bitmasks from RuleEngine.evaluate: bit i of errors is set when
+    engine.errors[i] applies to the row, and likewise for warnings."""
+
+    def __init__(self, engine, errors, warnings):
+        self.engine = engine
+        self.errors = errors
+        self.warnings = warnings
+
+    def __len__(self):
+        return len(self.errors)
+
+    @property
+    def rejected(self):
+        return self.errors != 0
+
+    def row_messages(self, row):
+        return (
+            [rule.message for bit, rule in enumerate(self.engine.errors) if self.errors[row] >> bit & 1],
+            [rule.message for bit, rule in enumerate(self.engine.warnings) if self.warnings[row] >> bit & 1],
+        )
+
+    def messages(self):
+        """Every message per row, joined, as a Categorical: the strings are
+        built once per distinct combination, not once per row."""
+        combined = (self.warnings.astype(np.uint64) << np.uint64(len(self.engine.errors))) | self.errors
+        codes, combos = pd.factorize(combined, sort=True)
+        rules = self.engine.errors + self.engine.warnings
+        labels = ['; '.join(rule.message for bit, rule in enumerate(rules) if int(combo) >> bit & 1)
+                  for combo in combos]
+        return pd.Categorical.from_codes(codes, categories=labels)
+
+    def counts(self):
+        """Rows each rule applies to, by rule code."""
+        counts = {}
+        for masks, rules in ((self.errors, self.engine.errors), (self.warnings, self.engine.warnings)):
+            for bit, rule in enumerate(rules):
+                counts[rule.code] = int(np.count_nonzero(masks >> bit & 1))
+        return counts
+
+
+class RuleEngine:
+    """Evaluates every rule as a boolean mask over whole columns and packs the
+    results into one error and one warning bitmask per row."""
+
+    def __init__(self, rules=RULES):
+        if len({rule.code for rule in rules}) != len(rules):
+            raise ValueError("Rule codes must be unique")
+        self.rules = tuple(rules)
+        self.errors = tuple(rule for rule in rules if rule.severity == ERROR)
+        self.warnings = tuple(rule for rule in rules if rule.severity == WARNING)
+        if len(self.errors) + len(self.warnings) != len(self.rules):
+            raise ValueError(f"Rule severity must be '{ERROR}' or '{WARNING}'")
+        self.dtype = np.min_scalar_type((1 << max(len(self.errors), len(self.warnings), 1)) - 1)
+
+    def evaluate(self, employed, bank_balance, annual_salary, loan_amount=0.0):
+        columns = np.broadcast_arrays(
+            *(np.asarray(values, dtype=np.float64) for values in (employed, bank_balance, annual_salary, loan_amount))
+        )
+        masks = []
+        with np.errstate(invalid='ignore', over='ignore'):
+            for rules in (self.errors, self.warnings):
+                packed = np.zeros(columns[0].shape, dtype=self.dtype)
+                for bit, rule in enumerate(rules):
+                    packed |= rule.check(*columns).astype(self.dtype) << self.dtype.type(bit)
+                masks.append(packed)
+        return ValidationResult(self, *masks)
+
+
+ENGINE = RuleEngine()
+
+
+def validate_applicants(employed, bank_balance, annual_salary, loan_amount=0.0):
+    return ENGINE.evaluate(employed, bank_balance, annual_salary, loan_amount)
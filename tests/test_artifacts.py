@@ -0,0 +1,104 @@
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.artifacts import ALIGNMENT, load_bundle, save_bundle
+from src.forest import FlatForest
+from src.linear import FusedLinearModel
+from src.scoring import (LR_FUSED_FILE, RF_FLAT_FILE, SCALER_ARRAYS_FILE, ModelStore, load_models,
+                         load_scaler, score_batch)
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, rf_model, _ = load_models(models_dir)
+applicants = pd.read_csv(data_path)
+
+
+def test_bundle_round_trip_is_memory_mapped_and_aligned(tmp_path):
+    arrays = {
+        'float': np.linspace(0.0, 1.0, 11),
+        'int': np.arange(7, dtype=np.int32),
+        'matrix': np.arange(6.0).reshape(3, 2),
+        'empty': np.array([], dtype=np.float32),
+    }
+    path = str(tmp_path / 'bundle.npz')
+    save_bundle(path, 'test', {'answer': 42}, arrays)
+
+    header, loaded = load_bundle(path, 'test')
+    assert header['answer'] == 42
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+        assert loaded[name].dtype == array.dtype
+    assert isinstance(loaded['float'].base, np.memmap)
+    assert not loaded['float'].flags.writeable
+    assert all(loaded[name].ctypes.data % ALIGNMENT == 0 for name in ('float', 'int', 'matrix'))
+
+    # Still an ordinary, uncompressed .npz.
+    with np.load(path) as data:
+        np.testing.assert_array_equal(data['matrix'], arrays['matrix'])
+    with zipfile.ZipFile(path) as bundle:
+        assert all(info.compress_type == zipfile.ZIP_STORED for info in bundle.infolist())
+
+
+def test_bundle_rejects_wrong_kind(tmp_path):
+    path = str(tmp_path / 'bundle.npz')
+    save_bundle(path, 'fused_linear', {}, {'coef': np.zeros(3)})
+    with pytest.raises(ValueError, match='fused_linear'):
+        FlatForest.load(path)
+
+
+def test_shipped_artifacts_match_pickles():
+    forest = FlatForest.load(os.path.join(models_dir, RF_FLAT_FILE))
+    fused = FusedLinearModel.load(os.path.join(models_dir, LR_FUSED_FILE))
+    scaler_arrays = load_scaler(os.path.join(models_dir, SCALER_ARRAYS_FILE))
+
+    _, expected_rf = score_batch(rf_model, scaler, applicants)
+    _, proba_rf = score_batch(forest, scaler_arrays, applicants)
+    np.testing.assert_allclose(proba_rf, expected_rf, rtol=0, atol=1e-9)
+
+    _, expected_lr = score_batch(improved_model, scaler, applicants)
+    _, proba_lr = score_batch(fused, None, applicants)
+    np.testing.assert_allclose(proba_lr, expected_lr, rtol=1e-9, atol=1e-12)
+
+
+def test_model_store_loads_only_what_is_used():
+    store = ModelStore(models_dir, compiled=True)
+    assert store.available == {'improved_lr': True, 'rf': True}
+
+    lr = store.get('improved_lr')
+    assert isinstance(lr, FusedLinearModel)
+    assert store.get('improved_lr') is lr
+    assert set(store._loaded) == {'improved_lr'}
+
+    forest = store.get('rf')
+    assert isinstance(forest, FlatForest)
+    # The sklearn forest is only unpickled for batches that need it.
+    assert callable(forest.fallback) and not hasattr(forest.fallback, 'predict_proba')
+    _, proba = score_batch(forest, store.scaler, applicants)
+    assert hasattr(forest.fallback, 'predict_proba')
+    _, expected = score_batch(rf_model, scaler, applicants)
+    np.testing.assert_allclose(proba, expected, rtol=0, atol=1e-9)
+
+
+def test_model_store_without_pickles(tmp_path):
+    for name in (RF_FLAT_FILE, LR_FUSED_FILE, SCALER_ARRAYS_FILE):
+        with open(os.path.join(models_dir, name), 'rb') as src, open(tmp_path / name, 'wb') as dst:
+            dst.write(src.read())
+
+    assert ModelStore(str(tmp_path)).available == {'improved_lr': False, 'rf': False}
+    store = ModelStore(str(tmp_path), compiled=True)
+    assert store.available == {'improved_lr': True, 'rf': True}
+    forest = store.get('rf')
+    assert forest.fallback is None
+    _, proba = score_batch(forest, store.scaler, applicants.head(100))
+    _, expected = score_batch(rf_model, scaler, applicants.head(100))
+    np.testing.assert_allclose(proba, expected, rtol=0, atol=1e-9)
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.async_scoring import AsyncScorer
+from src.features import RAW_COLUMNS
+from src.scoring import load_models, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, rf_model, _ = load_models(models_dir)
+rows = pd.read_csv(data_path, usecols=RAW_COLUMNS).to_numpy()[:2000]
+
+
+def collect(scorer, applicants):
+    async def run():
+        return [result async for result in scorer.score_many(applicants)]
+    return asyncio.run(run())
+
+
+def test_score_many_preserves_input_order():
+    scorer = AsyncScorer(rf_model, scaler, max_concurrency=3, queue_size=64, batch_size=50)
+    results = collect(scorer, rows.tolist())
+    scorer.close()
+
+    expected_predictions, expected_probabilities = score_batch(rf_model, scaler, rows)
+    np.testing.assert_array_equal([prediction for prediction, _ in results], expected_predictions)
+    np.testing.assert_allclose([probability for _, probability in results], expected_probabilities)
+
+
+def test_score_many_applies_backpressure():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=2, queue_size=32, batch_size=16)
+    state = {'produced': 0, 'consumed': 0, 'max_lag': 0}
+
+    async def producer():
+        for row in rows:
+            state['produced'] += 1
+            state['max_lag'] = max(state['max_lag'], state['produced'] - state['consumed'])
+            yield row
+
+    async def run():
+        async for _ in scorer.score_many(producer()):
+            state['consumed'] += 1
+
+    asyncio.run(run())
+    scorer.close()
+    assert state['consumed'] == len(rows)
+    assert state['max_lag'] <= 32 + (2 + 1) * 16 + 2
+
+
+def test_score_and_early_exit_release_capacity():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=2, queue_size=16, batch_size=8)
+
+    async def run():
+        single = await asyncio.gather(*(scorer.score({'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000})
+                                        for _ in range(5)))
+        stream = scorer.score_many(rows.tolist())
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+        return single
+
+    single = asyncio.run(run())
+    scorer.close()
+    _, expected = score_batch(improved_model, scaler, [[1, 8000, 600000]])
+    np.testing.assert_allclose(single[0][1], expected[0])
+    assert scorer._semaphore._value == 2
+
+
+def test_failed_batch_releases_capacity():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=2, queue_size=16, batch_size=4)
+    applicants = rows[:20].tolist()
+    applicants[9] = [1, 'not a number', 300000]
+
+    async def run():
+        with pytest.raises(ValueError):
+            async for _ in scorer.score_many(applicants):
+                pass
+        await asyncio.sleep(0.1)
+        return scorer._semaphore._value
+
+    assert asyncio.run(run()) == 2
+    scorer.close()
+
+
+def test_producer_error_propagates():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=2, queue_size=4, batch_size=4)
+
+    def applicants():
+        yield from rows[:10].tolist()
+        raise RuntimeError("upstream failed")
+
+    async def run():
+        return [result async for result in scorer.score_many(applicants())]
+
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        asyncio.run(run())
+    scorer.close()
+
+
+def test_early_exit_with_full_queue_leaves_no_tasks():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=1, queue_size=2, batch_size=1)
+
+    async def run():
+        stream = scorer.score_many(rows.tolist())
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.1)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    scorer.close()
+
+
+def test_scorer_can_be_reused_across_event_loops():
+    scorer = AsyncScorer(improved_model, scaler, max_concurrency=2)
+    applicant = {'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000}
+    first = asyncio.run(scorer.score(applicant))
+    second = asyncio.run(scorer.score(applicant))
+    scorer.close()
+    np.testing.assert_array_equal(first[1], second[1])
@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_scoring import read_applicants, results_bytes, score_applicants, summarize
+from src.scoring import ModelStore, model_scaler, score_batch
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+@pytest.fixture(scope='module')
+def applicants():
+    frame = pd.read_csv(data_path).head(2000)
+    frame.loc[0, 'Annual Salary'] = 0.0
+    frame.loc[1, 'Employed'] = 3
+    frame['Bank Balance'] = frame['Bank Balance'].astype(str)
+    frame.loc[2, 'Bank Balance'] = 'unknown'
+    # Parsed back like an upload, so 'Bank Balance' is a text column.
+    return read_applicants(io.BytesIO(frame.to_csv(index=False).encode()), 'applicants.csv')
+
+
+@pytest.fixture(scope='module')
+def model_and_scaler():
+    store = ModelStore(compiled=True)
+    model = store.get('improved_lr')
+    return model, model_scaler(model, store.scaler)
+
+
+def test_scores_valid_rows_and_keeps_rejected_ones(applicants, model_and_scaler):
+    model, scaler = model_and_scaler
+    calls = []
+    results, validation = score_applicants(applicants, model, scaler, chunk_size=500,
+                                           progress=lambda done, total: calls.append((done, total)))
+    assert len(results) == len(applicants)
+    rejected = validation.rejected
+    assert calls[-1][0] == calls[-1][1] == int(np.count_nonzero(~rejected))
+    assert len(calls) == -(-calls[-1][1] // 500)
+
+    assert rejected[:3].all()
+    assert results['Prediction'][rejected].isna().all()
+    assert results['Default_Probability'][rejected].isna().all()
+    assert results['Validation'][0] == "❌ Annual Salary must be greater than zero"
+    assert results['Validation'][1] == "❌ Employed must be 0 or 1"
+    assert results['Validation'][2].startswith("❌ Bank Balance, Annual Salary")
+
+    valid = ~rejected
+    raw = applicants.loc[valid, ['Employed', 'Bank Balance', 'Annual Salary']].astype(float)
+    assert not pd.api.types.is_numeric_dtype(applicants['Bank Balance'])
+    predictions, probabilities = score_batch(model, scaler, raw)
+    np.testing.assert_allclose(results.loc[valid, 'Default_Probability'], probabilities[:, 1])
+    np.testing.assert_array_equal(results.loc[valid, 'Prediction'].astype(int), predictions)
+
+
+def test_rows_with_only_warnings_are_scored(model_and_scaler):
+    frame = pd.DataFrame({'Employed': [1, 1, 1], 'Bank Balance': [5000.0, 5000.0, 500.0],
+                          'Annual Salary': [400000.0, 400000.0, 20000.0],
+                          'Loan Amount': [100000.0, 2500000.0, 0.0]})
+    results, validation = score_applicants(frame, *model_and_scaler)
+    assert not validation.rejected.any()
+    assert results['Prediction'].notna().all()
+    assert list(results['Validation_Errors']) == [0, 0, 0]
+    assert list(results['Validation_Warnings'] != 0) == [False, True, True]
+    assert results['Validation'][1] == "⚠️ Warning: Loan amount is more than 5x annual salary - Extremely high risk"
+
+
+def test_summary(applicants, model_and_scaler):
+    results, validation = score_applicants(applicants, *model_and_scaler)
+    summary = summarize(results, validation)
+    assert summary['rows'] == len(applicants)
+    assert summary['scored'] + summary['rejected'] == len(applicants)
+    assert summary['histogram']['Applicants'].sum() == summary['scored']
+    assert summary['by_employment']['Applicants'].sum() == summary['scored']
+    assert summary['predicted_defaults'] == int((results['Prediction'] == 1).sum())
+    assert sum(summary['validation'].values()) >= summary['rejected']
+    assert summary['with_warnings'] == int(((results['Validation_Warnings'] != 0) & results['Prediction'].notna()).sum())
+
+
+@pytest.mark.parametrize('parquet', [False, True])
+def test_results_round_trip(applicants, model_and_scaler, parquet):
+    pytest.importorskip('pyarrow')
+    results, _ = score_applicants(applicants, *model_and_scaler)
+    data = results_bytes(results, parquet=parquet)
+    reread = read_applicants(io.BytesIO(data), 'results.parquet' if parquet else 'results.csv')
+    assert len(reread) == len(results)
+    np.testing.assert_allclose(reread['Default_Probability'], results['Default_Probability'])
+
+
+def test_missing_columns_are_reported():
+    with pytest.raises(ValueError, match='Annual Salary'):
+        read_applicants(io.BytesIO(b'Employed,Bank Balance\n1,100\n'), 'applicants.csv')
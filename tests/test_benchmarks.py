@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import run_benchmarks
+
+BASELINE = {
+    'metrics': {
+        'latency/rf_p50_us': 100.0,
+        'throughput/rf_1000_rows_per_sec': 10_000.0,
+        'train/rf_fit_seconds': 2.0,
+    },
+    'tolerances': {'train/rf_fit_seconds': 3.0},
+}
+
+
+def test_compare_flags_slower_times_and_lower_throughput():
+    results = {'latency/rf_p50_us': 151.0, 'throughput/rf_1000_rows_per_sec': 6_000.0,
+               'train/rf_fit_seconds': 7.9}
+    regressions = run_benchmarks.compare(results, BASELINE, tolerance=0.5)
+    assert [name for name, _, _ in regressions] == ['latency/rf_p50_us', 'throughput/rf_1000_rows_per_sec']
+
+
+def test_compare_passes_within_tolerance_and_ignores_new_metrics():
+    results = {'latency/rf_p50_us': 149.0, 'throughput/rf_1000_rows_per_sec': 6_700.0,
+               'train/rf_fit_seconds': 1.0, 'latency/new_p50_us': 1e9}
+    assert run_benchmarks.compare(results, BASELINE, tolerance=0.5) == []
+
+
+def test_main_fails_on_regression(tmp_path, monkeypatch):
+    baseline_path = str(tmp_path / 'baseline.json')
+    output_path = str(tmp_path / 'latest.json')
+    with open(baseline_path, 'w') as f:
+        json.dump({'metrics': {'latency/lr_p50_us': 1e-6}}, f)
+
+    argv = ['--quick', '--skip-training', '--baseline', baseline_path, '--output', output_path]
+    assert run_benchmarks.main(argv) == 1
+    with open(output_path) as f:
+        results = json.load(f)
+    assert {'environment', 'metrics'} <= set(results)
+    assert 'throughput/rf_100000_rows_per_sec' in results['metrics']
+    assert any(name.startswith('load/') for name in results['metrics'])
+
+    assert run_benchmarks.main(argv + ['--update-baseline']) == 0
+    with open(baseline_path) as f:
+        assert set(json.load(f)['metrics']) == set(results['metrics'])
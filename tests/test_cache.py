@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, **kwargs):
+    models_dir = os.path.join(tmp_path, 'models')
+    os.makedirs(models_dir, exist_ok=True)
+    with open(os.path.join(models_dir, 'model.pkl'), 'wb') as f:
+        f.write(b'v1')
+    clock = FakeClock()
+    return PredictionCache(models_dir=models_dir, clock=clock, check_interval=0.0, **kwargs), clock, models_dir
+
+
+def test_hits_and_misses(tmp_path):
+    cache, _, _ = make_cache(tmp_path)
+    calls = []
+    score = lambda: calls.append(1) or (0, [0.9, 0.1])
+
+    assert cache.get_or_score('rf', 1, 8000, 600000, score) == (0, [0.9, 0.1])
+    assert cache.get_or_score('rf', 1, 8000, 600000, score) == (0, [0.9, 0.1])
+    assert cache.get_or_score('lr', 1, 8000, 600000, score) == (0, [0.9, 0.1])
+    assert len(calls) == 2
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_lru_eviction(tmp_path):
+    cache, _, _ = make_cache(tmp_path, maxsize=2)
+    cache.put('rf', 1, 1, 1, 'a')
+    cache.put('rf', 1, 2, 2, 'b')
+    cache.get('rf', 1, 1, 1)
+    cache.put('rf', 1, 3, 3, 'c')
+    assert cache.get('rf', 1, 2, 2) is None
+    assert cache.get('rf', 1, 1, 1) == 'a'
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 2
+
+
+def test_ttl_expiry(tmp_path):
+    cache, clock, _ = make_cache(tmp_path, ttl=10.0)
+    cache.put('rf', 1, 8000, 600000, 'x')
+    clock.now = 9.9
+    assert cache.get('rf', 1, 8000, 600000) == 'x'
+    clock.now = 10.0
+    assert cache.get('rf', 1, 8000, 600000) is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_quantized_keys(tmp_path):
+    cache, _, _ = make_cache(tmp_path, precision=-2)
+    cache.put('rf', 1, 8010, 600040, 'x')
+    assert cache.get('rf', 1, 7990, 599960) == 'x'
+    assert cache.get('rf', 1, 8100, 600000) is None
+
+    exact, _, _ = make_cache(os.path.join(tmp_path, 'exact'))
+    exact.put('rf', 1, 8010, 600040, 'x')
+    assert exact.get('rf', 1, 8010.0, 600040.0) == 'x'
+    assert exact.get('rf', 1, 8000, 600000) is None
+
+
+def test_cleared_when_model_files_change(tmp_path):
+    cache, _, models_dir = make_cache(tmp_path)
+    cache.put('rf', 1, 8000, 600000, 'old')
+    with open(os.path.join(models_dir, 'model.pkl'), 'wb') as f:
+        f.write(b'retrained')
+    assert cache.get('rf', 1, 8000, 600000) is None
+    assert cache.stats()['model_version'] == 1
+    assert cache.stats()['size'] == 0
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.calibration import ISOTONIC, PLATT, Calibration, Calibrator, brier_score, calibration_folds, \
+    reliability_curve
+from src.features import RAW_COLUMNS
+from src.registry import ARTIFACT_FILES
+from src.scoring import CALIBRATION_FILE, ModelStore, model_scaler, score_applicant, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+store = ModelStore(models_dir, compiled=True)
+
+
+def overconfident(n, seed=0):
+    # Labels drawn from p ** 2: the scores overstate the default rate, the
+    # way a class-balanced model does.
+    rng = np.random.default_rng(seed)
+    p_default = rng.beta(1.0, 4.0, n)
+    return (rng.random(n) < p_default ** 2).astype(int), p_default
+
+
+@pytest.mark.parametrize('method', [PLATT, ISOTONIC])
+def test_calibrator_is_monotone_and_bounded(method):
+    y_true, p_default = overconfident(20000)
+    calibrator = Calibrator.fit(method, p_default, y_true)
+    grid = np.linspace(0.0, 1.0, 1001)
+    calibrated = calibrator(grid)
+    assert np.all(np.diff(calibrated) >= 0)
+    assert calibrated.min() >= 0.0 and calibrated.max() <= 1.0
+    # Outside the fitted range isotonic clips to its end values.
+    assert np.isfinite(calibrator(np.array([-1.0, 2.0]))).all()
+
+
+def test_isotonic_table_is_small_and_sorted():
+    y_true, p_default = overconfident(50000, seed=1)
+    calibrator = Calibrator.fit(ISOTONIC, p_default, y_true)
+    assert len(calibrator.breakpoints) < 1000
+    assert np.all(np.diff(calibrator.breakpoints) >= 0)
+    assert np.all(np.diff(calibrator.values) >= 0)
+
+
+def test_fit_improves_brier_on_the_evaluation_fold():
+    y_true, p_default = overconfident(20000, seed=2)
+    calibration = Calibration.fit(y_true, {'rf': p_default})
+    report = calibration.reports['rf']
+    assert report['fit_rows'] + report['eval_rows'] == len(y_true)
+    assert report['method'] == min(report['brier_by_method'], key=report['brier_by_method'].get)
+    assert report['brier_after'] < report['brier_before']
+    _, eval_rows = calibration_folds(len(y_true))
+    assert report['brier_after'] == pytest.approx(brier_score(y_true[eval_rows],
+                                                              calibration.get('rf')(p_default[eval_rows])))
+    # Before: the scores overstate defaults; after: they track the observed rate.
+    before, after = report['reliability_before'], report['reliability_after']
+    gap = lambda curve: np.average(np.abs(np.subtract(curve['predicted'], curve['observed'])), weights=curve['rows'])
+    assert gap(after) < gap(before) / 2
+    assert sum(before['rows']) == sum(after['rows']) == report['eval_rows']
+
+
+def test_reliability_curve():
+    curve = reliability_curve([0, 1, 1, 0], [0.05, 0.15, 0.95, 1.0], bins=10)
+    assert curve['bin_start'] == [0.0, 0.1, 0.9]
+    assert curve['rows'] == [1, 1, 2]
+    assert curve['predicted'] == pytest.approx([0.05, 0.15, 0.975])
+    assert curve['observed'] == [0.0, 1.0, 0.5]
+
+
+def test_round_trip(tmp_path):
+    y_true, p_default = overconfident(5000, seed=3)
+    calibration = Calibration.fit(y_true, {'improved_lr': p_default, 'rf': p_default ** 0.5}, method=ISOTONIC)
+    path = os.path.join(tmp_path, CALIBRATION_FILE)
+    calibration.save(path)
+    loaded = Calibration.load(path)
+    assert loaded.models == calibration.models
+    assert loaded.reports['rf']['brier_after'] == calibration.reports['rf']['brier_after']
+    grid = np.linspace(0.0, 1.0, 101)
+    for model_key in calibration.models:
+        np.testing.assert_array_equal(loaded.get(model_key)(grid), calibration.get(model_key)(grid))
+    assert loaded.get('basic') is None
+
+
+@pytest.mark.parametrize('method', [PLATT, ISOTONIC])
+def test_applying_a_million_rows_is_fast(method):
+    y_true, p_default = overconfident(20000, seed=4)
+    calibrator = Calibrator.fit(method, p_default, y_true)
+    rows = np.random.default_rng(5).random(1_000_000)
+    calibrator(rows)
+    start = time.perf_counter()
+    calibrator(rows)
+    # About 0.05 s here; the bound leaves room for a loaded machine.
+    assert time.perf_counter() - start < 0.5
+
+
+def test_committed_calibration_is_applied():
+    assert CALIBRATION_FILE in ARTIFACT_FILES
+    calibration = store.calibration()
+    assert set(calibration.models) == {'improved_lr', 'rf'}
+    raw = pd.read_csv(data_path).head(2000)[RAW_COLUMNS].to_numpy()
+    for model_key in calibration.models:
+        model = store.get(model_key)
+        scaler = model_scaler(model, store.scaler)
+        calibrator = store.calibrator(model_key)
+        _, uncalibrated = score_batch(model, scaler, raw)
+        predictions, probabilities = score_batch(model, scaler, raw, calibrator=calibrator)
+        np.testing.assert_allclose(probabilities[:, 1], calibrator(uncalibrated[:, 1]))
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+        # Monotone, so the applicants are ranked the same way.
+        assert np.all(np.diff(probabilities[np.argsort(uncalibrated[:, 1], kind='stable'), 1]) >= -1e-12)
+        assert predictions.tolist() == np.argmax(probabilities, axis=1).tolist()
+
+        prediction, probability = score_applicant(model, scaler, *raw[0], calibrator=calibrator)
+        assert prediction == predictions[0]
+        np.testing.assert_allclose(probability, probabilities[0])
+    # The class-balanced logistic regression overstates the default rate.
+    report = calibration.reports['improved_lr']
+    assert report['brier_after'] < report['brier_before']
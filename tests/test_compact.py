@@ -0,0 +1,52 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_io import iter_applicant_chunks
+from src.features import COMPACT_DTYPES, RAW_COLUMNS, engineer_features
+from src.forest import float32_thresholds
+from src.scoring import load_models, model_scaler, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, rf_model, _ = load_models(os.path.join(project_root, 'models'), compiled=True)
+applicants = pd.read_csv(data_path, usecols=RAW_COLUMNS)
+
+
+def test_float32_thresholds_split_float32_inputs_identically():
+    rng = np.random.default_rng(0)
+    thresholds = np.concatenate([rng.normal(0, 3, 5000), rng.normal(0, 1e5, 5000), [np.inf, 0.0, -0.5]])
+    rounded = float32_thresholds(thresholds)
+    assert rounded.dtype == np.float32
+    # Float32 values right next to each threshold, where a rounding error would show.
+    x = np.stack([np.nextafter(thresholds.astype(np.float32), np.float32(direction))
+                  for direction in (-np.inf, np.inf)] + [thresholds.astype(np.float32)])
+    np.testing.assert_array_equal(x <= rounded, x.astype(np.float64) <= thresholds)
+
+
+def test_compact_path_matches_float64_predictions():
+    compact = applicants.astype(COMPACT_DTYPES)
+    for model in (rf_model, improved_model):
+        predictions, probabilities = score_batch(model, model_scaler(model, scaler), applicants)
+        compact_predictions, compact_probabilities = score_batch(model, model_scaler(model, scaler), compact,
+                                                                 dtype=np.float32)
+        np.testing.assert_array_equal(compact_predictions, predictions)
+        assert compact_probabilities.dtype == np.float64
+        # At most one tree's vote, for a row whose rounded money value lands across a split.
+        np.testing.assert_allclose(compact_probabilities, probabilities, rtol=0, atol=0.0101)
+
+
+def test_compact_features_use_half_the_memory():
+    compact = applicants.astype(COMPACT_DTYPES)
+    assert engineer_features(compact, dtype=np.float32).nbytes * 2 == engineer_features(applicants).nbytes
+
+
+def test_compact_chunk_reading():
+    chunk = next(iter_applicant_chunks(data_path, 100, dtypes=COMPACT_DTYPES))
+    assert chunk.dtypes.to_dict() == {column: np.dtype(dtype) for column, dtype in COMPACT_DTYPES.items()}
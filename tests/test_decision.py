@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import score_batch as score_batch_cli
+from src.batch_scoring import score_applicants
+from src.decision import CURVE_POINTS, DEFAULT_THRESHOLD, CostMatrix, DecisionPolicy, cost_at, cost_curve, decide
+from src.registry import ARTIFACT_FILES
+from src.scoring import DECISION_POLICY_FILE, ModelStore, model_scaler, score_batch
+from src.service import ScoringService
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+store = ModelStore(models_dir, compiled=True)
+
+
+def held_out(n, seed=0, decimals=None):
+    rng = np.random.default_rng(seed)
+    p_default = rng.beta(1.0, 8.0, n)
+    y_true = (rng.random(n) < p_default).astype(int)
+    return y_true, p_default if decimals is None else np.round(p_default, decimals)
+
+
+def brute_force_cost(y_true, p_default, cutoff, costs):
+    declined = p_default >= cutoff
+    return (np.count_nonzero(~declined & (y_true == 1)) * costs.loss_given_default
+            + np.count_nonzero(declined & (y_true == 0)) * costs.lost_interest)
+
+
+def test_cost_curve_matches_brute_force_with_ties():
+    costs = CostMatrix(0.6, 0.08)
+    y_true, p_default = held_out(3000, decimals=2)
+    thresholds, cost = cost_curve(y_true, p_default, costs)
+    assert thresholds[0] == np.inf and np.all(np.diff(thresholds) < 0)
+    # One cutoff per distinct probability, plus declining nobody.
+    assert len(thresholds) == len(np.unique(p_default)) + 1
+    for cutoff, expected in zip(thresholds, cost):
+        assert expected == pytest.approx(brute_force_cost(y_true, p_default, cutoff, costs))
+    for cutoff in (0.0, 0.005, 0.123, 0.5, 1.0):
+        assert cost_at(thresholds, cost, cutoff) == pytest.approx(brute_force_cost(y_true, p_default, cutoff, costs))
+
+
+def test_policy_picks_the_cheapest_cutoff():
+    costs = CostMatrix(0.45, 0.10)
+    y_true, p_default = held_out(20000, seed=1)
+    policy = DecisionPolicy.fit(y_true, {'rf': p_default}, costs)
+    summary = policy.summaries['rf']
+    thresholds, cost = cost_curve(y_true, p_default, costs)
+    assert summary['cost_per_applicant'] == pytest.approx(cost.min() / len(y_true))
+    assert summary['default_cost_per_applicant'] == pytest.approx(
+        brute_force_cost(y_true, p_default, DEFAULT_THRESHOLD, costs) / len(y_true))
+    assert summary['cost_per_applicant'] <= summary['default_cost_per_applicant']
+    # These probabilities are calibrated, so the optimum sits near the
+    # Bayes cutoff lost_interest / (loss_given_default + lost_interest).
+    assert abs(summary['threshold'] - 0.10 / 0.55) < 0.03
+    assert len(policy.curves['rf']) == CURVE_POINTS
+    assert policy.threshold('improved_lr') == DEFAULT_THRESHOLD
+
+
+def test_policy_that_declines_nobody():
+    # Defaults cost nothing, so the best cutoff approves everyone.
+    y_true, p_default = held_out(1000, seed=2)
+    policy = DecisionPolicy.fit(y_true, {'rf': p_default}, CostMatrix(0.0, 0.1))
+    assert policy.threshold('rf') > 1.0
+    assert decide(np.array([0.0, 0.5, 1.0]), policy.threshold('rf')).tolist() == [0, 0, 0]
+
+
+def test_policy_round_trip(tmp_path):
+    y_true, p_default = held_out(5000, seed=3)
+    policy = DecisionPolicy.fit(y_true, {'improved_lr': p_default, 'rf': p_default ** 2}, CostMatrix(0.5, 0.2))
+    path = os.path.join(tmp_path, DECISION_POLICY_FILE)
+    policy.save(path)
+    loaded = DecisionPolicy.load(path)
+    assert loaded.costs == CostMatrix(0.5, 0.2)
+    assert loaded.summaries == policy.summaries
+    for model_key in policy.models:
+        np.testing.assert_array_equal(loaded.curves[model_key], policy.curves[model_key])
+
+
+def test_fit_on_a_million_rows_is_fast():
+    y_true, p_default = held_out(1_000_000, seed=4)
+    start = time.perf_counter()
+    DecisionPolicy.fit(y_true, {'rf': p_default})
+    # About 0.1 s here; the bound leaves room for a loaded machine.
+    assert time.perf_counter() - start < 1.0
+
+
+def test_committed_policy_is_applied_everywhere():
+    assert DECISION_POLICY_FILE in ARTIFACT_FILES
+    policy = store.decision_policy()
+    assert set(policy.models) == {'improved_lr', 'rf'}
+    applicants = pd.read_csv(data_path).head(2000)
+    raw = applicants[['Employed', 'Bank Balance', 'Annual Salary']].to_numpy()
+    for model_key in policy.models:
+        model = store.get(model_key)
+        threshold = store.decision_threshold(model_key)
+        predictions, probabilities = score_batch(model, model_scaler(model, store.scaler), raw, threshold=threshold)
+        assert predictions.tolist() == decide(probabilities[:, 1], threshold).tolist()
+
+        results, _ = score_applicants(applicants, model, model_scaler(model, store.scaler), threshold=threshold)
+        assert results['Prediction'].tolist() == predictions.tolist()
+
+    service = ScoringService(models_dir)
+    try:
+        threshold = store.decision_threshold('improved_lr')
+        # Between the cutoff and 0.5: declined, where the most probable class would approve.
+        status, body = service.predict_batch({'model': 'lr', 'applicants': [
+            {'employed': int(row[0]), 'bank_balance': row[1], 'annual_salary': row[2]} for row in raw]})
+        assert status == 200
+        p_default = np.array([result['default_probability'] for result in body['results']])
+        predictions = np.array([result['prediction'] for result in body['results']])
+        assert predictions.tolist() == decide(p_default, threshold).tolist()
+        assert np.any((p_default >= threshold) & (p_default < 0.5))
+    finally:
+        service.close()
+
+
+def test_score_batch_threshold_option(tmp_path):
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    output_path = os.path.join(tmp_path, 'results.csv')
+    pd.read_csv(data_path).head(500).to_csv(input_path, index=False)
+    assert score_batch_cli.main([input_path, output_path, '--model', 'lr']) == 0
+    results = pd.read_csv(output_path)
+    threshold = store.decision_threshold('improved_lr')
+    assert results['Prediction'].tolist() == decide(results['Default_Probability'], threshold).tolist()
+
+    assert score_batch_cli.main([input_path, output_path, '--model', 'lr', '--threshold', '0.2']) == 0
+    results = pd.read_csv(output_path)
+    assert results['Prediction'].tolist() == decide(results['Default_Probability'], 0.2).tolist()
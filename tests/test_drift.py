@@ -0,0 +1,179 @@
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import score_batch as score_batch_cli
+from src.drift import ALERT, OK, DriftMonitor, DriftReference, StreamingHistogram, binned_ks, probability_feature, psi
+from src.features import RAW_COLUMNS
+from src.registry import ARTIFACT_FILES
+from src.scoring import DRIFT_REFERENCE_FILE, ModelStore
+from src.service import ScoringService, make_server
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+
+def applicant_rows(n, seed=0, balance_scale=1.0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.integers(0, 2, n), rng.gamma(2.0, 5000.0, n) * balance_scale,
+                            rng.normal(400000, 130000, n).clip(1000)])
+
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(1)
+    return DriftReference.build(applicant_rows(20000), {'rf': rng.beta(1, 8, 20000)})
+
+
+def test_streaming_histogram_matches_numpy():
+    values = np.random.default_rng(0).normal(size=50000)
+    edges = np.linspace(-2, 2, 9)
+    histogram = StreamingHistogram(edges)
+    for chunk in np.array_split(values, 7):
+        histogram.update(chunk)
+    histogram.update([np.nan, np.inf])
+    expected = np.bincount(np.digitize(values, edges), minlength=10)
+    assert histogram.counts.tolist() == expected.tolist()
+    assert histogram.total == len(values)
+    assert (histogram.min, histogram.max) == (values.min(), values.max())
+    # One bin is 0.5 wide, so interpolation inside it is accurate to that.
+    assert abs(histogram.quantile(0.5) - np.median(values)) < 0.05
+    histogram.reset()
+    assert histogram.total == 0 and histogram.quantile(0.5) is None
+
+
+def test_psi_and_ks():
+    same = np.array([0.25, 0.25, 0.25, 0.25])
+    assert psi(same, same) == 0.0 and binned_ks(same, same) == 0.0
+    shifted = np.array([0.1, 0.2, 0.3, 0.4])
+    assert psi(same, shifted) == pytest.approx(np.sum((shifted - same) * np.log(shifted / same)))
+    assert binned_ks(same, shifted) == pytest.approx(0.2)
+    # An empty bin is smoothed rather than infinite.
+    assert np.isfinite(psi(same, np.array([0.0, 0.0, 0.5, 0.5])))
+
+
+def test_reference_roundtrip(tmp_path, reference):
+    assert reference.features == RAW_COLUMNS + [probability_feature('rf')]
+    # The 0/1 Employed flag gets one edge: a bin for each value.
+    assert len(reference.edges['Employed']) == 1
+    assert len(reference.proportions['Bank Balance']) == 20
+    np.testing.assert_allclose(reference.proportions['Bank Balance'], 0.05, atol=1e-3)
+    path = os.path.join(tmp_path, DRIFT_REFERENCE_FILE)
+    reference.save(path)
+    loaded = DriftReference.load(path)
+    assert loaded.features == reference.features and loaded.rows == reference.rows
+    for name in reference.features:
+        np.testing.assert_array_equal(loaded.edges[name], reference.edges[name])
+        np.testing.assert_array_equal(loaded.proportions[name], reference.proportions[name])
+
+
+def test_monitor_alerts_on_shifted_features_only(reference):
+    alerts = []
+    monitor = DriftMonitor(reference, on_alert=alerts.append)
+    monitor.observe(applicant_rows(5000, seed=2), np.random.default_rng(3).beta(1, 8, 5000), 'rf')
+    report = monitor.check()
+    assert {name: result['status'] for name, result in report['features'].items()} == \
+        {name: OK for name in reference.features}
+    assert alerts == []
+
+    monitor.observe(applicant_rows(5000, seed=4, balance_scale=1.5))
+    report = monitor.check()
+    assert report['features']['Bank Balance']['status'] == ALERT
+    assert report['features']['Annual Salary']['status'] == OK
+    # Nothing was scored in this window, so there is no probability to compare.
+    assert report['features'][probability_feature('rf')]['rows'] == 0
+    assert [alert.feature for alert in alerts] == ['Bank Balance']
+    assert alerts[0].rows == 5000 and alerts[0].psi >= 0.25
+
+
+def test_small_windows_never_alert(reference):
+    monitor = DriftMonitor(reference, min_rows=1000)
+    monitor.observe(applicant_rows(500, balance_scale=3.0))
+    result = monitor.check()['features']['Bank Balance']
+    assert result['rows'] == 500 and result['psi'] > 0.25 and result['status'] == OK
+
+
+def test_monitor_memory_is_constant(reference):
+    monitor = DriftMonitor(reference)
+    sizes = {name: sketch.counts.nbytes for name, sketch in monitor.sketches.items()}
+    for seed in range(5):
+        monitor.observe(applicant_rows(100000, seed=seed))
+    assert {name: sketch.counts.nbytes for name, sketch in monitor.sketches.items()} == sizes
+    assert monitor.sketches['Bank Balance'].total == 500000
+
+
+def test_committed_models_have_a_drift_reference():
+    assert DRIFT_REFERENCE_FILE in ARTIFACT_FILES
+    reference = ModelStore(models_dir).drift_reference()
+    assert set(reference.features) == set(RAW_COLUMNS) | {probability_feature('rf'),
+                                                          probability_feature('improved_lr')}
+    # The training data itself shows no drift.
+    monitor = DriftMonitor(reference)
+    monitor.observe(pd.read_csv(data_path)[RAW_COLUMNS].to_numpy())
+    for name in RAW_COLUMNS:
+        assert monitor.check(reset=False)['features'][name]['psi'] < 0.01
+
+
+def test_service_feeds_the_monitor(tmp_path):
+    alerts = []
+    service = ScoringService(models_dir, drift_interval=60, on_drift_alert=alerts.append)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        applicants = [{'employed': int(row[0]), 'bank_balance': row[1], 'annual_salary': row[2]}
+                      for row in applicant_rows(300, balance_scale=4.0)]
+        status, _ = service.predict_batch({'model': 'rf', 'applicants': applicants})
+        assert status == 200
+        for applicant in applicants[:20]:
+            assert service.predict({**applicant, 'model': 'lr'})[0] == 200
+        # Single requests are observed just after their futures resolve.
+        deadline = time.monotonic() + 5
+        while service.drift.check(reset=False)['features']['Bank Balance']['rows'] < 320 \
+                and time.monotonic() < deadline:
+            time.sleep(0.01)
+        alerts.clear()
+        service.drift.min_rows = 100
+        report = service.drift.check()
+        assert report['features']['Bank Balance']['rows'] == 320
+        assert report['features'][probability_feature('rf')]['rows'] == 300
+        assert report['features'][probability_feature('improved_lr')]['rows'] == 20
+        assert 'Bank Balance' in [alert.feature for alert in alerts]
+
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+        connection.request('GET', '/drift')
+        response = connection.getresponse()
+        body = json.loads(response.read())
+        connection.close()
+        assert response.status == 200
+        assert body['interval'] == 60
+        assert body['report']['features']['Bank Balance']['status'] == ALERT
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_score_batch_drift_report(tmp_path):
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    report_path = os.path.join(tmp_path, 'drift.json')
+    pd.read_csv(data_path).head(3000).to_csv(input_path, index=False)
+    assert score_batch_cli.main([input_path, os.path.join(tmp_path, 'results.csv'), '--model', 'lr',
+                                 '--drift-report', report_path]) == 0
+    with open(report_path) as f:
+        report = json.load(f)
+    assert report['features']['Annual Salary']['rows'] == 3000
+    assert report['features'][probability_feature('improved_lr')]['rows'] == 3000
+    assert report['features'][probability_feature('rf')]['rows'] == 0
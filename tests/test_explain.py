@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_scoring import score_applicants, summarize
+from src.explain import REASON_COLUMNS, LinearExplainer, TreeExplainer, explain_batch, explainer_for, \
+    reason_labels, top_reasons
+from src.features import FEATURE_COLUMNS, RAW_COLUMNS
+from src.scoring import ModelStore, model_scaler, score_batch
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+raw = pd.read_csv(data_path)[RAW_COLUMNS].to_numpy()[:3000]
+
+
+def explained_probability(explainer, contributions):
+    total = explainer.base_value + contributions.sum(axis=1)
+    return 1.0 / (1.0 + np.exp(-total)) if explainer.units == 'log-odds' else total
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+@pytest.mark.parametrize('model_key, explainer_type', [('improved_lr', LinearExplainer), ('rf', TreeExplainer)])
+def test_attributions_add_up_to_the_prediction(compiled, model_key, explainer_type):
+    store = ModelStore(compiled=compiled)
+    model = store.get(model_key)
+    explainer = explainer_for(model, store.scaler)
+    assert isinstance(explainer, explainer_type)
+    contributions = explain_batch(explainer, raw, chunk_size=700)
+    assert contributions.shape == (len(raw), len(FEATURE_COLUMNS))
+    _, probabilities = score_batch(model, model_scaler(model, store.scaler), raw)
+    np.testing.assert_allclose(explained_probability(explainer, contributions), probabilities[:, 1], atol=1e-12)
+
+
+def test_compiled_and_pickled_models_explain_alike():
+    compiled, pickled = ModelStore(compiled=True), ModelStore()
+    for model_key in ('improved_lr', 'rf'):
+        np.testing.assert_allclose(
+            explain_batch(explainer_for(compiled.get(model_key), compiled.scaler), raw[:500]),
+            explain_batch(explainer_for(pickled.get(model_key), pickled.scaler), raw[:500]),
+            atol=1e-9
+        )
+
+
+def test_linear_attribution_is_zero_at_the_training_mean():
+    store = ModelStore(compiled=True)
+    explainer = explainer_for(store.get('improved_lr'), store.scaler)
+    np.testing.assert_allclose(explainer.contributions(np.array([explainer.mean])), 0.0)
+
+
+def test_top_reasons():
+    contributions = np.array([[0.1, -0.2, 0.5, 0.0, 0.3, 0.05],
+                              [-0.1, -0.2, -0.5, 0.0, -0.3, -0.05]])
+    reasons = top_reasons(contributions)
+    assert reasons.tolist() == [[2, 4, 0], [-1, -1, -1]]
+    assert list(reason_labels(reasons[0])) == ['Annual Salary', 'Monthly_Salary', 'Employed']
+    assert reason_labels(reasons[1]).isna().all()
+
+
+def test_batch_results_carry_reasons():
+    store = ModelStore(compiled=True)
+    model = store.get('rf')
+    frame = pd.DataFrame(raw[:1000], columns=RAW_COLUMNS)
+    frame.loc[0, 'Annual Salary'] = 0.0
+    results, validation = score_applicants(frame, model, model_scaler(model, store.scaler), chunk_size=300,
+                                           explainer=explainer_for(model, store.scaler))
+    assert results.loc[0, REASON_COLUMNS].isna().all()
+    expected = top_reasons(explain_batch(explainer_for(model, store.scaler), raw[1:1000]))
+    for i, column in enumerate(REASON_COLUMNS):
+        assert results[column].iloc[1:].equals(pd.Series(reason_labels(expected[:, i]), index=results.index[1:],
+                                                         name=column))
+    summary = summarize(results, validation)
+    assert sum(summary['top_reasons'].values()) == results[REASON_COLUMNS[0]].notna().sum()
+    assert summarize(*score_applicants(frame, model, model_scaler(model, store.scaler)))['top_reasons'] is None
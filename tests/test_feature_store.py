@@ -0,0 +1,85 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.feature_store import FeatureStore, build_feature_store, is_feature_store, open_or_build
+from src.features import engineer_features
+from src.training import split_indices
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+applicants = pd.read_csv(data_path)
+
+
+def test_store_matches_csv_pipeline(tmp_path):
+    store = build_feature_store(data_path, str(tmp_path), chunk_size=3000, id_columns=['Index'])
+    assert len(store) == len(applicants)
+    np.testing.assert_array_equal(store.features(), engineer_features(applicants))
+    np.testing.assert_array_equal(store.labels(), applicants['Defaulted?'].to_numpy())
+    np.testing.assert_array_equal(store.column('Index'), applicants['Index'].to_numpy())
+
+    train_idx, test_idx = split_indices(len(applicants))
+    np.testing.assert_array_equal(store.split('train'), train_idx)
+    np.testing.assert_array_equal(store.split('test'), test_idx)
+    np.testing.assert_array_equal(store.features(store.split('test')), engineer_features(applicants)[test_idx])
+
+
+def test_columns_are_typed_and_memory_mapped(tmp_path):
+    store = build_feature_store(data_path, str(tmp_path), dtype=np.float32)
+    assert store.column('Employed').dtype == np.uint8
+    assert store.column('Defaulted?').dtype == np.uint8
+    assert store.column('Bank Balance').dtype == np.float32
+    assert isinstance(store.column('Savings_Ratio'), np.memmap)
+    assert store.features().dtype == np.float32
+    np.testing.assert_allclose(store.features(), engineer_features(applicants), rtol=1e-6)
+
+
+def test_unlabelled_input_has_no_split(tmp_path):
+    path = str(tmp_path / 'applicants.csv')
+    applicants.drop(columns='Defaulted?').head(50).to_csv(path, index=False)
+    store = build_feature_store(path, str(tmp_path / 'store'))
+    assert not store.has_labels
+    assert len(store) == 50
+    with pytest.raises(ValueError, match='no label'):
+        store.split('train')
+
+
+def test_rejects_non_binary_flags(tmp_path):
+    path = str(tmp_path / 'applicants.csv')
+    frame = applicants.head(10).copy()
+    frame.loc[3, 'Employed'] = 2
+    frame.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='Employed'):
+        build_feature_store(path, str(tmp_path / 'store'))
+    assert not is_feature_store(str(tmp_path / 'store'))
+
+
+def test_open_or_build_reuses_current_store(tmp_path):
+    path = str(tmp_path / 'applicants.csv')
+    applicants.head(100).to_csv(path, index=False)
+    store_dir = str(tmp_path / 'store')
+
+    built = open_or_build(path, store_dir)
+    mtime = os.path.getmtime(os.path.join(store_dir, 'manifest.json'))
+    assert open_or_build(path, store_dir).manifest == built.manifest
+    assert os.path.getmtime(os.path.join(store_dir, 'manifest.json')) == mtime
+
+    applicants.head(120).to_csv(path, index=False)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert len(open_or_build(path, store_dir)) == 120
+    assert open_or_build(path, store_dir, dtype=np.float32).column('Bank Balance').dtype == np.float32
+
+
+def test_iter_frames_round_trips_raw_columns(tmp_path):
+    store = FeatureStore(build_feature_store(data_path, str(tmp_path)).store_dir)
+    frames = list(store.iter_frames(4000))
+    assert [len(frame) for frame in frames] == [4000, 4000, 2000]
+    combined = pd.concat(frames, ignore_index=True)
+    np.testing.assert_array_equal(combined.to_numpy(), applicants[['Employed', 'Bank Balance', 'Annual Salary']])
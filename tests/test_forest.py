@@ -0,0 +1,79 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import engineer_features
+from src.forest import FALLBACK_MIN_ROWS, FlatForest, export_forest
+from src.scoring import load_models, scale_features
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+_, scaler, rf_model, _ = load_models(os.path.join(project_root, 'models'))
+x_scaled = scale_features(scaler, engineer_features(pd.read_csv(data_path)))
+
+
+def test_flat_forest_matches_sklearn():
+    forest = export_forest(rf_model)
+    np.testing.assert_allclose(forest.predict_proba(x_scaled), rf_model.predict_proba(x_scaled), rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(forest.predict(x_scaled), rf_model.predict(x_scaled))
+
+
+def test_flat_forest_single_row():
+    forest = export_forest(rf_model)
+    for row in x_scaled[:50]:
+        np.testing.assert_allclose(forest.predict_proba(row[None, :]), rf_model.predict_proba(row[None, :]),
+                                   rtol=0, atol=1e-9)
+
+
+def test_flat_forest_off_distribution_inputs():
+    forest = export_forest(rf_model)
+    rng = np.random.default_rng(0)
+    x_noisy = x_scaled * rng.normal(1.0, 0.5, size=x_scaled.shape) + rng.normal(0.0, 1.0, size=x_scaled.shape)
+    np.testing.assert_allclose(forest.predict_proba(x_noisy), rf_model.predict_proba(x_noisy), rtol=0, atol=1e-9)
+
+
+def test_flat_forest_save_load_roundtrip(tmp_path):
+    forest = export_forest(rf_model)
+    path = os.path.join(tmp_path, 'forest.npz')
+    forest.save(path)
+    loaded = FlatForest.load(path)
+    np.testing.assert_array_equal(loaded.predict_proba(x_scaled), forest.predict_proba(x_scaled))
+
+
+def test_flat_forest_rejects_non_finite_rows():
+    forest = export_forest(rf_model)
+    for bad in (np.nan, np.inf, -np.inf):
+        x_bad = x_scaled[:5].copy()
+        x_bad[2, 1] = bad
+        with pytest.raises(ValueError):
+            forest.predict_proba(x_bad)
+
+
+def test_large_batches_go_to_sklearn_fallback():
+    forest = export_forest(rf_model, keep_fallback=True)
+    calls = []
+
+    class RecordingModel:
+        def predict_proba(self, X):
+            calls.append(len(X))
+            return rf_model.predict_proba(X)
+
+    forest.fallback = RecordingModel()
+    small = forest.predict_proba(x_scaled[:FALLBACK_MIN_ROWS - 1])
+    large = forest.predict_proba(x_scaled[:FALLBACK_MIN_ROWS])
+    assert calls == [FALLBACK_MIN_ROWS]
+    np.testing.assert_allclose(small, rf_model.predict_proba(x_scaled[:FALLBACK_MIN_ROWS - 1]), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(large, rf_model.predict_proba(x_scaled[:FALLBACK_MIN_ROWS]), rtol=0, atol=1e-9)
+
+
+def test_compiled_load_keeps_batch_fallback():
+    _, _, compiled_rf, _ = load_models(os.path.join(project_root, 'models'), compiled=True)
+    assert isinstance(compiled_rf, FlatForest)
+    assert compiled_rf.fallback is not None
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import FEATURE_COLUMNS, engineer_features
+from src.linear import FusedLinearModel, fuse_linear_model
+from src.scoring import LR_FUSED_FILE, load_models, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, _, _ = load_models(models_dir)
+applicants = pd.read_csv(data_path)
+
+
+def two_step_proba(features):
+    return improved_model.predict_proba(scaler.transform(pd.DataFrame(features, columns=FEATURE_COLUMNS)))
+
+
+def test_fused_model_matches_scaler_and_predict_proba():
+    fused = fuse_linear_model(improved_model, scaler)
+    features = engineer_features(applicants)
+    np.testing.assert_allclose(fused.predict_proba(features), two_step_proba(features), rtol=1e-9, atol=1e-12)
+
+
+def test_fused_model_labels_match():
+    fused = fuse_linear_model(improved_model, scaler)
+    features = engineer_features(applicants)
+    x_scaled = scaler.transform(pd.DataFrame(features, columns=FEATURE_COLUMNS))
+    np.testing.assert_array_equal(fused.predict(features), improved_model.predict(x_scaled))
+
+
+def test_fused_model_extreme_inputs():
+    fused = fuse_linear_model(improved_model, scaler)
+    features = engineer_features([
+        [0, 0.0, 0.0],
+        [1, 0.0, 1.0],
+        [1, 5000.0, -1000.0],
+        [0, 1e7, 1.0],
+        [1, 1e9, 1e9],
+    ])
+    proba = fused.predict_proba(features)
+    assert np.all(np.isfinite(proba))
+    np.testing.assert_allclose(proba, two_step_proba(features), rtol=1e-9, atol=1e-12)
+
+
+def test_shipped_fused_artifact_matches_pipeline():
+    fused = FusedLinearModel.load(os.path.join(models_dir, LR_FUSED_FILE))
+    _, expected = score_batch(improved_model, scaler, applicants)
+    _, proba = score_batch(fused, None, applicants)
+    np.testing.assert_allclose(proba, expected, rtol=1e-9, atol=1e-12)
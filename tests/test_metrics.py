@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import scoring
+from src.metrics import REGISTRY, MetricsRegistry, RollingHistogram, start_metrics_server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    with registry.timer('score'):
+        pass
+    registry.inc('predictions_total')
+    assert registry.snapshot() == {'stages': {}, 'counters': {}}
+
+
+def test_disabled_timer_is_cheap():
+    registry = MetricsRegistry(enabled=False)
+    n = 100_000
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(n):
+            with registry.timer('score'):
+                pass
+        best = min(best, (time.perf_counter() - start) / n)
+    # Generous bound for a shared CI machine; typically ~0.1-0.2 µs.
+    assert best < 2e-6
+
+
+def test_timer_records_stage_and_errors():
+    registry = MetricsRegistry(enabled=True)
+    with registry.timer('score'):
+        pass
+    with pytest.raises(ValueError):
+        with registry.timer('score'):
+            raise ValueError("boom")
+    snapshot = registry.snapshot()
+    assert snapshot['stages']['score']['count'] == 2
+    assert snapshot['counters'] == {'stage_errors_total[stage=score]': 1}
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    histogram = RollingHistogram(buckets=(0.001, 0.01, 0.1))
+    for _ in range(50):
+        histogram.observe(0.0005)
+    for _ in range(50):
+        histogram.observe(0.05)
+    assert histogram.quantile(0.5) == pytest.approx(0.001)
+    assert 0.01 < histogram.quantile(0.99) <= 0.1
+    histogram.observe(10.0)
+    assert histogram.quantile(1.0) == 0.1
+
+
+def test_rolling_window_forgets_old_observations():
+    clock = FakeClock()
+    histogram = RollingHistogram(buckets=(0.001, 0.01), window_seconds=60, slots=6, clock=clock)
+    histogram.observe(0.005)
+    clock.now = 59.0
+    assert histogram.window_counts().sum() == 1
+    clock.now = 61.0
+    histogram.observe(0.0005)
+    assert histogram.window_counts().sum() == 1
+    assert histogram.quantile(0.5) < 0.001
+    # Cumulative counts keep everything.
+    assert histogram.count == 2
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry(enabled=True, buckets=(0.001, 0.01))
+    registry.observe('validate', 0.0005)
+    registry.observe('validate', 0.005)
+    registry.inc('predictions_total', model='rf')
+    registry.inc('predictions_total', model='rf')
+    text = registry.render_prometheus()
+
+    assert '# TYPE loan_stage_seconds histogram' in text
+    assert 'loan_stage_seconds_bucket{stage="validate",le="0.001"} 1' in text
+    assert 'loan_stage_seconds_bucket{stage="validate",le="0.01"} 2' in text
+    assert 'loan_stage_seconds_bucket{stage="validate",le="+Inf"} 2' in text
+    assert 'loan_stage_seconds_count{stage="validate"} 2' in text
+    assert 'loan_stage_seconds_rolling{stage="validate",quantile="0.5"}' in text
+    assert '# TYPE loan_predictions_total counter' in text
+    assert 'loan_predictions_total{model="rf"} 2' in text
+
+
+def test_textfile_and_endpoint(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    registry.inc('predictions_total')
+    path = os.path.join(tmp_path, 'loan.prom')
+    registry.write_textfile(path)
+    with open(path) as f:
+        assert 'loan_predictions_total 1' in f.read()
+
+    server = start_metrics_server(registry, port=0)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert 'loan_predictions_total 1' in response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class ConstantModel:
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, features):
+        return np.tile([0.8, 0.2], (len(features), 1))
+
+
+def test_score_batch_reports_stages():
+    REGISTRY.reset()
+    REGISTRY.enable()
+    try:
+        scoring.score_batch(ConstantModel(), None, [[1, 8000.0, 600000.0]] * 3)
+        snapshot = REGISTRY.snapshot()
+    finally:
+        REGISTRY.disable()
+        REGISTRY.reset()
+    assert {'features', 'predict_proba', 'predict'} <= set(snapshot['stages'])
+    assert snapshot['counters']['scored_rows_total'] == 3
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.features import engineer_features
+from src.forest import export_forest
+from src.out_of_core import RowSample, combine_forests, iter_labeled_chunks, train_out_of_core
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+applicants = pd.read_csv(data_path)
+
+
+@pytest.fixture(scope='module')
+def trained():
+    return train_out_of_core(data_path, chunk_size=1500, rf_shards=2, rf_shard_rows=3000,
+                             rf_trees_per_shard=5, n_jobs=1)
+
+
+def test_holdout_is_stable_across_passes():
+    first = np.concatenate([is_test for _, _, is_test in iter_labeled_chunks(data_path, 1500)])
+    second = np.concatenate([is_test for _, _, is_test in iter_labeled_chunks(data_path, 1500)])
+    np.testing.assert_array_equal(first, second)
+    assert len(first) == len(applicants)
+    assert 0.3 < first.mean() < 0.36
+
+
+def test_incremental_scaler_matches_full_fit(trained):
+    is_test = np.concatenate([is_test for _, _, is_test in iter_labeled_chunks(data_path, 1500)])
+    train_features = engineer_features(applicants)[~is_test]
+    np.testing.assert_allclose(trained['scaler'].mean_, train_features.mean(axis=0), rtol=1e-10)
+    np.testing.assert_allclose(trained['scaler'].scale_, train_features.std(axis=0), rtol=1e-10)
+    assert trained['rows']['train'] == len(train_features)
+
+
+def test_models_are_usable(trained):
+    assert trained['metrics']['lr']['roc_auc'] > 0.93
+    assert trained['metrics']['rf']['roc_auc'] > 0.9
+
+    forest = trained['forest']
+    assert forest.n_estimators == len(forest.estimators_) == 10
+    x = trained['scaler'].transform(engineer_features(applicants.head(200)))
+    np.testing.assert_allclose(export_forest(forest).predict_proba(x), forest.predict_proba(x), rtol=0, atol=1e-9)
+
+
+def test_row_sample_is_capped():
+    sample = RowSample(max_rows=50, expected_rows=100, seed=0)
+    for _ in range(10):
+        sample.offer(np.ones((100, 6)), np.ones(100, dtype=np.int64))
+    features, labels = sample.arrays()
+    assert len(features) == len(labels) == 50
+
+
+def test_combine_forests_rejects_mismatched_classes(trained):
+    class Other:
+        classes_ = np.array([0, 1, 2])
+        estimators_ = []
+
+    with pytest.raises(ValueError, match='different classes'):
+        combine_forests([trained['forest'], Other()])
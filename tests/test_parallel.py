@@ -0,0 +1,46 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.parallel import ParallelScorer, load_shared, parallel_score_batch
+from src.scoring import load_models, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, rf_model, _ = load_models(models_dir)
+applicants = pd.read_csv(data_path).head(3000)
+
+
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+@pytest.mark.parametrize('model_key', ['rf', 'lr'])
+def test_parallel_matches_score_batch_in_input_order(start_method, model_key):
+    model = rf_model if model_key == 'rf' else improved_model
+    predictions, probabilities = parallel_score_batch(model, scaler, applicants, n_jobs=2, start_method=start_method)
+    expected_predictions, expected_probabilities = score_batch(model, scaler, applicants)
+    np.testing.assert_array_equal(predictions, expected_predictions)
+    np.testing.assert_allclose(probabilities, expected_probabilities, rtol=1e-9, atol=1e-12)
+
+
+def test_spawn_workers_read_memory_mapped_arrays():
+    with ParallelScorer(rf_model, scaler, n_jobs=1, start_method='spawn') as scorer:
+        spec_path = os.path.join(scorer._tmp_dir, 'model.joblib')
+        model, _ = load_shared(spec_path)
+        scorer.score(applicants.head(10))
+    assert isinstance(model.threshold, np.memmap)
+    assert isinstance(model.children, np.memmap)
+
+
+def test_spawn_rejects_models_without_array_form():
+    class OpaqueModel:
+        classes_ = np.array([0, 1])
+
+    with pytest.raises(ValueError):
+        ParallelScorer(OpaqueModel(), scaler, n_jobs=1, start_method='spawn')
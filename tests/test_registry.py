@@ -0,0 +1,139 @@
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.registry import MANIFEST_FILE, LiveModelStore, activate, publish, read_manifest
+from src.scoring import CALIBRATION_FILE, MODELS_DIR, ModelStore, model_scaler, score_batch
+from src.service import ScoringService
+
+ROWS = np.array([[1, 8000.0, 600000.0], [0, 25000.0, 200000.0], [1, 500.0, 20000.0]])
+
+
+def copy_models(target):
+    shutil.copytree(MODELS_DIR, target, ignore=shutil.ignore_patterns('registry'))
+    return str(target)
+
+
+def retrained(models_dir, target):
+    # A different, still loadable artifact set: logistic regression with the
+    # opposite sign, so predictions visibly change.
+    from src.linear import FusedLinearModel
+    models_dir = copy_models(target) if not os.path.exists(target) else str(target)
+    fused = FusedLinearModel.load(os.path.join(MODELS_DIR, 'loan_default_lr_fused.npz'), mmap=False)
+    FusedLinearModel(-fused.coef, -fused.intercept, fused.classes_).save(
+        os.path.join(models_dir, 'loan_default_lr_fused.npz'))
+    os.remove(os.path.join(models_dir, 'loan_default_model_improved.pkl'))
+    # Fitted to the old model; the new one's probabilities are used as they are.
+    os.remove(os.path.join(models_dir, CALIBRATION_FILE))
+    return models_dir
+
+
+def p_default(store, model_key='improved_lr'):
+    model = store.get(model_key)
+    return score_batch(model, model_scaler(model, store.scaler), ROWS)[1][:, 1]
+
+
+def test_publish_is_content_addressed(tmp_path):
+    models_dir = copy_models(tmp_path / 'models')
+    registry_dir = str(tmp_path / 'registry')
+    version = publish(models_dir, registry_dir, metrics={'rf': {'roc_auc': 0.9}})
+    assert publish(models_dir, registry_dir) == version
+    manifest = read_manifest(registry_dir)
+    assert manifest['current'] == version
+    assert list(manifest['versions']) == [version]
+    assert sorted(os.listdir(os.path.join(registry_dir, version))) == sorted(manifest['versions'][version]['files'])
+
+    other = publish(retrained(models_dir, tmp_path / 'other'), registry_dir)
+    assert other != version
+    assert read_manifest(registry_dir)['current'] == other
+    activate(version, registry_dir)
+    assert read_manifest(registry_dir)['current'] == version
+    with pytest.raises(KeyError):
+        activate('0' * 12, registry_dir)
+
+
+def test_live_store_swaps_to_published_version(tmp_path):
+    models_dir = copy_models(tmp_path / 'models')
+    registry_dir = str(tmp_path / 'registry')
+    first = publish(models_dir, registry_dir)
+    live = LiveModelStore(registry_dir, poll_interval=0)
+    before = live.current()
+    assert before.version == first
+    # Warmed up: both models and the scaler are already loaded.
+    assert {'improved_lr', 'rf', 'scaler'} <= set(before.store._loaded)
+
+    assert live.check() is False
+    second = publish(retrained(models_dir, tmp_path / 'retrained'), registry_dir)
+    assert live.check() is True
+    after = live.current()
+    assert after.version == second and live.swaps == 1
+    np.testing.assert_allclose(p_default(after.store), 1.0 - p_default(before.store))
+    # A request that took the old version keeps a consistent scaler and model.
+    np.testing.assert_allclose(p_default(before.store), p_default(ModelStore(compiled=True)))
+
+
+def test_broken_version_keeps_serving_the_old_one(tmp_path):
+    models_dir = copy_models(tmp_path / 'models')
+    registry_dir = str(tmp_path / 'registry')
+    first = publish(models_dir, registry_dir)
+    live = LiveModelStore(registry_dir, poll_interval=0)
+
+    broken = str(tmp_path / 'broken')
+    os.makedirs(broken)
+    with open(os.path.join(broken, 'loan_default_lr_fused.npz'), 'wb') as f:
+        f.write(b'not a bundle')
+    publish(broken, registry_dir)
+    assert live.check() is False
+    assert live.current().version == first
+    assert live.last_error
+
+
+def test_background_watcher_swaps(tmp_path):
+    models_dir = copy_models(tmp_path / 'models')
+    registry_dir = str(tmp_path / 'registry')
+    publish(models_dir, registry_dir)
+    live = LiveModelStore(registry_dir, poll_interval=0.01)
+    try:
+        second = publish(retrained(models_dir, tmp_path / 'retrained'), registry_dir)
+        deadline = time.monotonic() + 10
+        while live.current().version != second and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert live.current().version == second
+    finally:
+        live.close()
+
+
+def test_service_follows_registry(tmp_path):
+    models_dir = copy_models(tmp_path / 'models')
+    registry_dir = str(tmp_path / 'registry')
+    first = publish(models_dir, registry_dir)
+    service = ScoringService(registry_dir=registry_dir)
+    try:
+        applicant = {'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000, 'model': 'lr'}
+        before = service.predict(applicant)[1]['default_probability']
+        assert service.health()['version'] == first
+        # The published calibration is applied to the model's own probability.
+        store = ModelStore(models_dir, compiled=True)
+        uncalibrated = p_default(store)[0]
+        assert before == pytest.approx(store.calibrator('improved_lr')(uncalibrated))
+        second = publish(retrained(models_dir, tmp_path / 'retrained'), registry_dir)
+        service.live.check()
+        assert service.health()['version'] == second
+        assert service.predict(applicant)[1]['default_probability'] == pytest.approx(1.0 - uncalibrated)
+        batch = service.predict_batch({'model': 'lr', 'applicants': [applicant]})[1]['results']
+        assert batch[0]['default_probability'] == pytest.approx(1.0 - uncalibrated)
+    finally:
+        service.close()
+
+
+def test_manifest_is_replaced_not_rewritten(tmp_path):
+    registry_dir = str(tmp_path / 'registry')
+    publish(copy_models(tmp_path / 'models'), registry_dir)
+    assert os.listdir(registry_dir).count(MANIFEST_FILE) == 1
+    assert not [name for name in os.listdir(registry_dir) if name.endswith('.tmp')]
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.risk_grid import GridScorer, RiskGrid, axis_range, build_risk_grid
+from src.scoring import ModelStore, model_scaler, save_risk_grids, score_batch
+
+BALANCE_RANGE = (0.0, 40000.0)
+SALARY_RANGE = (0.0, 1000000.0)
+
+
+def smooth_default(rows):
+    # Logistic surface over raw inputs, like a linear model's.
+    z = -2.0 - 1.5 * rows[:, 0] + rows[:, 1] / 8000.0 - rows[:, 2] / 250000.0
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def step_default(rows):
+    return np.where(rows[:, 1] > 20050.0, 0.9, 0.1)
+
+
+def score_rows(predict_default, rows):
+    p_default = predict_default(rows)
+    return (p_default > 0.5).astype(int), np.column_stack([1.0 - p_default, p_default])
+
+
+def random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.integers(0, 2, n), rng.uniform(*BALANCE_RANGE, n), rng.uniform(*SALARY_RANGE, n)])
+
+
+def test_smooth_surface_is_answered_within_bound():
+    grid = build_risk_grid(smooth_default, BALANCE_RANGE, SALARY_RANGE, shape=(128, 128))
+    rows = random_rows(20000)
+    answers = grid.lookup_batch(rows[:, 0], rows[:, 1], rows[:, 2])
+    answered = ~np.isnan(answers)
+    assert answered.mean() > 0.5
+    assert np.abs(answers[answered] - smooth_default(rows[answered])).max() <= grid.max_error
+    assert grid.check(smooth_default, rows)['over_bound'] == 0.0
+
+
+def test_step_cells_fall_back():
+    grid = build_risk_grid(step_default, BALANCE_RANGE, SALARY_RANGE, shape=(64, 64))
+    assert grid.lookup(1, 20050.0 + 1.0, 300000.0) is None
+    assert abs(grid.lookup(1, 5000.0, 300000.0) - 0.1) < 1e-4
+
+
+def test_lookup_matches_lookup_batch():
+    grid = build_risk_grid(smooth_default, BALANCE_RANGE, SALARY_RANGE, shape=(64, 96))
+    rows = random_rows(500, seed=1)
+    batch = grid.lookup_batch(rows[:, 0], rows[:, 1], rows[:, 2])
+    for row, expected in zip(rows, batch):
+        single = grid.lookup(int(row[0]), row[1], row[2])
+        if np.isnan(expected):
+            assert single is None
+        else:
+            assert abs(single - expected) < 1e-12
+
+
+def test_outside_grid_and_bad_flag_fall_back():
+    grid = build_risk_grid(smooth_default, BALANCE_RANGE, SALARY_RANGE, shape=(32, 32))
+    assert grid.lookup(1, -1.0, 300000.0) is None
+    assert grid.lookup(1, 10000.0, 2e6) is None
+    assert grid.lookup(2, 10000.0, 300000.0) is None
+    assert np.isnan(grid.lookup_batch([1, 1], [-1.0, 10000.0], [300000.0, 2e6])).all()
+
+
+def test_save_and_load_round_trip(tmp_path):
+    grid = build_risk_grid(smooth_default, BALANCE_RANGE, SALARY_RANGE, shape=(32, 48))
+    path = os.path.join(tmp_path, 'grid.npz')
+    grid.save(path)
+    loaded = RiskGrid.load(path)
+    assert loaded.shape == (32, 48)
+    assert loaded.prob.dtype == np.uint16
+    np.testing.assert_array_equal(loaded.prob, grid.prob)
+    np.testing.assert_array_equal(loaded.error, grid.error)
+    assert loaded.lookup(1, 12345.0, 400000.0) == grid.lookup(1, 12345.0, 400000.0)
+
+
+def test_grid_scorer_falls_back_to_model():
+    grid = build_risk_grid(step_default, BALANCE_RANGE, SALARY_RANGE, shape=(64, 64))
+    scorer = GridScorer(grid, partial(score_rows, step_default))
+    assert scorer(1, 5000.0, 300000.0)[0] == 0
+    prediction, probability = scorer(1, 20051.0, 300000.0)
+    assert prediction == 1 and probability[1] == 0.9
+    assert (scorer.hits, scorer.misses) == (1, 1)
+
+    balances = np.linspace(0.0, 40000.0, 101)
+    curve = scorer.curve(1, balances, 300000.0)
+    np.testing.assert_allclose(curve, step_default(np.column_stack([np.ones(101), balances, np.full(101, 3e5)])),
+                               atol=1e-4)
+
+    no_grid = GridScorer(None, partial(score_rows, step_default))
+    np.testing.assert_allclose(no_grid.curve(1, balances, 300000.0), curve, atol=1e-4)
+    assert no_grid.hits == 0
+
+
+def test_lookup_is_fast():
+    grid = build_risk_grid(smooth_default, BALANCE_RANGE, SALARY_RANGE, shape=(64, 64))
+    n = 10000
+    start = time.perf_counter()
+    for _ in range(n):
+        grid.lookup(1, 10000.0, 400000.0)
+    # A few microseconds here; the bound leaves room for a loaded machine.
+    assert (time.perf_counter() - start) / n < 50e-6
+
+
+def test_axis_range_rounds_up_past_max():
+    assert axis_range(np.array([0.0, 31851.84])) == (0.0, 36000.0)
+    assert axis_range(np.array([0.0])) == (0.0, 1.0)
+
+
+def test_trained_models_grid(tmp_path):
+    store = ModelStore(compiled=True)
+    grids = save_risk_grids({'improved_lr': store.get('improved_lr')}, store.scaler, tmp_path,
+                            BALANCE_RANGE, SALARY_RANGE, shape=(64, 64))
+    reloaded = ModelStore(tmp_path).risk_grid('improved_lr')
+    assert ModelStore(tmp_path).risk_grid('rf') is None
+    model = store.get('improved_lr')
+    predict = lambda rows: score_batch(model, model_scaler(model, store.scaler), rows)[1][:, 1]
+    check = reloaded.check(predict, random_rows(5000))
+    assert check['answered'] > 0.5
+    assert check['over_bound'] == 0.0
+    np.testing.assert_array_equal(reloaded.prob, grids['improved_lr'].prob)
+
+
+def test_lookup_defers_near_the_decision_cutoff():
+    grid = build_risk_grid(step_default, BALANCE_RANGE, SALARY_RANGE, shape=(64, 64))
+    assert grid.lookup(1, 5000.0, 300000.0) is not None
+    # At a 0.1 cutoff the flat 0.1 region could go either way, so the model decides.
+    grid.threshold = 0.1
+    assert grid.lookup(1, 5000.0, 300000.0) is None
+    assert np.isnan(grid.lookup_batch([1], [5000.0], [300000.0])[0])
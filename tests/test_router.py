@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.router import ShadowRouter, TrafficSplit, parse_split
+from src.scoring import MODEL_KEYS, ModelStore, model_scaler, score_batch
+from src.service import ScoringService
+
+store = ModelStore(compiled=True)
+
+
+def score(model_key, raw):
+    model = store.get(model_key)
+    return score_batch(model, model_scaler(model, store.scaler), raw)
+
+
+def applicant_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.integers(0, 2, n), rng.uniform(0, 40000, n), rng.uniform(1000, 800000, n)])
+
+
+def test_parse_split():
+    assert parse_split('rf=90, improved_lr=10', MODEL_KEYS) == {'rf': 90.0, 'improved_lr': 10.0}
+    for text in ('rf', 'xgb=100', 'rf=50,rf=50'):
+        with pytest.raises(ValueError):
+            parse_split(text, MODEL_KEYS)
+    for weights in ({}, {'rf': 90, 'improved_lr': 20}, {'rf': 110, 'improved_lr': -10}):
+        with pytest.raises(ValueError):
+            TrafficSplit(weights)
+
+
+def test_routing_is_sticky_and_follows_the_split():
+    split = TrafficSplit({'rf': 80, 'improved_lr': 20})
+    routes = [split.route(f'APP-{i}') for i in range(20000)]
+    assert routes == [split.route(f'APP-{i}') for i in range(20000)]
+    assert abs(routes.count('improved_lr') / len(routes) - 0.2) < 0.02
+    challenger_only = TrafficSplit({'rf': 100, 'improved_lr': 0})
+    assert {challenger_only.route(i) for i in range(5000)} == {'rf'}
+
+
+def test_shadow_scores_the_other_models():
+    router = ShadowRouter(TrafficSplit({'rf': 50, 'improved_lr': 50}), score)
+    rows = applicant_rows(400)
+    try:
+        served = [router.predict(i, row) for i, row in enumerate(rows)]
+        router.flush()
+    finally:
+        router.close()
+    summary = router.summary()
+    served_by = np.array([model_key for model_key, _, _ in served])
+    for model_key, other in (('rf', 'improved_lr'), ('improved_lr', 'rf')):
+        assert summary[model_key]['served'] == np.count_nonzero(served_by == model_key)
+        # Shadow-scored exactly the rows the other model served.
+        shadow_rows = rows[served_by == other]
+        assert summary[model_key]['shadowed'] == len(shadow_rows)
+        expected = np.mean(score(model_key, shadow_rows)[0] == score(other, shadow_rows)[0])
+        assert summary[model_key]['agreement'] == pytest.approx(expected)
+        assert summary[model_key]['serve_p50'] is not None
+
+
+def test_shadow_scoring_stays_off_the_request_path():
+    release = threading.Event()
+
+    def slow_shadow(model_key, raw):
+        if model_key == 'improved_lr':
+            release.wait(5)
+        return score(model_key, raw)
+
+    router = ShadowRouter(TrafficSplit({'rf': 100, 'improved_lr': 0}), slow_shadow, max_queue=8)
+    rows = applicant_rows(50, seed=1)
+    try:
+        start = time.perf_counter()
+        for i, row in enumerate(rows):
+            assert router.predict(i, row)[0] == 'rf'
+        # Serving never waited on the blocked challenger; overflow was dropped.
+        assert time.perf_counter() - start < 2.0
+        assert router.dropped > 0
+        release.set()
+        router.flush()
+    finally:
+        release.set()
+        router.close()
+    assert router.summary()['improved_lr']['shadowed'] == len(rows) - router.dropped
+
+
+def test_service_routes_requests_without_a_model():
+    service = ScoringService(routing={'rf': 50, 'lr': 50})
+    try:
+        applicants = [{'applicant_id': f'A{i}', 'employed': int(row[0]), 'bank_balance': row[1],
+                       'annual_salary': row[2]} for i, row in enumerate(applicant_rows(60, seed=2))]
+        single = [service.predict(applicant)[1] for applicant in applicants]
+        batch = service.predict_batch({'applicants': applicants})[1]['results']
+        assert [result['model'] for result in single] == [result['model'] for result in batch]
+        assert len({result['model'] for result in single}) == 2
+        assert service.predict({**applicants[0], 'model': 'lr'})[1]['model'] == 'Improved Logistic Regression'
+        service.router.flush()
+        routing = service.health()['routing']
+        assert routing['rf']['served'] + routing['lr']['served'] == 120
+        assert routing['rf']['shadowed'] + routing['lr']['shadowed'] == 120
+    finally:
+        service.close()
+    with pytest.raises(ValueError):
+        ScoringService(routing={'rf': 50, 'xgb': 50})
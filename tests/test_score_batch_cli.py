@@ -0,0 +1,112 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'scripts')))
+
+import score_batch as score_batch_cli
+from src.explain import REASON_COLUMNS, explain_batch, explainer_for, reason_labels, top_reasons
+from src.feature_store import build_feature_store
+from src.features import RAW_COLUMNS
+from src.scoring import ModelStore, load_models, score_batch
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+improved_model, scaler, rf_model, _ = load_models(models_dir)
+# The CLI decides with the cost-optimal cutoffs saved next to the models.
+store = ModelStore(models_dir)
+
+
+@pytest.mark.parametrize('model_key', ['rf', 'lr'])
+def test_csv_roundtrip_across_chunks(tmp_path, model_key):
+    applicants = pd.read_csv(data_path).head(250)
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    output_path = os.path.join(tmp_path, 'results.csv')
+    applicants.to_csv(input_path, index=False)
+
+    assert score_batch_cli.main([input_path, output_path, '--model', model_key, '--chunk-size', '64',
+                                 '--id-column', 'Index', '--models-dir', models_dir]) == 0
+
+    results = pd.read_csv(output_path)
+    model = rf_model if model_key == 'rf' else improved_model
+    store_key = 'rf' if model_key == 'rf' else 'improved_lr'
+    expected_predictions, expected_probabilities = score_batch(model, scaler, applicants,
+                                                               threshold=store.decision_threshold(store_key),
+                                                               calibrator=store.calibrator(store_key))
+    assert list(results.columns) == ['Index'] + RAW_COLUMNS + ['Prediction', 'Default_Probability']
+    np.testing.assert_array_equal(results['Index'], applicants['Index'])
+    np.testing.assert_array_equal(results['Prediction'], expected_predictions)
+    np.testing.assert_allclose(results['Default_Probability'], expected_probabilities[:, 1], atol=1e-12)
+
+
+
+def test_explain_adds_reason_columns(tmp_path):
+    pytest.importorskip('pyarrow')
+    applicants = pd.read_csv(data_path).head(200)
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    output_path = os.path.join(tmp_path, 'results.parquet')
+    applicants.to_csv(input_path, index=False)
+
+    assert score_batch_cli.main([input_path, output_path, '--chunk-size', '64', '--explain',
+                                 '--models-dir', models_dir]) == 0
+
+    results = pd.read_parquet(output_path)
+    assert list(results.columns) == RAW_COLUMNS + ['Prediction', 'Default_Probability'] + REASON_COLUMNS
+    explainer = explainer_for(rf_model, scaler)
+    expected = reason_labels(top_reasons(explain_batch(explainer, applicants))[:, 0])
+    assert list(results['Reason_1'].astype(object).fillna('')) == list(pd.Series(expected).astype(object).fillna(''))
+
+def test_feature_store_input_matches_csv_input(tmp_path):
+    applicants = pd.read_csv(data_path).head(300)
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    applicants.to_csv(input_path, index=False)
+    store_dir = os.path.join(tmp_path, 'store')
+    build_feature_store(input_path, store_dir, id_columns=['Index'])
+
+    for source, output in ((input_path, 'from_csv.csv'), (store_dir, 'from_store.csv')):
+        assert score_batch_cli.main([source, os.path.join(tmp_path, output), '--chunk-size', '128',
+                                     '--id-column', 'Index', '--models-dir', models_dir]) == 0
+
+    pd.testing.assert_frame_equal(pd.read_csv(os.path.join(tmp_path, 'from_store.csv')),
+                                  pd.read_csv(os.path.join(tmp_path, 'from_csv.csv')))
+
+
+def test_compact_scoring_matches_labels(tmp_path):
+    applicants = pd.read_csv(data_path).head(500)
+    input_path = os.path.join(tmp_path, 'applicants.csv')
+    output_path = os.path.join(tmp_path, 'results.csv')
+    applicants.to_csv(input_path, index=False)
+
+    assert score_batch_cli.main([input_path, output_path, '--compact', '--models-dir', models_dir]) == 0
+
+    results = pd.read_csv(output_path)
+    expected_predictions, expected_probabilities = score_batch(rf_model, scaler, applicants,
+                                                               threshold=store.decision_threshold('rf'),
+                                                               calibrator=store.calibrator('rf'))
+    np.testing.assert_array_equal(results['Prediction'], expected_predictions)
+    np.testing.assert_allclose(results['Default_Probability'], expected_probabilities[:, 1], atol=0.0101)
+
+
+def test_header_only_input_writes_empty_results(tmp_path):
+    input_path = os.path.join(tmp_path, 'empty.csv')
+    output_path = os.path.join(tmp_path, 'results.csv')
+    pd.read_csv(data_path).head(0).to_csv(input_path, index=False)
+
+    assert score_batch_cli.main([input_path, output_path, '--id-column', 'Index', '--models-dir', models_dir]) == 0
+
+    results = pd.read_csv(output_path)
+    assert len(results) == 0
+    assert list(results.columns) == ['Index'] + RAW_COLUMNS + ['Prediction', 'Default_Probability']
+
+
+@pytest.mark.parametrize('chunk_size', ['0', '-5'])
+def test_rejects_non_positive_chunk_size(tmp_path, chunk_size):
+    with pytest.raises(SystemExit):
+        score_batch_cli.parse_args([data_path, os.path.join(tmp_path, 'out.csv'), '--chunk-size', chunk_size])
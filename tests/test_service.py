@@ -0,0 +1,171 @@
+import http.client
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scoring import ModelStore, load_models, score_batch
+from src.service import MicroBatcher, ScoringService, make_server
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+models_dir = os.path.join(project_root, 'models')
+
+improved_model, scaler, rf_model, _ = load_models(models_dir)
+store = ModelStore(models_dir)
+
+
+@pytest.fixture
+def service():
+    service = ScoringService(models_dir)
+    try:
+        yield service
+    finally:
+        service.close()
+
+
+@pytest.fixture
+def server(service):
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def post(server, path, body, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+    try:
+        connection.request('POST', path, body, {'Content-Type': 'application/json', **(headers or {})})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_micro_batcher_merges_concurrent_requests():
+    batch_sizes = []
+
+    def score_fn(raw):
+        batch_sizes.append(len(raw))
+        return score_batch(improved_model, scaler, raw)
+
+    batcher = MicroBatcher(score_fn, max_batch_size=32, max_wait_ms=50.0)
+    rows = [(i % 2, 1000.0 * i, 300000.0 + 1000.0 * i) for i in range(32)]
+    try:
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(lambda row: batcher.submit(row).result(), rows))
+    finally:
+        batcher.close()
+
+    _, expected = score_batch(improved_model, scaler, rows)
+    np.testing.assert_allclose([probability for _, probability in results], expected)
+    assert len(batch_sizes) < len(rows)
+
+
+def test_service_rejects_invalid_applicants(service):
+    status, body = service.predict({'employed': 1, 'bank_balance': 5000, 'annual_salary': 0})
+    assert status == 422
+    assert "❌ Annual Salary must be greater than zero" in body['errors']
+
+
+def test_warnings_are_returned_with_the_prediction(service):
+    applicant = {'employed': 1, 'bank_balance': 500, 'annual_salary': 20000, 'loan_amount': 200000}
+    status, body = service.predict(applicant)
+    assert status == 200
+    assert len(body['warnings']) == 2
+    status, body = service.predict_batch({'applicants': [applicant, {**applicant, 'annual_salary': 0}]})
+    assert body['results'][0]['warnings'] == service.predict(applicant)[1]['warnings']
+    assert body['results'][0]['prediction'] in (0, 1)
+    assert body['results'][1]['errors'][0] == "❌ Annual Salary must be greater than zero"
+
+
+@pytest.mark.parametrize('applicant', [
+    {'employed': 1, 'bank_balance': float('nan'), 'annual_salary': 100000},
+    {'employed': 1, 'bank_balance': 8000, 'annual_salary': float('inf'), 'model': 'lr'},
+    {'employed': 0, 'bank_balance': 8000, 'annual_salary': 300000, 'loan_amount': float('-inf')},
+    {'employed': 1.7, 'bank_balance': 8000, 'annual_salary': 300000},
+    {'employed': '1', 'bank_balance': 8000, 'annual_salary': 300000},
+    {'employed': True, 'bank_balance': 8000, 'annual_salary': 300000},
+    {'employed': 1, 'bank_balance': 'lots', 'annual_salary': 300000},
+    {'employed': 1, 'annual_salary': 300000},
+])
+def test_service_rejects_malformed_applicants(service, applicant):
+    status, body = service.predict(applicant)
+    assert status == 422
+    assert body['errors']
+
+
+def test_non_finite_json_literals_are_rejected_over_http(server):
+    status, body = post(server, '/predict', '{"employed": 1, "bank_balance": NaN, "annual_salary": 1e5}')
+    assert status == 422
+    status, body = post(server, '/predict', '{"employed": 1, "bank_balance": 8000, "annual_salary": Infinity}')
+    assert status == 422
+
+
+@pytest.mark.parametrize('model', ['xgboost', ['rf'], {'name': 'rf'}, 3])
+def test_unknown_model_returns_400(server, model):
+    applicant = {'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000, 'model': model}
+    status, body = post(server, '/predict', json.dumps(applicant))
+    assert status == 400
+    assert body['errors']
+    status, body = post(server, '/predict/batch', json.dumps({'model': model, 'applicants': [applicant]}))
+    assert status == 400
+
+
+def test_bulk_endpoint_rejects_non_object_applicants(service):
+    status, body = service.predict_batch({'applicants': [None, 5, 'x']})
+    assert status == 200
+    assert all('errors' in result for result in body['results'])
+
+
+def test_scoring_failure_returns_500(service, server):
+    def broken(raw):
+        raise RuntimeError("model exploded")
+
+    service._score_fn = lambda model_key: broken
+    status, body = post(server, '/predict/batch',
+                        json.dumps({'applicants': [{'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000}]}))
+    assert status == 500
+    assert 'model exploded' in body['errors'][0]
+
+
+def test_negative_content_length_returns_400(server):
+    status, body = post(server, '/predict', '{}', headers={'Content-Length': '-1'})
+    assert status == 400
+
+
+def test_service_bulk_endpoint_keeps_order(service):
+    applicants = [
+        {'employed': 0, 'bank_balance': 25000, 'annual_salary': 200000},
+        {'employed': 1, 'bank_balance': 5000, 'annual_salary': -1000},
+        {'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000},
+    ]
+    status, body = service.predict_batch({'model': 'rf', 'applicants': applicants})
+
+    _, expected = score_batch(rf_model, scaler, [[0, 25000, 200000], [1, 8000, 600000]],
+                              calibrator=store.calibrator('rf'))
+    assert status == 200
+    assert 'errors' in body['results'][1]
+    np.testing.assert_allclose([body['results'][0]['default_probability'], body['results'][2]['default_probability']],
+                               expected[:, 1], atol=1e-9)
+
+
+def test_http_predict_roundtrip(server):
+    status, body = post(server, '/predict',
+                        json.dumps({'employed': 1, 'bank_balance': 8000, 'annual_salary': 600000, 'model': 'lr'}))
+
+    _, expected = score_batch(improved_model, scaler, [[1, 8000, 600000]],
+                              calibrator=store.calibrator('improved_lr'))
+    assert status == 200
+    assert body['model'] == 'Improved Logistic Regression'
+    assert abs(body['default_probability'] - expected[0, 1]) < 1e-9
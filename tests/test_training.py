@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.training as training
+from src.feature_store import build_feature_store
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+data_path = os.path.join(project_root, 'data', 'Default_Fin.csv')
+
+TINY_RF_GRID = {'n_estimators': [5], 'max_depth': [3, 4]}
+TINY_LR_GRID = {'C': [1.0]}
+
+
+def test_search_resumes_from_checkpoints(tmp_path, monkeypatch):
+    store = build_feature_store(data_path, str(tmp_path / 'features'))
+    features, labels = store.features(), store.labels()
+    x_fit, y_fit, x_val, y_val = features[:4000], labels[:4000], features[4000:6000], labels[4000:6000]
+    trials = training.build_trials(TINY_RF_GRID, TINY_LR_GRID)
+    trials_dir = str(tmp_path / 'trials')
+
+    first = training.search(trials, x_fit, y_fit, x_val, y_val, trials_dir, n_jobs=1)
+    assert sorted(r['trial_id'] for r in first) == sorted(t['trial_id'] for t in trials)
+    assert len(os.listdir(trials_dir)) == len(trials)
+
+    os.remove(os.path.join(trials_dir, 'rf-n_estimators=5-max_depth=4.json'))
+    fitted = []
+    original_run_trial = training.run_trial
+    monkeypatch.setattr(training, 'run_trial', lambda trial, *args: fitted.append(trial['trial_id'])
+                        or original_run_trial(trial, *args))
+    second = training.search(trials, x_fit, y_fit, x_val, y_val, trials_dir, n_jobs=1)
+
+    assert fitted == ['rf-n_estimators=5-max_depth=4']
+    by_id = {r['trial_id']: r['roc_auc'] for r in first}
+    assert {r['trial_id']: r['roc_auc'] for r in second} == by_id
+
+
+def test_best_trials_picks_highest_auc_per_model():
+    results = [
+        {'trial_id': 'rf-a', 'model': 'rf', 'roc_auc': 0.90},
+        {'trial_id': 'rf-b', 'model': 'rf', 'roc_auc': 0.93},
+        {'trial_id': 'lr-a', 'model': 'lr', 'roc_auc': 0.94},
+    ]
+    best = training.best_trials(results)
+    assert best['rf']['trial_id'] == 'rf-b'
+    assert best['lr']['trial_id'] == 'lr-a'
+
+
+def test_subsample_is_stratified():
+    labels = np.array([0] * 900 + [1] * 100)
+    sample = training.subsample(np.arange(1000), labels, 200)
+    assert len(sample) == 200
+    assert labels[sample].sum() == 20
+    assert len(training.subsample(np.arange(1000), labels, None)) == 1000
@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.validation import ENGINE, ERROR, Rule, RuleEngine, check_applicant, validate_applicant, \
+    validate_applicants
+
+BALANCES = [-1.0, 0.0, 500.0, 999.99, 1000.0, 25000.0]
+SALARIES = [-1000.0, 0.0, 1.0, 49999.0, 50000.0, 600000.0]
+LOANS = [0.0, 100.0, 250000.0, 3000001.0]
+
+LOW_INCOME = "⚠️ Warning: Very low income with minimal savings - High risk"
+
+
+def test_vectorized_rules_match_single_applicant():
+    balance, salary, loan = (values.ravel() for values in np.meshgrid(BALANCES, SALARIES, LOANS, indexing='ij'))
+    validation = validate_applicants(1, balance, salary, loan)
+    for row, (b, s, l) in enumerate(zip(balance, salary, loan)):
+        assert validation.row_messages(row) == check_applicant(float(b), float(s), float(l))
+        assert validation.rejected[row] == bool(check_applicant(float(b), float(s), float(l))[0])
+
+
+def test_validate_applicant_lists_errors_then_warnings():
+    errors, warnings = check_applicant(0.0, 0.0)
+    assert validate_applicant(0.0, 0.0) == errors + warnings
+    assert warnings == [LOW_INCOME]
+
+
+@pytest.mark.parametrize('employed, balance, salary, code', [
+    (2, 1000.0, 50000.0, 'employed_not_binary'),
+    (np.nan, 1000.0, 50000.0, 'employed_not_binary'),
+    (1, np.nan, 50000.0, 'not_finite'),
+    (1, 1000.0, np.inf, 'not_finite'),
+])
+def test_input_rules(employed, balance, salary, code):
+    validation = validate_applicants([employed], [balance], [salary])
+    assert validation.rejected[0]
+    assert {rule for rule, rows in validation.counts().items() if rows} == {code}
+
+
+def test_messages_and_counts():
+    validation = validate_applicants([1, 1, 0, 1], [1000.0, 0.0, 500.0, -5.0], [400000.0, 0.0, 20000.0, 400000.0])
+    messages = validation.messages()
+    assert messages[0] == ''
+    assert messages[1] == ("❌ Annual Salary must be greater than zero; "
+                           "❌ Cannot process: Both income and balance are zero; " + LOW_INCOME)
+    assert messages[2] == LOW_INCOME
+    assert messages[3] == "❌ Bank Balance cannot be negative"
+    assert list(validation.rejected) == [False, True, False, True]
+    counts = validation.counts()
+    assert counts['low_income_low_savings'] == 2
+    assert counts['employed_not_binary'] == 0
+
+
+def test_masks_are_compact():
+    validation = validate_applicants(np.ones(10), np.zeros(10), np.ones(10))
+    assert validation.errors.dtype == np.uint8 and validation.warnings.dtype == np.uint8
+    wide = RuleEngine(tuple(Rule(f'rule_{i}', ERROR, '', lambda *columns: columns[1] < 0) for i in range(9)))
+    assert wide.evaluate(1, [-1.0], [1.0]).errors[0] == (1 << 9) - 1
+
+
+def test_rule_codes_must_be_unique():
+    with pytest.raises(ValueError):
+        RuleEngine(ENGINE.rules + ENGINE.rules[:1])
+
+
+def test_million_rows_is_fast():
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    employed = rng.integers(0, 2, n).astype(np.float64)
+    balance = rng.uniform(-100.0, 40000.0, n)
+    salary = rng.uniform(-1000.0, 800000.0, n)
+    loan = rng.uniform(0.0, 5e6, n)
+    validate_applicants(employed[:10], balance[:10], salary[:10], loan[:10])
+    start = time.perf_counter()
+    validation = validate_applicants(employed, balance, salary, loan)
+    # Tens of milliseconds here; the bound leaves room for a loaded machine.
+    assert time.perf_counter() - start < 1.0
+    assert validation.rejected.sum() == np.count_nonzero((salary <= 0) | (balance < 0))